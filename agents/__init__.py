@@ -1,3 +1,3 @@
-from .agent import root_agent
+from .agent import root_agent, app
 
-__all__ = ["root_agent"]
+__all__ = ["root_agent", "app"]
@@ -5,11 +5,27 @@ Taco is the main orchestrator. He handles islands & items directly,
 and delegates domain-specific tasks to specialized sub-agents.
 """
 from google.adk.agents.llm_agent import Agent
-from google.adk.tools.agent_tool import AgentTool
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.apps import App
+from google.adk.apps.app import EventsCompactionConfig
 from google.genai import types
 
-from agents.constants import MODEL_NAME, AGENT_NAME, AGENT_DESCRIPTION
+from agents.constants import (
+    APP_NAME,
+    MODEL_NAME,
+    AGENT_NAME,
+    AGENT_DESCRIPTION,
+    CONTEXT_CACHE_INTERVALS,
+    CONTEXT_CACHE_MIN_TOKENS,
+    CONTEXT_CACHE_TTL_SECONDS,
+    SESSION_COMPACTION_OVERLAP,
+)
 from agents.prompts import get_system_instruction
+from agents.plugins import ToolConcurrencyPlugin, TurnTracingPlugin
+from agents.sessions import TokenThresholdSummarizer
+from agents.tools import READ_ONLY_TOOLS
+from agents.tools.cached import CachedAgentTool, cached_tools
+from app.core.config import settings
 
 # === CORE TOOLS (Islands + Items — always needed) ===
 from agents.tools.category_tools import (
@@ -23,6 +39,8 @@ from agents.tools.category_tools import (
 from agents.tools.item_tools import (
     get_all_items,
     get_item_by_id,
+    get_items_overview,
+    get_item_dependencies,
     create_item,
     update_item,
     delete_item,
@@ -43,26 +61,30 @@ root_agent = Agent(
     description=AGENT_DESCRIPTION,
     instruction=get_system_instruction(),
     tools=[
-        # --- Core: Islands (Catégories) ---
-        get_all_islands,
-        get_island_by_name,
-        get_island_by_id,
-        create_island,
-        update_island,
-        delete_island,
+        *cached_tools([
+            # --- Core: Islands (Catégories) ---
+            get_all_islands,
+            get_island_by_name,
+            get_island_by_id,
+            create_island,
+            update_island,
+            delete_island,
 
-        # --- Core: Items (Blocs 3D) ---
-        get_all_items,
-        get_item_by_id,
-        create_item,
-        update_item,
-        delete_item,
+            # --- Core: Items (Blocs 3D) ---
+            get_all_items,
+            get_item_by_id,
+            get_items_overview,
+            get_item_dependencies,
+            create_item,
+            update_item,
+            delete_item,
+        ]),
 
         # --- Domain sub-agents (via AgentTool) ---
-        AgentTool(agent=finance_agent),
-        AgentTool(agent=health_agent),
-        AgentTool(agent=social_agent),
-        AgentTool(agent=alerts_agent),
+        CachedAgentTool(agent=finance_agent),
+        CachedAgentTool(agent=health_agent),
+        CachedAgentTool(agent=social_agent),
+        CachedAgentTool(agent=alerts_agent),
     ],
     generate_content_config=types.GenerateContentConfig(
         http_options=types.HttpOptions(
@@ -73,3 +95,25 @@ root_agent = Agent(
         ),
     ),
 )
+
+# === APP (picked up by the ADK loader before root_agent) ===
+app = App(
+    name=APP_NAME,
+    root_agent=root_agent,
+    plugins=[
+        ToolConcurrencyPlugin(read_only_tools=READ_ONLY_TOOLS),
+        TurnTracingPlugin(),  # After concurrency: tool latency excludes queueing
+    ],
+    # Gemini context caching of the static prefix (system instruction + tool schemas)
+    context_cache_config=ContextCacheConfig(
+        cache_intervals=CONTEXT_CACHE_INTERVALS,
+        ttl_seconds=CONTEXT_CACHE_TTL_SECONDS,
+        min_tokens=CONTEXT_CACHE_MIN_TOKENS,
+    ) if settings.AGENT_CONTEXT_CACHE else None,
+    # Summarize older turns once the history exceeds the token threshold
+    events_compaction_config=EventsCompactionConfig(
+        summarizer=TokenThresholdSummarizer(llm=root_agent.canonical_model),
+        compaction_interval=1,  # Checked every turn, the summarizer applies the threshold
+        overlap_size=SESSION_COMPACTION_OVERLAP,
+    ),
+)
@@ -8,6 +8,7 @@ Centralized configuration values to avoid magic strings and numbers.
 MODEL_NAME = "gemini-2.5-flash"
 
 # === AGENT IDENTITY ===
+APP_NAME = "agents"  # Must match the agents folder name (ADK app_name in URLs)
 AGENT_NAME = "life_agent"
 AGENT_DESCRIPTION = "Taco - LifeMap's friendly robot companion. Helps users build their 3D life universe."
 
@@ -19,3 +20,22 @@ BACKEND_BASE_URL = f"http://{BACKEND_HOST}:{BACKEND_PORT}"
 # === LIMITS ===
 DEFAULT_CATEGORY_LIMIT = 100
 DEFAULT_ITEM_LIMIT = 100
+
+# === TOOL PAYLOADS ===
+DEFAULT_TOOL_ROW_LIMIT = 20  # Rows per page returned by list tools
+MAX_TOOL_ROW_LIMIT = 100  # Hard cap, matches service defaults
+TOOL_PAYLOAD_TOKEN_BUDGET = 2000  # Approx. tokens allowed per tool response
+CHARS_PER_TOKEN = 4  # Rough JSON chars → tokens ratio used by the budget guard
+
+# === CONCURRENCY ===
+MAX_PARALLEL_TOOL_CALLS = 4  # Max tool calls / sub-agents running at once per turn
+
+# === CONTEXT CACHING ===
+CONTEXT_CACHE_INTERVALS = 10  # Invocations served by one cache before it is refreshed
+CONTEXT_CACHE_TTL_SECONDS = 1800  # Gemini cache lifetime
+CONTEXT_CACHE_MIN_TOKENS = 1024  # Gemini minimum for explicit caching; smaller requests aren't cached
+
+# === SESSIONS ===
+SESSION_COMPACTION_TOKEN_THRESHOLD = 8000  # Uncompacted history size that triggers a summary
+SESSION_COMPACTION_OVERLAP = 1  # Turns repeated in the next summary for continuity
+SESSION_MAX_SUMMARIES = 3  # Summaries kept per session (oldest are dropped)
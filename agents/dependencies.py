@@ -5,9 +5,10 @@ Provides async database session and service factories for direct service calls.
 This avoids HTTP calls and enables direct database access from agent tools.
 """
 from contextlib import asynccontextmanager
-import contextvars
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.core.config import settings
+from app.core.metrics import register_engine
+from agents.plugins.tracing import install_sql_tracing
 
 # === ASYNC DATABASE ENGINE (same config as app) ===
 # Use pool settings optimized for agent usage
@@ -17,6 +18,8 @@ _engine = create_async_engine(
     pool_size=5,
     max_overflow=10,
 )
+install_sql_tracing()  # SQL spans/counters for traced tool calls
+register_engine("agents", _engine)  # Pool stats + statement timings on /metrics
 
 _SessionFactory = async_sessionmaker(
     bind=_engine,
@@ -25,21 +28,14 @@ _SessionFactory = async_sessionmaker(
     autoflush=False,
 )
 
-# Global context var for the current turn session
-_agent_session_ctx = contextvars.ContextVar("_agent_session_ctx", default=None)
-
 @asynccontextmanager
 async def get_async_session():
     """Get an async database session for agent tools.
-    Reuses existing session if available in context, otherwise creates a new one.
-    """
-    ctx_session = _agent_session_ctx.get()
-    if ctx_session is not None:
-        # Reusing the existing context session
-        yield ctx_session
-        return
 
-    # No session in context, creating a new standalone one
+    Each call opens its own session: an AsyncSession must not be shared
+    across concurrent tasks, and tool calls of one turn run through
+    asyncio.gather.
+    """
     async with _SessionFactory() as session:
         try:
             yield session
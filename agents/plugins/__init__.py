@@ -0,0 +1,12 @@
+"""
+Plugins package for LifeMap ADK.
+
+App-wide plugins registered on the ADK App in agents/agent.py.
+"""
+from .concurrency import ToolConcurrencyPlugin
+from .tracing import TurnTracingPlugin
+
+__all__ = [
+    "ToolConcurrencyPlugin",
+    "TurnTracingPlugin",
+]
@@ -0,0 +1,126 @@
+"""
+Concurrency plugin for the LifeMap ADK Agent.
+
+ADK already dispatches the function calls of a single model response with
+asyncio.gather. This plugin bounds that fan-out per turn, serializes write
+tools within a turn, and logs the wall-clock time saved by running read
+tools and sub-agents side by side.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+from agents.constants import MAX_PARALLEL_TOOL_CALLS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _TurnState:
+    """Concurrency primitives and timings for one invocation (turn)."""
+    semaphore: asyncio.Semaphore
+    write_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    held: dict = field(default_factory=dict)  # function_call_id -> (primitives, start)
+    spans: list = field(default_factory=list)  # (start, end) of each finished call
+
+
+def merged_duration(spans: list[tuple[float, float]]) -> float:
+    """Total time covered by possibly overlapping (start, end) intervals."""
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+class ToolConcurrencyPlugin(BasePlugin):
+    """
+    Caps concurrent tool calls per turn and keeps writes sequential.
+
+    - Read-only tools and sub-agents (AgentTool) only take a slot of the
+      per-turn semaphore, so independent lookups run in parallel.
+    - Any other tool also takes the turn write lock: two writes of the same
+      turn never interleave.
+
+    Each tool opens its own AsyncSession (see agents.dependencies), so
+    parallel calls never share a database session.
+    """
+
+    def __init__(self, read_only_tools: set[str], max_parallel: int = MAX_PARALLEL_TOOL_CALLS):
+        super().__init__(name="tool_concurrency")
+        self.read_only_tools = frozenset(read_only_tools)
+        self.max_parallel = max_parallel
+        self._turns: dict[str, _TurnState] = {}
+
+    def _turn(self, invocation_id: str) -> _TurnState:
+        state = self._turns.get(invocation_id)
+        if state is None:
+            state = _TurnState(semaphore=asyncio.Semaphore(self.max_parallel))
+            self._turns[invocation_id] = state
+        return state
+
+    def is_parallel_safe(self, tool: BaseTool) -> bool:
+        return isinstance(tool, AgentTool) or tool.name in self.read_only_tools
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> Optional[dict]:
+        state = self._turn(tool_context.invocation_id)
+        primitives = [state.semaphore]
+        if not self.is_parallel_safe(tool):
+            primitives.insert(0, state.write_lock)  # Lock first: a queued write doesn't hold a slot
+        for primitive in primitives:
+            await primitive.acquire()
+        state.held[tool_context.function_call_id] = (primitives, time.perf_counter())
+        return None
+
+    def _release(self, tool_context: ToolContext) -> None:
+        state = self._turns.get(tool_context.invocation_id)
+        if state is None:
+            return
+        held = state.held.pop(tool_context.function_call_id, None)
+        if held is None:
+            return
+        primitives, start = held
+        for primitive in reversed(primitives):
+            primitive.release()
+        state.spans.append((start, time.perf_counter()))
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, result: dict
+    ) -> Optional[dict]:
+        self._release(tool_context)
+        return None
+
+    async def on_tool_error_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, error: Exception
+    ) -> Optional[dict]:
+        self._release(tool_context)
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        state = self._turns.pop(invocation_context.invocation_id, None)
+        if state is None or not state.spans:
+            return
+        sequential = sum(end - start for start, end in state.spans)
+        wall = merged_duration(state.spans)
+        logger.info(
+            f"[TURN] {invocation_context.invocation_id}: {len(state.spans)} tool calls, "
+            f"sequential={sequential * 1000:.0f}ms wall={wall * 1000:.0f}ms "
+            f"saved={(sequential - wall) * 1000:.0f}ms"
+        )
@@ -0,0 +1,346 @@
+"""
+Tracing plugin for the LifeMap ADK Agent.
+
+Emits OpenTelemetry spans for each turn: model calls (with token usage),
+tool calls (latency, rows returned, payload bytes) and the SQL statements
+they run. Spans go through the global tracer provider, so they reach the
+OTLP exporter ADK configures from OTEL_EXPORTER_OTLP_* variables, and can
+also be written to a local JSON lines file (AGENT_TRACE_FILE).
+"""
+import contextvars
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from opentelemetry import trace
+
+from app.core.config import settings
+from app.core.query_log import begin_scope, end_scope
+from app.core.statement_timing import observe_statements
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("lifemap.agents")
+
+
+@dataclass
+class _ToolScope:
+    """SQL counters of the tool call running in the current task."""
+    span: Any
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+
+
+@dataclass
+class _TurnStats:
+    """Span and running totals for one invocation (turn)."""
+    span: Any
+    model_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: int = 0
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    open_spans: dict = field(default_factory=dict)  # key -> (span, start, extra)
+
+
+# Set while a tool runs; inherited by the SQLAlchemy greenlet of that task
+_current_tool = contextvars.ContextVar("_current_tool", default=None)
+
+
+# === SQL INSTRUMENTATION ===
+
+def _trace_statement(conn, statement, parameters, executemany, elapsed):
+    scope = _current_tool.get()
+    if scope is None:
+        return
+    scope.sql_count += 1
+    scope.sql_seconds += elapsed
+
+    end_ns = time.time_ns()
+    span = tracer.start_span(
+        "db.statement",
+        context=trace.set_span_in_context(scope.span),
+        start_time=end_ns - int(elapsed * 1e9),
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement[:500],
+            "db.duration_ms": round(elapsed * 1000, 2),
+        },
+    )
+    span.end(end_time=end_ns)
+
+
+def install_sql_tracing() -> None:
+    """Record the statements of every engine run by a traced tool call, once."""
+    observe_statements(_trace_statement)
+
+
+# === LOCAL JSON FILE SINK ===
+
+class JsonFileSpanExporter:
+    """OpenTelemetry span exporter writing one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        lines = []
+        for span in spans:
+            lines.append(json.dumps({
+                "name": span.name,
+                "trace_id": format(span.context.trace_id, "032x"),
+                "span_id": format(span.context.span_id, "016x"),
+                "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+                "start": span.start_time,
+                "end": span.end_time,
+                "duration_ms": round((span.end_time - span.start_time) / 1e6, 2),
+                "attributes": dict(span.attributes or {}),
+            }, default=str))
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning(f"[TRACE] Could not write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+_file_sink_installed = False
+
+
+def install_file_sink(path: str) -> None:
+    """Add the JSON file sink to the global tracer provider (created if missing)."""
+    global _file_sink_installed
+    if _file_sink_installed:
+        return
+    try:
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning("[TRACE] opentelemetry-sdk not installed, JSON trace sink disabled")
+        return
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(BatchSpanProcessor(JsonFileSpanExporter(path)))
+    _file_sink_installed = True
+    logger.info(f"[TRACE] Writing agent spans to {path}")
+
+
+# === PLUGIN ===
+
+def _payload_rows(result: Any) -> Optional[int]:
+    """Number of rows in a tool response (`count` or the first list value)."""
+    if not isinstance(result, dict):
+        return None
+    if isinstance(result.get("count"), int):
+        return result["count"]
+    for value in result.values():
+        if isinstance(value, list):
+            return len(value)
+    return None
+
+
+class TurnTracingPlugin(BasePlugin):
+    """
+    One `agent.turn` span per invocation, with child spans:
+    - `model.call`: agent, model, latency, input/output/cached tokens
+    - `tool.call`: tool, latency, rows returned, payload bytes, SQL count/time
+    - `db.statement`: statement and duration (child of the tool span)
+    Sub-agent turns (AgentTool) are nested under the tool call that started them.
+    """
+
+    def __init__(self, trace_file: Optional[str] = None):
+        super().__init__(name="turn_tracing")
+        self._turns: dict[str, _TurnStats] = {}
+        trace_file = trace_file or settings.AGENT_TRACE_FILE
+        if trace_file:
+            install_file_sink(trace_file)
+
+    # --- Turn ---
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        parent_scope = _current_tool.get()
+        parent = trace.set_span_in_context(parent_scope.span) if parent_scope else None
+        span = tracer.start_span(
+            "agent.turn",
+            context=parent,
+            attributes={
+                "agent.name": invocation_context.agent.name,
+                "agent.invocation_id": invocation_context.invocation_id,
+                "agent.session_id": invocation_context.session.id,
+            },
+        )
+        self._turns[invocation_context.invocation_id] = _TurnStats(span=span)
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        stats = self._turns.pop(invocation_context.invocation_id, None)
+        if stats is None:
+            return
+        for span, _, _ in stats.open_spans.values():
+            span.end()
+        stats.span.set_attributes({
+            "turn.model_calls": stats.model_calls,
+            "turn.input_tokens": stats.input_tokens,
+            "turn.output_tokens": stats.output_tokens,
+            "turn.tool_calls": stats.tool_calls,
+            "turn.sql_count": stats.sql_count,
+            "turn.sql_ms": round(stats.sql_seconds * 1000, 2),
+        })
+        stats.span.end()
+        logger.info(
+            f"[TRACE] {invocation_context.agent.name} turn {invocation_context.invocation_id}: "
+            f"{stats.model_calls} model calls ({stats.input_tokens} in / {stats.output_tokens} out tokens), "
+            f"{stats.tool_calls} tool calls, {stats.sql_count} SQL ({stats.sql_seconds * 1000:.0f}ms)"
+        )
+
+    # --- Model calls ---
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        stats = self._turns.get(callback_context.invocation_id)
+        if stats is None:
+            return None
+        span = tracer.start_span(
+            "model.call",
+            context=trace.set_span_in_context(stats.span),
+            attributes={
+                "agent.name": callback_context.agent_name,
+                "gen_ai.request.model": llm_request.model or "",
+            },
+        )
+        stats.open_spans[("model", callback_context.agent_name)] = (span, time.perf_counter(), None)
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        stats = self._turns.get(callback_context.invocation_id)
+        if stats is None:
+            return None
+        opened = stats.open_spans.pop(("model", callback_context.agent_name), None)
+        if opened is None:
+            return None
+        span, start, _ = opened
+
+        usage = llm_response.usage_metadata
+        input_tokens = (usage.prompt_token_count or 0) if usage else 0
+        output_tokens = (usage.candidates_token_count or 0) if usage else 0
+        cached_tokens = (usage.cached_content_token_count or 0) if usage else 0
+        stats.model_calls += 1
+        stats.input_tokens += input_tokens
+        stats.output_tokens += output_tokens
+
+        span.set_attributes({
+            "gen_ai.usage.input_tokens": input_tokens,
+            "gen_ai.usage.output_tokens": output_tokens,
+            "gen_ai.usage.cached_tokens": cached_tokens,
+            "model.latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        })
+        span.end()
+        return None
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> Optional[LlmResponse]:
+        stats = self._turns.get(callback_context.invocation_id)
+        opened = stats.open_spans.pop(("model", callback_context.agent_name), None) if stats else None
+        if opened is not None:
+            span = opened[0]
+            span.record_exception(error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+            span.end()
+        return None
+
+    # --- Tool calls ---
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> Optional[dict]:
+        stats = self._turns.get(tool_context.invocation_id)
+        if stats is None:
+            return None
+        span = tracer.start_span(
+            "tool.call",
+            context=trace.set_span_in_context(stats.span),
+            attributes={"tool.name": tool.name, "agent.name": tool_context.agent_name},
+        )
+        scope = _ToolScope(span=span)
+        token = _current_tool.set(scope)
+        query_token = begin_scope(f"tool {tool.name}")  # Slow-query / N+1 log per tool call
+        stats.open_spans[("tool", tool_context.function_call_id)] = (
+            span, time.perf_counter(), (scope, token, query_token)
+        )
+        return None
+
+    def _end_tool(self, tool_context: ToolContext, result: Any = None, error: Optional[Exception] = None) -> None:
+        stats = self._turns.get(tool_context.invocation_id)
+        opened = stats.open_spans.pop(("tool", tool_context.function_call_id), None) if stats else None
+        if opened is None:
+            return
+        span, start, (scope, token, query_token) = opened
+        end_scope(query_token)
+        try:
+            _current_tool.reset(token)
+        except ValueError:
+            _current_tool.set(None)  # Ended from another context
+
+        stats.tool_calls += 1
+        stats.sql_count += scope.sql_count
+        stats.sql_seconds += scope.sql_seconds
+
+        attributes = {
+            "tool.latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "tool.sql_count": scope.sql_count,
+            "tool.sql_ms": round(scope.sql_seconds * 1000, 2),
+        }
+        if result is not None:
+            attributes["tool.payload_bytes"] = len(json.dumps(result, default=str).encode("utf-8"))
+            rows = _payload_rows(result)
+            if rows is not None:
+                attributes["tool.rows"] = rows
+            if isinstance(result, dict) and result.get("status"):
+                attributes["tool.status"] = str(result["status"])
+        span.set_attributes(attributes)
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+        span.end()
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, result: dict
+    ) -> Optional[dict]:
+        self._end_tool(tool_context, result=result)
+        return None
+
+    async def on_tool_error_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, error: Exception
+    ) -> Optional[dict]:
+        self._end_tool(tool_context, error=error)
+        return None
@@ -2,15 +2,18 @@
 Prompts loader for the LifeMap ADK Agent.
 
 Loads and assembles prompts from markdown files.
+Files are read once per process: instructions are static between deploys.
 """
+from functools import lru_cache
 from pathlib import Path
 
 
 PROMPTS_DIR = Path(__file__).parent
 
 
+@lru_cache(maxsize=None)
 def load_prompt(filename: str) -> str:
-    """Load a prompt from a markdown file."""
+    """Load a prompt from a markdown file (cached after the first read)."""
     filepath = PROMPTS_DIR / filename
     if not filepath.exists():
         raise FileNotFoundError(f"Prompt file not found: {filepath}")
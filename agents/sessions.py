@@ -0,0 +1,131 @@
+"""
+Session storage for the LifeMap ADK Agent.
+
+Conversations are persisted in the app Postgres (ADK DatabaseSessionService)
+instead of the server process, and kept bounded:
+- Compaction: once the uncompacted history exceeds a token threshold, older
+  turns are summarized by the model (ADK events compaction).
+- Storage cap: events already covered by a summary are deleted and only the
+  latest summaries are kept, so each session stays a few dozen rows.
+"""
+import logging
+from typing import Any, List, Optional
+from urllib.parse import urlparse
+
+from google.adk.apps.llm_event_summarizer import LlmEventSummarizer
+from google.adk.cli.service_registry import get_service_registry
+from google.adk.events.event import Event
+from google.adk.models.base_llm import BaseLlm
+from google.adk.sessions.database_session_service import DatabaseSessionService, StorageEvent
+from google.adk.sessions.session import Session
+from sqlalchemy import delete
+
+from agents.constants import (
+    CHARS_PER_TOKEN,
+    SESSION_COMPACTION_TOKEN_THRESHOLD,
+    SESSION_MAX_SUMMARIES,
+)
+from app.core.config import settings
+from app.core.metrics import register_engine
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = (
+    "Voici l'historique d'une conversation entre un utilisateur et Taco, "
+    "l'assistant LifeMap. Résume-le de façon concise pour la suite de la "
+    "conversation : préférences et faits sur l'utilisateur, actions effectuées "
+    "(avec les IDs, montants et dates), décisions prises et demandes en suspens.\n\n"
+    "{conversation_history}"
+)
+
+
+def _is_compaction(event: Event) -> bool:
+    return bool(event.actions and event.actions.compaction)
+
+
+def estimate_event_tokens(events: List[Event]) -> int:
+    """Rough token estimate of the events contents (text, tool calls and responses)."""
+    chars = sum(
+        len(event.content.model_dump_json(exclude_none=True))
+        for event in events
+        if event.content
+    )
+    return chars // CHARS_PER_TOKEN
+
+
+class TokenThresholdSummarizer(LlmEventSummarizer):
+    """
+    Summarize the uncompacted history only once it exceeds `threshold_tokens`.
+
+    Used with `compaction_interval=1`: ADK proposes every turn since the last
+    summary; below the threshold nothing is appended, so the next turn
+    proposes a longer window, until it is worth summarizing.
+    """
+
+    def __init__(self, llm: BaseLlm, threshold_tokens: int = SESSION_COMPACTION_TOKEN_THRESHOLD):
+        super().__init__(llm=llm, prompt_template=SUMMARY_PROMPT)
+        self.threshold_tokens = threshold_tokens
+
+    async def maybe_summarize_events(self, *, events: List[Event]) -> Optional[Event]:
+        tokens = estimate_event_tokens(events)
+        if tokens < self.threshold_tokens:
+            return None
+        logger.info(f"[SESSION] Compacting {len(events)} events (~{tokens} tokens)")
+        return await super().maybe_summarize_events(events=events)
+
+
+class BoundedDatabaseSessionService(DatabaseSessionService):
+    """
+    DatabaseSessionService that prunes a session after each compaction:
+    raw events older than the new summary range are deleted (an earlier
+    summary already covers them), and only the last `max_summaries`
+    summaries are kept.
+    """
+
+    def __init__(self, db_url: str, max_summaries: int = SESSION_MAX_SUMMARIES, **kwargs: Any):
+        super().__init__(db_url, **kwargs)
+        self.max_summaries = max_summaries
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        if _is_compaction(event):
+            await self._prune(session, event)
+        return event
+
+    async def _prune(self, session: Session, compaction_event: Event) -> None:
+        start = compaction_event.actions.compaction.start_timestamp
+        summaries = [e for e in session.events if _is_compaction(e)]
+        stale = {e.id for e in summaries[:-self.max_summaries]}
+        stale.update(
+            e.id for e in session.events
+            if not _is_compaction(e) and start is not None and e.timestamp < start
+        )
+        if not stale:
+            return
+
+        async with self.database_session_factory() as sql_session:
+            await sql_session.execute(
+                delete(StorageEvent).where(
+                    StorageEvent.app_name == session.app_name,
+                    StorageEvent.user_id == session.user_id,
+                    StorageEvent.session_id == session.id,
+                    StorageEvent.id.in_(stale),
+                )
+            )
+            await sql_session.commit()
+
+        session.events = [e for e in session.events if e.id not in stale]
+        logger.info(f"[SESSION] Pruned {len(stale)} events from session {session.id}")
+
+
+def _session_service_factory(uri: str, **kwargs: Any) -> BoundedDatabaseSessionService:
+    kwargs.pop("agents_dir", None)
+    service = BoundedDatabaseSessionService(db_url=uri, **kwargs)
+    register_engine("sessions", service.db_engine)
+    return service
+
+
+def register_session_service() -> None:
+    """Serve DATABASE_URL session URIs with BoundedDatabaseSessionService (call before get_fast_api_app)."""
+    scheme = urlparse(settings.DATABASE_URL).scheme
+    get_service_registry().register_session_service(scheme, _session_service_factory)
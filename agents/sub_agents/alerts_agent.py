@@ -7,6 +7,7 @@ from google.adk.agents.llm_agent import Agent
 
 from agents.constants import MODEL_NAME
 from agents.prompts import get_alerts_instruction
+from agents.tools.cached import cached_tools
 from agents.tools.alert_tools import (
     get_alerts,
     get_alert_by_id,
@@ -26,7 +27,7 @@ alerts_agent = Agent(
         "de contrat, rappel de paiement...)."
     ),
     instruction=get_alerts_instruction(),
-    tools=[
+    tools=cached_tools([
         get_alerts,
         get_alert_by_id,
         create_alert,
@@ -34,5 +35,5 @@ alerts_agent = Agent(
         deactivate_alert,
         delete_alert,
         get_upcoming_alerts,
-    ],
+    ]),
 )
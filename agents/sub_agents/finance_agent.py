@@ -7,11 +7,16 @@ from google.adk.agents.llm_agent import Agent
 
 from agents.constants import MODEL_NAME
 from agents.prompts import get_finance_instruction
+from agents.tools.cached import cached_tools
 from agents.tools.finance_tools import (
     get_finance_history,
+    get_net_worth,
+    get_cash_flow_forecast,
     add_transaction,
+    set_transaction_category,
     delete_transaction,
     get_subscriptions,
+    get_subscription_summary,
     create_subscription,
     get_recurring_transactions,
     create_recurring_transaction,
@@ -23,16 +28,20 @@ finance_agent = Agent(
     description=(
         "Gère tout ce qui concerne les finances : transactions ponctuelles (revenus, "
         "dépenses), abonnements récurrents (Netflix, loyer...), virements automatiques, "
-        "et consultation de l'historique financier."
+        "consultation de l'historique financier et du patrimoine net."
     ),
     instruction=get_finance_instruction(),
-    tools=[
+    tools=cached_tools([
         get_finance_history,
+        get_net_worth,
+        get_cash_flow_forecast,
         add_transaction,
+        set_transaction_category,
         delete_transaction,
         get_subscriptions,
+        get_subscription_summary,
         create_subscription,
         get_recurring_transactions,
         create_recurring_transaction,
-    ],
+    ]),
 )
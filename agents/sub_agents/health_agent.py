@@ -7,6 +7,7 @@ from google.adk.agents.llm_agent import Agent
 
 from agents.constants import MODEL_NAME
 from agents.prompts import get_health_instruction
+from agents.tools.cached import cached_tools
 from agents.tools.health_tools import (
     get_body_metrics,
     add_body_metric,
@@ -25,7 +26,7 @@ health_agent = Agent(
         "masse grasse), rendez-vous médicaux (médecin, dentiste, vaccin, bilan de santé)."
     ),
     instruction=get_health_instruction(),
-    tools=[
+    tools=cached_tools([
         get_body_metrics,
         add_body_metric,
         delete_body_metric,
@@ -33,5 +34,5 @@ health_agent = Agent(
         create_health_appointment,
         update_health_appointment,
         delete_health_appointment,
-    ],
+    ]),
 )
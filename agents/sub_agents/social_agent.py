@@ -7,12 +7,15 @@ from google.adk.agents.llm_agent import Agent
 
 from agents.constants import MODEL_NAME
 from agents.prompts import get_social_instruction
+from agents.tools.cached import cached_tools
 from agents.tools.social_tools import (
     get_social_events,
     create_social_event,
     update_social_event,
     delete_social_event,
     get_contacts,
+    get_contact_reminders,
+    get_contact_interactions,
     create_contact,
     update_contact,
     delete_contact,
@@ -26,14 +29,16 @@ social_agent = Agent(
         "mariages, anniversaires) et annuaire de contacts (famille, amis, collègues)."
     ),
     instruction=get_social_instruction(),
-    tools=[
+    tools=cached_tools([
         get_social_events,
         create_social_event,
         update_social_event,
         delete_social_event,
         get_contacts,
+        get_contact_reminders,
+        get_contact_interactions,
         create_contact,
         update_contact,
         delete_contact,
-    ],
+    ]),
 )
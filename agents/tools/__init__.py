@@ -18,6 +18,8 @@ from .category_tools import (
 from .item_tools import (
     get_all_items,
     get_item_by_id,
+    get_items_overview,
+    get_item_dependencies,
     create_item,
     update_item,
     delete_item,
@@ -26,9 +28,13 @@ from .item_tools import (
 # === FINANCE TOOLS ===
 from .finance_tools import (
     get_finance_history,
+    get_net_worth,
+    get_cash_flow_forecast,
     add_transaction,
+    set_transaction_category,
     delete_transaction,
     get_subscriptions,
+    get_subscription_summary,
     create_subscription,
     get_recurring_transactions,
     create_recurring_transaction,
@@ -52,6 +58,8 @@ from .social_tools import (
     update_social_event,
     delete_social_event,
     get_contacts,
+    get_contact_reminders,
+    get_contact_interactions,
     create_contact,
     update_contact,
     delete_contact,
@@ -82,15 +90,21 @@ ALL_TOOLS = [
     # Item tools
     get_all_items,
     get_item_by_id,
+    get_items_overview,
+    get_item_dependencies,
     create_item,
     update_item,
     delete_item,
     
     # Finance tools
     get_finance_history,
+    get_net_worth,
+    get_cash_flow_forecast,
     add_transaction,
+    set_transaction_category,
     delete_transaction,
     get_subscriptions,
+    get_subscription_summary,
     create_subscription,
     get_recurring_transactions,
     create_recurring_transaction,
@@ -110,6 +124,8 @@ ALL_TOOLS = [
     update_social_event,
     delete_social_event,
     get_contacts,
+    get_contact_reminders,
+    get_contact_interactions,
     create_contact,
     update_contact,
     delete_contact,
@@ -123,6 +139,34 @@ ALL_TOOLS = [
     delete_alert,
     get_upcoming_alerts,
 ]
+# Tools that never write: safe to run concurrently within a turn
+READ_ONLY_TOOLS = {
+    tool.__name__
+    for tool in [
+        get_all_islands,
+        get_island_by_name,
+        get_island_by_id,
+        get_all_items,
+        get_item_by_id,
+        get_items_overview,
+        get_item_dependencies,
+        get_finance_history,
+        get_net_worth,
+        get_cash_flow_forecast,
+        get_subscriptions,
+        get_subscription_summary,
+        get_recurring_transactions,
+        get_body_metrics,
+        get_health_appointments,
+        get_social_events,
+        get_contacts,
+        get_contact_reminders,
+        get_contact_interactions,
+        get_alerts,
+        get_alert_by_id,
+        get_upcoming_alerts,
+    ]
+}
 
 __all__ = [
     # Category tools
@@ -136,15 +180,21 @@ __all__ = [
     # Item tools
     "get_all_items",
     "get_item_by_id",
+    "get_items_overview",
+    "get_item_dependencies",
     "create_item",
     "update_item",
     "delete_item",
     
     # Finance tools
     "get_finance_history",
+    "get_net_worth",
+    "get_cash_flow_forecast",
     "add_transaction",
+    "set_transaction_category",
     "delete_transaction",
     "get_subscriptions",
+    "get_subscription_summary",
     "create_subscription",
     "get_recurring_transactions",
     "create_recurring_transaction",
@@ -164,6 +214,8 @@ __all__ = [
     "update_social_event",
     "delete_social_event",
     "get_contacts",
+    "get_contact_reminders",
+    "get_contact_interactions",
     "create_contact",
     "update_contact",
     "delete_contact",
@@ -179,4 +231,5 @@ __all__ = [
     
     # All tools list
     "ALL_TOOLS",
+    "READ_ONLY_TOOLS",
 ]
@@ -0,0 +1,36 @@
+"""
+Cached tool wrappers for the LifeMap ADK Agent.
+
+ADK wraps plain functions in a new FunctionTool and rebuilds the function
+declaration (signature + docstring introspection) on every model call.
+These wrappers are built once at import and memoize their declaration.
+"""
+from typing import Callable, List, Optional
+
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.function_tool import FunctionTool
+from google.genai import types
+
+
+class _DeclarationCacheMixin:
+    """Memoize `_get_declaration()` per API variant (Gemini API / Vertex AI)."""
+
+    def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+        cache = self.__dict__.setdefault("_declaration_cache", {})
+        variant = self._api_variant
+        if variant not in cache:
+            cache[variant] = super()._get_declaration()
+        return cache[variant]
+
+
+class CachedFunctionTool(_DeclarationCacheMixin, FunctionTool):
+    """FunctionTool whose declaration is built once."""
+
+
+class CachedAgentTool(_DeclarationCacheMixin, AgentTool):
+    """AgentTool whose declaration is built once."""
+
+
+def cached_tools(funcs: List[Callable]) -> List[CachedFunctionTool]:
+    """Wrap tool functions once, for an agent `tools=[...]` list."""
+    return [CachedFunctionTool(func) for func in funcs]
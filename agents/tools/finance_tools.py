@@ -4,8 +4,10 @@ Finance tools for the LifeMap ADK Agent.
 Async tools that directly call FinanceService with database sessions.
 """
 import time
-from typing import Optional
+from typing import List, Optional
+from agents.constants import DEFAULT_TOOL_ROW_LIMIT, MAX_TOOL_ROW_LIMIT
 from agents.dependencies import get_async_session
+from agents.tools.payload import project, budgeted_response
 from app.services.finance_service import FinanceService
 
 
@@ -18,6 +20,7 @@ def _serialize_history_entry(entry) -> dict:
         "value": entry.value,
         "label": entry.label,
         "category": entry.category,
+        "spending_category": entry.spendingCategory,
     }
 
 
@@ -52,22 +55,76 @@ def _serialize_recurring(rec) -> dict:
 
 # === HISTORY TOOLS ===
 
-async def get_finance_history(item_id: Optional[str] = None) -> dict:
+async def get_finance_history(
+    item_id: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    since: Optional[int] = None,
+    limit: int = DEFAULT_TOOL_ROW_LIMIT,
+    cursor: int = 0,
+    summary: bool = False,
+    spending_category: Optional[str] = None
+) -> dict:
     """
-    Récupère l'historique des transactions financières.
+    Récupère l'historique des transactions financières (les plus récentes d'abord).
+    Pour une question globale (total, solde, dernière opération), utilise summary=True.
     
     Args:
         item_id: Optionnel - filtrer par compte/item
+        fields: Optionnel - champs à retourner (ex: ["date", "value", "label"])
+        since: Optionnel - uniquement les transactions depuis cette date (timestamp ms)
+        limit: Nombre maximum de transactions retournées (défaut: 20)
+        cursor: Position de départ, utilise le `next_cursor` d'une réponse précédente
+        summary: Si True, retourne uniquement les agrégats (nombre, totaux, min/max, dernière transaction)
+        spending_category: Optionnel - filtrer par catégorie de dépense (ex: "groceries", "rent"), sans summary
     """
     try:
         from uuid import UUID
         async with get_async_session() as session:
             service = FinanceService(session)
             uuid_filter = UUID(item_id) if item_id else None
-            entries = await service.get_history(item_id=uuid_filter)
-            serialized = [_serialize_history_entry(e) for e in entries]
             
-            return {"status": "success", "count": len(serialized), "history": serialized}
+            if summary:
+                stats = await service.get_history_summary(item_id=uuid_filter, since=since)
+                return {"status": "success", "summary": stats}
+            
+            limit = max(1, min(limit, MAX_TOOL_ROW_LIMIT))
+            entries = await service.get_history(
+                item_id=uuid_filter, since=since, skip=cursor, limit=limit + 1, spending_category=spending_category,
+            )
+            serialized = project([_serialize_history_entry(e) for e in entries[:limit]], fields)
+            
+            return budgeted_response("history", serialized, offset=cursor, has_more=len(entries) > limit)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def get_net_worth(
+    since: Optional[int] = None,
+    bucket: str = "month",
+    include_items: bool = True
+) -> dict:
+    """
+    Patrimoine net de l'utilisateur : soldes des comptes, valeur nette des biens
+    immobiliers (valeur estimée - capital restant dû), autres items monétaires,
+    dettes en négatif. Un seul appel suffit pour "combien je vaux ?".
+
+    Args:
+        since: Optionnel - début de l'évolution (timestamp ms), défaut : 12 derniers mois
+        bucket: Pas de l'évolution ('month' ou 'year')
+        include_items: Si False, retourne uniquement les totaux et l'évolution (sans le détail par item)
+    """
+    try:
+        from app.services.networth_service import NetWorthService
+        async with get_async_session() as session:
+            net_worth = await NetWorthService(session).get_net_worth(start=since, bucket=bucket)
+
+        if include_items:
+            net_worth["items"] = [
+                {**entry, "itemId": str(entry["itemId"])} for entry in net_worth["items"]
+            ]
+        else:
+            net_worth.pop("items")
+        return {"status": "success", "net_worth": net_worth}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -77,7 +134,8 @@ async def add_transaction(
     value: float,
     label: str,
     date: int,
-    category: str = "expense"
+    category: str = "expense",
+    spending_category: Optional[str] = None
 ) -> dict:
     """
     Ajoute une transaction à l'historique financier.
@@ -88,6 +146,7 @@ async def add_transaction(
         label: Description de la transaction
         date: Date en timestamp milliseconds
         category: Type ('income' ou 'expense')
+        spending_category: Optionnel - catégorie de dépense si l'utilisateur la précise ; sinon déduite du libellé
     """
     try:
         from uuid import UUID
@@ -101,6 +160,7 @@ async def add_transaction(
             label=label,
             date=date,
             category=HistoryCategory(category),
+            spendingCategory=spending_category,
         )
         
         async with get_async_session() as session:
@@ -112,6 +172,35 @@ async def add_transaction(
         return {"status": "error", "message": str(e)}
 
 
+async def set_transaction_category(entry_id: str, spending_category: str) -> dict:
+    """
+    Corrige la catégorie de dépense d'une transaction (ex: "restaurants" au lieu
+    de "groceries"). Les transactions suivantes au libellé semblable seront
+    classées de la même façon.
+
+    Args:
+        entry_id: ID de la transaction
+        spending_category: Nouvelle catégorie (groceries, rent, utilities, transport, restaurants,
+            health, insurance, subscriptions, shopping, leisure, salary, taxes, transfer, ou autre)
+    """
+    try:
+        from uuid import UUID
+        from app.schemas.finance import HistoryEntryUpdate
+
+        async with get_async_session() as session:
+            service = FinanceService(session)
+            entry = await service.update_history_entry(
+                UUID(entry_id), HistoryEntryUpdate(spendingCategory=spending_category)
+            )
+
+            if not entry:
+                return {"status": "not_found", "message": f"Transaction {entry_id} non trouvée"}
+
+            return {"status": "success", "entry": _serialize_history_entry(entry)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
 async def delete_transaction(entry_id: str) -> dict:
     """
     Supprime une transaction de l'historique.
@@ -133,6 +222,48 @@ async def delete_transaction(entry_id: str) -> dict:
         return {"status": "error", "message": str(e)}
 
 
+async def get_cash_flow_forecast(
+    months: int = 12,
+    account_id: Optional[str] = None,
+    include_points: bool = False
+) -> dict:
+    """
+    Prévision du solde des comptes sur les prochains mois, à partir du solde actuel,
+    des transactions récurrentes et des abonnements actifs.
+    Pour "vais-je être à découvert ?", regarde `lowestBalance` et `lowestBalanceDate`.
+
+    Args:
+        months: Horizon en mois, mois en cours inclus (1 à 120, défaut: 12)
+        account_id: Optionnel - un seul compte
+        include_points: Si True, ajoute le solde prévu de chaque compte mois par mois
+    """
+    try:
+        from uuid import UUID
+        from app.core.config import settings
+        async with get_async_session() as session:
+            service = FinanceService(session)
+            forecast = await service.get_forecast(
+                months=max(1, min(months, settings.FORECAST_MAX_MONTHS)),
+                account_id=UUID(account_id) if account_id else None,
+            )
+
+        accounts = [
+            {
+                **{key: value for key, value in account.items() if key != "points" or include_points},
+                "itemId": str(account["itemId"]),
+            }
+            for account in forecast["accounts"]
+        ]
+        return {
+            "status": "success",
+            "months": forecast["months"],
+            "accounts": accounts,
+            "end_total": forecast["total"][-1]["balance"] if forecast["total"] else 0.0,
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
 # === SUBSCRIPTION TOOLS ===
 
 async def get_subscriptions(item_id: Optional[str] = None) -> dict:
@@ -155,6 +286,55 @@ async def get_subscriptions(item_id: Optional[str] = None) -> dict:
         return {"status": "error", "message": str(e)}
 
 
+async def get_subscription_summary() -> dict:
+    """
+    Vue d'ensemble des abonnements actifs : coût mensuel et annuel par compte,
+    doublons probables (même nom, ou même montant sur plusieurs comptes) et
+    dernières hausses/baisses de prix. À préférer à get_subscriptions pour
+    "combien me coûtent mes abonnements ?" ou "ai-je des abonnements en double ?".
+    """
+    try:
+        async with get_async_session() as session:
+            service = FinanceService(session)
+            summary = await service.get_subscription_summary()
+
+        return {
+            "status": "success",
+            "active_count": summary["activeCount"],
+            "monthly_burn": summary["monthlyBurn"],
+            "annual_burn": summary["annualBurn"],
+            "accounts": [
+                {
+                    "item_id": str(account["itemId"]),
+                    "active_count": account["activeCount"],
+                    "monthly_burn": account["monthlyBurn"],
+                    "annual_burn": account["annualBurn"],
+                }
+                for account in summary["accounts"]
+            ],
+            "duplicates": [
+                {
+                    "reason": group["reason"],
+                    "key": group["key"],
+                    "subscriptions": [_serialize_subscription(sub) for sub in group["subscriptions"]],
+                }
+                for group in summary["duplicates"]
+            ],
+            "price_changes": [
+                {
+                    "subscription_id": str(change["subscriptionId"]),
+                    "name": change["name"],
+                    "old_amount": change["oldAmount"],
+                    "new_amount": change["newAmount"],
+                    "changed_at": change["changedAt"],
+                }
+                for change in summary["priceChanges"]
+            ],
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
 async def create_subscription(
     item_id: str,
     name: str,
@@ -3,9 +3,11 @@ Health tools for the LifeMap ADK Agent.
 
 Async tools that directly call HealthService with database sessions.
 """
-from typing import Optional
+from typing import List, Optional
+from agents.constants import DEFAULT_TOOL_ROW_LIMIT, MAX_TOOL_ROW_LIMIT
 from agents.dependencies import get_async_session
-from app.services.health_service import HealthService
+from agents.tools.payload import project, budgeted_response
+from app.services.health_service import DuplicateMetric, HealthService
 
 
 def _serialize_metric(metric) -> dict:
@@ -39,22 +41,41 @@ def _serialize_appointment(apt) -> dict:
 
 # === BODY METRICS TOOLS ===
 
-async def get_body_metrics(item_id: Optional[str] = None) -> dict:
+async def get_body_metrics(
+    item_id: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    since: Optional[int] = None,
+    limit: int = DEFAULT_TOOL_ROW_LIMIT,
+    cursor: int = 0,
+    summary: bool = False
+) -> dict:
     """
-    Récupère les métriques corporelles.
+    Récupère les métriques corporelles (les plus récentes d'abord).
+    Pour une question globale (poids actuel, évolution, min/max), utilise summary=True.
     
     Args:
         item_id: Optionnel - filtrer par item santé
+        fields: Optionnel - champs à retourner (ex: ["date", "weight"])
+        since: Optionnel - uniquement les mesures depuis cette date (timestamp ms)
+        limit: Nombre maximum de mesures retournées (défaut: 20)
+        cursor: Position de départ, utilise le `next_cursor` d'une réponse précédente
+        summary: Si True, retourne uniquement les agrégats (nombre, poids min/max/moyen, dernière mesure)
     """
     try:
         from uuid import UUID
         async with get_async_session() as session:
             service = HealthService(session)
             uuid_filter = UUID(item_id) if item_id else None
-            metrics = await service.get_metrics(item_id=uuid_filter)
-            serialized = [_serialize_metric(m) for m in metrics]
             
-            return {"status": "success", "count": len(serialized), "metrics": serialized}
+            if summary:
+                stats = await service.get_metrics_summary(item_id=uuid_filter, since=since)
+                return {"status": "success", "summary": stats}
+            
+            limit = max(1, min(limit, MAX_TOOL_ROW_LIMIT))
+            metrics = await service.get_metrics(item_id=uuid_filter, since=since, skip=cursor, limit=limit + 1)
+            serialized = project([_serialize_metric(m) for m in metrics[:limit]], fields)
+            
+            return budgeted_response("metrics", serialized, offset=cursor, has_more=len(metrics) > limit)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -99,6 +120,8 @@ async def add_body_metric(
             metric = await service.create_metric(metric_data)
             
             return {"status": "success", "metric": _serialize_metric(metric)}
+    except DuplicateMetric:
+        return {"status": "conflict", "message": f"Une mesure existe déjà pour l'item {item_id} à cette date ({date})"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -4,8 +4,14 @@ Item tools for the LifeMap ADK Agent.
 Async tools that directly call ItemService with database sessions.
 """
 import logging
-from typing import Optional
+from types import SimpleNamespace
+from typing import List, Optional
+from agents.constants import DEFAULT_TOOL_ROW_LIMIT, MAX_TOOL_ROW_LIMIT
 from agents.dependencies import get_async_session
+from agents.tools.alert_tools import _serialize_alert
+from agents.tools.finance_tools import _serialize_history_entry, _serialize_subscription
+from agents.tools.payload import project, budgeted_response
+from app.services.dependency_service import DependencyService
 from app.services.item_service import ItemService
 from app.schemas.enums import ItemType, ItemStatus, AssetType
 from app.schemas.items import LifeItemCreate, LifeItemUpdate
@@ -20,6 +26,8 @@ def _serialize_item(item) -> dict:
         "id": str(item.id),
         "name": item.name,
         "value": item.value,
+        "numeric_value": item.numericValue,
+        "currency": item.currency,
         "type": item.type.value if item.type else None,
         "status": item.status.value if item.status else None,
         "category_id": str(item.categoryId) if item.categoryId else None,
@@ -67,6 +75,87 @@ async def get_item_by_id(item_id: str) -> dict:
         return {"status": "error", "message": str(e)}
 
 
+async def get_items_overview(
+    item_ids: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    limit: int = DEFAULT_TOOL_ROW_LIMIT,
+    cursor: int = 0
+) -> dict:
+    """
+    Récupère des items avec leurs alertes, abonnements et historique récent,
+    en une seule fois (plus efficace que d'appeler les outils un par un).
+
+    Args:
+        item_ids: Optionnel - IDs des items à récupérer (tous les items si absent)
+        fields: Optionnel - champs à retourner (ex: ["name", "alerts", "recent_history"])
+        limit: Nombre maximum d'items retournés (défaut: 20)
+        cursor: Position de départ, utilise le `next_cursor` d'une réponse précédente
+    """
+    try:
+        limit = max(1, min(limit, MAX_TOOL_ROW_LIMIT))
+        async with get_async_session() as session:
+            service = ItemService(session)
+            if item_ids:
+                page_ids = [UUID(item_id) for item_id in item_ids[cursor:cursor + limit + 1]]
+                details = await service.get_items_details(item_ids=page_ids) if page_ids else []
+            else:
+                details = await service.get_items_details(skip=cursor, limit=limit + 1)
+            serialized = [
+                {
+                    **_serialize_item(SimpleNamespace(**detail)),
+                    "alerts": [_serialize_alert(a) for a in detail["alerts"]],
+                    "subscriptions": [_serialize_subscription(s) for s in detail["subscriptions"]],
+                    "recent_history": [_serialize_history_entry(h) for h in detail["recentHistory"]],
+                }
+                for detail in details[:limit]
+            ]
+
+            return budgeted_response(
+                "items", project(serialized, fields), offset=cursor, has_more=len(details) > limit
+            )
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def get_item_dependencies(item_id: str, depth: Optional[int] = None, direction: str = "both") -> dict:
+    """
+    Récupère les items liés à un item via les dépendances (ex: "qu'est-ce qui dépend de ma voiture ?").
+
+    Args:
+        item_id: ID de l'item de départ
+        depth: Optionnel - nombre de liens maximum à suivre (tous les items liés, directement ou non, si absent)
+        direction: 'in' (ce qui pointe vers l'item), 'out' (ce vers quoi l'item pointe) ou 'both' (défaut)
+    """
+    try:
+        if direction not in ("in", "out", "both"):
+            return {"status": "error", "message": f"Direction inconnue: '{direction}'. Valeurs valides: ['in', 'out', 'both']"}
+
+        async with get_async_session() as session:
+            service = DependencyService(session)
+            if depth:
+                graph = await service.get_neighborhood(UUID(item_id), depth=depth, direction=direction)
+            else:
+                graph = await service.get_impact(UUID(item_id), direction=direction)
+
+            linked = [
+                {"id": str(node["id"]), "name": node["name"], "distance": node["depth"]}
+                for node in sorted(graph["nodes"], key=lambda node: node["depth"])
+                if node["id"] != graph["rootId"]
+            ]
+            links = [
+                {
+                    "from_item_id": str(edge.fromItemId),
+                    "to_item_id": str(edge.toItemId),
+                    "link_type": edge.linkType,
+                    "description": edge.description,
+                }
+                for edge in graph["edges"]
+            ]
+            return {"status": "success", "count": len(linked), "linked_items": linked, "links": links}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
 async def create_item(
     name: str,
     category_id: Optional[str] = None,
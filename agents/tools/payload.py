@@ -0,0 +1,58 @@
+"""
+Payload helpers for the LifeMap ADK Agent read tools.
+
+Projection (keep only requested fields) and token-budget guard shared by
+the list tools, so long histories don't flood the model prompt.
+"""
+import json
+from typing import List, Optional
+
+from agents.constants import CHARS_PER_TOKEN, TOOL_PAYLOAD_TOKEN_BUDGET
+
+
+def estimate_tokens(payload) -> int:
+    """Rough token estimate of a JSON-serializable payload."""
+    return len(json.dumps(payload, ensure_ascii=False, default=str)) // CHARS_PER_TOKEN + 1
+
+
+def project(rows: List[dict], fields: Optional[List[str]] = None) -> List[dict]:
+    """
+    Keep only the requested fields of each serialized row.
+    The `id` is always kept so the agent can act on the row afterwards.
+    Unknown field names are ignored.
+    """
+    if not fields:
+        return rows
+    wanted = {"id", *fields}
+    return [{k: v for k, v in row.items() if k in wanted} for row in rows]
+
+
+def budgeted_response(
+    key: str,
+    rows: List[dict],
+    offset: int = 0,
+    has_more: bool = False,
+    budget_tokens: int = TOOL_PAYLOAD_TOKEN_BUDGET,
+) -> dict:
+    """
+    Build a list tool response that fits in `budget_tokens`.
+
+    Rows are kept in order until the budget is reached. When rows are dropped
+    (or the page was already cut by the SQL limit) a `next_cursor` is returned:
+    pass it back as `cursor` to fetch the following rows.
+    """
+    kept = []
+    used = 0
+    for row in rows:
+        cost = estimate_tokens(row)
+        if kept and used + cost > budget_tokens:
+            break
+        kept.append(row)
+        used += cost
+
+    truncated = len(kept) < len(rows)
+    response = {"status": "success", "count": len(kept), key: kept}
+    if truncated or has_more:
+        response["truncated"] = truncated
+        response["next_cursor"] = offset + len(kept)
+    return response
@@ -4,8 +4,10 @@ Social tools for the LifeMap ADK Agent.
 Async tools that directly call SocialService with database sessions.
 """
 from typing import List, Optional
+from agents.constants import DEFAULT_TOOL_ROW_LIMIT, MAX_TOOL_ROW_LIMIT
 from agents.dependencies import get_async_session
-from app.services.social_service import SocialService
+from agents.tools.payload import project, budgeted_response
+from app.services.social_service import SocialService, decode_event_cursor, encode_event_cursor
 
 
 def _serialize_event(event) -> dict:
@@ -30,6 +32,7 @@ def _serialize_contact(contact) -> dict:
         "birthday": contact.birthday if hasattr(contact, 'birthday') else None,
         "last_contact_date": contact.lastContactDate if hasattr(contact, 'lastContactDate') else None,
         "contact_frequency_days": contact.contactFrequencyDays if hasattr(contact, 'contactFrequencyDays') else None,
+        "next_contact_due": contact.nextContactDue if hasattr(contact, 'nextContactDue') else None,
         "avatar": contact.avatar if hasattr(contact, 'avatar') else None,
         "notes": contact.notes if hasattr(contact, 'notes') else None,
     }
@@ -37,22 +40,41 @@ def _serialize_contact(contact) -> dict:
 
 # === SOCIAL EVENTS TOOLS ===
 
-async def get_social_events(item_id: Optional[str] = None) -> dict:
+async def get_social_events(
+    item_id: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    since: Optional[int] = None,
+    limit: int = DEFAULT_TOOL_ROW_LIMIT,
+    cursor: int = 0,
+    summary: bool = False
+) -> dict:
     """
-    Récupère les événements sociaux.
+    Récupère les événements sociaux (les plus récents d'abord).
+    Pour une question globale (combien d'événements, le dernier), utilise summary=True.
     
     Args:
         item_id: Optionnel - filtrer par item social
+        fields: Optionnel - champs à retourner (ex: ["title", "date"])
+        since: Optionnel - uniquement les événements depuis cette date (timestamp ms)
+        limit: Nombre maximum d'événements retournés (défaut: 20)
+        cursor: Position de départ, utilise le `next_cursor` d'une réponse précédente
+        summary: Si True, retourne uniquement les agrégats (nombre par type, dates, dernier événement)
     """
     try:
         from uuid import UUID
         async with get_async_session() as session:
             service = SocialService(session)
             uuid_filter = UUID(item_id) if item_id else None
-            events = await service.get_events(item_id=uuid_filter)
-            serialized = [_serialize_event(e) for e in events]
             
-            return {"status": "success", "count": len(serialized), "events": serialized}
+            if summary:
+                stats = await service.get_events_summary(item_id=uuid_filter, since=since)
+                return {"status": "success", "summary": stats}
+            
+            limit = max(1, min(limit, MAX_TOOL_ROW_LIMIT))
+            events = await service.get_events(item_id=uuid_filter, since=since, skip=cursor, limit=limit + 1)
+            serialized = project([_serialize_event(e) for e in events[:limit]], fields)
+            
+            return budgeted_response("events", serialized, offset=cursor, has_more=len(events) > limit)
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -173,22 +195,131 @@ async def delete_social_event(event_id: str) -> dict:
 
 # === CONTACTS TOOLS ===
 
-async def get_contacts(item_id: Optional[str] = None) -> dict:
+async def get_contacts(
+    item_id: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    since: Optional[int] = None,
+    limit: int = DEFAULT_TOOL_ROW_LIMIT,
+    cursor: int = 0,
+    summary: bool = False
+) -> dict:
     """
-    Récupère les contacts.
+    Récupère les contacts (par ordre alphabétique).
+    Pour une question globale (combien de contacts, dernier contacté), utilise summary=True.
     
     Args:
         item_id: Optionnel - filtrer par item social
+        fields: Optionnel - champs à retourner (ex: ["name", "last_contact_date"])
+        since: Optionnel - uniquement les contacts vus depuis cette date (timestamp ms)
+        limit: Nombre maximum de contacts retournés (défaut: 20)
+        cursor: Position de départ, utilise le `next_cursor` d'une réponse précédente
+        summary: Si True, retourne uniquement les agrégats (nombre, dates de dernier contact)
     """
     try:
         from uuid import UUID
         async with get_async_session() as session:
             service = SocialService(session)
             uuid_filter = UUID(item_id) if item_id else None
-            contacts = await service.get_contacts(item_id=uuid_filter)
-            serialized = [_serialize_contact(c) for c in contacts]
             
-            return {"status": "success", "count": len(serialized), "contacts": serialized}
+            if summary:
+                stats = await service.get_contacts_summary(item_id=uuid_filter, since=since)
+                return {"status": "success", "summary": stats}
+            
+            limit = max(1, min(limit, MAX_TOOL_ROW_LIMIT))
+            contacts = await service.get_contacts(item_id=uuid_filter, since=since, skip=cursor, limit=limit + 1)
+            serialized = project([_serialize_contact(c) for c in contacts[:limit]], fields)
+            
+            return budgeted_response("contacts", serialized, offset=cursor, has_more=len(contacts) > limit)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def get_contact_reminders(
+    item_id: Optional[str] = None,
+    days: int = 30,
+    limit: int = DEFAULT_TOOL_ROW_LIMIT
+) -> dict:
+    """
+    Contacts à relancer et anniversaires à venir.
+    Utilise cet outil pour "qui dois-je appeler ?" ou "quels anniversaires arrivent ?"
+    plutôt que de lister tous les contacts.
+    
+    Args:
+        item_id: Optionnel - filtrer par item social
+        days: Fenêtre des anniversaires à venir, en jours (défaut: 30)
+        limit: Nombre maximum de contacts par liste (défaut: 20)
+    """
+    try:
+        from uuid import UUID
+        async with get_async_session() as session:
+            service = SocialService(session)
+            uuid_filter = UUID(item_id) if item_id else None
+            limit = max(1, min(limit, MAX_TOOL_ROW_LIMIT))
+            days = max(0, min(days, 366))
+
+            overdue = await service.get_overdue_contacts(item_id=uuid_filter, limit=limit)
+            birthdays = await service.get_upcoming_birthdays(days=days, item_id=uuid_filter, limit=limit)
+
+            return {
+                "status": "success",
+                "overdue": project(
+                    [_serialize_contact(c) for c in overdue],
+                    ["name", "last_contact_date", "next_contact_due"],
+                ),
+                "upcoming_birthdays": [
+                    {
+                        "id": str(b["contact"].id),
+                        "name": b["contact"].name,
+                        "next_birthday": b["nextBirthday"],
+                        "days_until": b["daysUntil"],
+                    }
+                    for b in birthdays
+                ],
+            }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def get_contact_interactions(
+    contact_id: str,
+    fields: Optional[List[str]] = None,
+    limit: int = DEFAULT_TOOL_ROW_LIMIT,
+    cursor: Optional[str] = None
+) -> dict:
+    """
+    Historique des interactions avec un contact : nombre d'événements, premier et
+    dernier événement, puis les événements auxquels il a participé (les plus récents d'abord).
+    
+    Args:
+        contact_id: ID du contact
+        fields: Optionnel - champs des événements à retourner (ex: ["title", "date"])
+        limit: Nombre maximum d'événements retournés (défaut: 20)
+        cursor: Optionnel - `next_cursor` d'une réponse précédente pour la page suivante
+    """
+    try:
+        from uuid import UUID
+        async with get_async_session() as session:
+            service = SocialService(session)
+            contact_uuid = UUID(contact_id)
+            if not await service.get_contact(contact_uuid):
+                return {"status": "not_found", "message": f"Contact {contact_id} non trouvé"}
+
+            limit = max(1, min(limit, MAX_TOOL_ROW_LIMIT))
+            before = decode_event_cursor(cursor) if cursor else None
+            summary = await service.get_contact_interactions(contact_uuid)
+            events = await service.get_contact_events(contact_uuid, limit=limit + 1, before=before)
+            page = events[:limit]
+
+            return {
+                "status": "success",
+                "summary": {
+                    "count": summary["count"],
+                    "first_event_date": summary["firstEventDate"],
+                    "last_event_date": summary["lastEventDate"],
+                },
+                "events": project([_serialize_event(e) for e in page], fields),
+                "next_cursor": encode_event_cursor(page[-1]) if len(events) > limit else None,
+            }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -0,0 +1,35 @@
+"""Add scene_changes: change log versioning the 3D map snapshot
+
+Revision ID: 006_scene_changes
+Revises: 005_missing_tables
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '006_scene_changes'
+down_revision: Union[str, None] = '005_missing_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'scene_changes' in inspector.get_table_names():
+        return
+
+    op.create_table('scene_changes',
+        sa.Column('version', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('version')
+    )
+    op.create_index('ix_scene_changes_created_at', 'scene_changes', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('scene_changes')
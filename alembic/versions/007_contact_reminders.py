@@ -0,0 +1,68 @@
+"""Add contacts.next_contact_due and contacts.birthday_day for the reminder queries
+
+Revision ID: 007_contact_reminders
+Revises: 006_scene_changes
+Create Date: 2026-10-19
+
+Both columns are derived from existing ones and maintained by SocialService:
+- next_contact_due: last_contact_date + contact_frequency_days (ms)
+- birthday_day: birthday as month * 100 + day (UTC), so upcoming birthdays
+  are a range scan whatever the birth year
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '007_contact_reminders'
+down_revision: Union[str, None] = '006_scene_changes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'contacts' not in inspector.get_table_names():
+        return
+
+    existing_columns = [col['name'] for col in inspector.get_columns('contacts')]
+    existing_indexes = [index['name'] for index in inspector.get_indexes('contacts')]
+
+    if 'next_contact_due' not in existing_columns:
+        op.add_column('contacts', sa.Column('next_contact_due', sa.BigInteger(), nullable=True))
+    if 'birthday_day' not in existing_columns:
+        op.add_column('contacts', sa.Column('birthday_day', sa.Integer(), nullable=True))
+
+    # Backfill the existing rows
+    op.execute("""
+        UPDATE contacts
+        SET next_contact_due = last_contact_date + contact_frequency_days::bigint * 86400000
+        WHERE last_contact_date IS NOT NULL AND contact_frequency_days IS NOT NULL
+    """)
+    op.execute("""
+        UPDATE contacts
+        SET birthday_day = EXTRACT(MONTH FROM to_timestamp(birthday / 1000.0) AT TIME ZONE 'UTC') * 100
+                         + EXTRACT(DAY FROM to_timestamp(birthday / 1000.0) AT TIME ZONE 'UTC')
+        WHERE birthday IS NOT NULL
+    """)
+
+    if 'ix_contacts_next_contact_due' not in existing_indexes:
+        op.create_index('ix_contacts_next_contact_due', 'contacts', ['next_contact_due'])
+    if 'ix_contacts_birthday_day' not in existing_indexes:
+        op.create_index('ix_contacts_birthday_day', 'contacts', ['birthday_day'])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'contacts' not in inspector.get_table_names():
+        return
+
+    existing_columns = [col['name'] for col in inspector.get_columns('contacts')]
+    if 'birthday_day' in existing_columns:
+        op.drop_index('ix_contacts_birthday_day', table_name='contacts')
+        op.drop_column('contacts', 'birthday_day')
+    if 'next_contact_due' in existing_columns:
+        op.drop_index('ix_contacts_next_contact_due', table_name='contacts')
+        op.drop_column('contacts', 'next_contact_due')
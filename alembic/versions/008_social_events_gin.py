@@ -0,0 +1,36 @@
+"""Add a GIN index on social_events.contact_ids
+
+Revision ID: 008_social_events_gin
+Revises: 007_contact_reminders
+Create Date: 2026-10-19
+
+Serves the array containment lookups (`contact_ids @> ARRAY[:contact_id]`)
+behind /api/social/contacts/{id}/events.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '008_social_events_gin'
+down_revision: Union[str, None] = '007_contact_reminders'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'social_events' not in inspector.get_table_names():
+        return
+
+    existing_indexes = [index['name'] for index in inspector.get_indexes('social_events')]
+    if 'ix_social_events_contact_ids' not in existing_indexes:
+        op.create_index(
+            'ix_social_events_contact_ids', 'social_events', ['contact_ids'],
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_social_events_contact_ids')
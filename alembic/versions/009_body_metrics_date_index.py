@@ -0,0 +1,33 @@
+"""Add an (item_id, date) index on body_metrics
+
+Revision ID: 009_body_metrics_date_index
+Revises: 008_social_events_gin
+Create Date: 2026-10-19
+
+Serves the time-range reads of one item's measurements
+(/api/health/body-metrics/series).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '009_body_metrics_date_index'
+down_revision: Union[str, None] = '008_social_events_gin'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'body_metrics' not in inspector.get_table_names():
+        return
+
+    existing_indexes = [index['name'] for index in inspector.get_indexes('body_metrics')]
+    if 'ix_body_metrics_item_id_date' not in existing_indexes:
+        op.create_index('ix_body_metrics_item_id_date', 'body_metrics', ['item_id', 'date'])
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_body_metrics_item_id_date')
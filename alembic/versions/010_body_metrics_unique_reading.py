@@ -0,0 +1,43 @@
+"""Make (item_id, date) unique on body_metrics
+
+Revision ID: 010_body_metrics_unique_reading
+Revises: 009_body_metrics_date_index
+Create Date: 2026-10-19
+
+The batched ingest deduplicates readings with ON CONFLICT (item_id, date).
+Existing duplicates are removed first (one row is kept per item and date);
+the unique index replaces ix_body_metrics_item_id_date.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '010_body_metrics_unique_reading'
+down_revision: Union[str, None] = '009_body_metrics_date_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'body_metrics' not in inspector.get_table_names():
+        return
+
+    existing_indexes = [index['name'] for index in inspector.get_indexes('body_metrics')]
+    if 'uq_body_metrics_item_id_date' in existing_indexes:
+        return
+
+    op.execute("""
+        DELETE FROM body_metrics a
+        USING body_metrics b
+        WHERE a.item_id = b.item_id AND a.date = b.date AND a.id > b.id
+    """)
+    op.create_index('uq_body_metrics_item_id_date', 'body_metrics', ['item_id', 'date'], unique=True)
+    op.execute('DROP INDEX IF EXISTS ix_body_metrics_item_id_date')
+
+
+def downgrade() -> None:
+    op.execute('CREATE INDEX IF NOT EXISTS ix_body_metrics_item_id_date ON body_metrics (item_id, date)')
+    op.execute('DROP INDEX IF EXISTS uq_body_metrics_item_id_date')
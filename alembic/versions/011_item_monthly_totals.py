@@ -0,0 +1,56 @@
+"""Add item_monthly_totals: per-item running totals of history entries by month
+
+Revision ID: 011_item_monthly_totals
+Revises: 010_body_metrics_unique_reading
+Create Date: 2026-10-19
+
+Maintained by FinanceService on every history write; backs /api/networth.
+Backfilled here from history_entries (income counted positive, expense
+negative, transfers with their own sign).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '011_item_monthly_totals'
+down_revision: Union[str, None] = '010_body_metrics_unique_reading'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'item_monthly_totals' in inspector.get_table_names():
+        return
+
+    op.create_table('item_monthly_totals',
+        sa.Column('item_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('month', sa.BigInteger(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('entries', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['life_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('item_id', 'month')
+    )
+
+    if 'history_entries' in inspector.get_table_names():
+        op.execute("""
+            INSERT INTO item_monthly_totals (item_id, month, total, entries)
+            SELECT
+                item_id,
+                (EXTRACT(EPOCH FROM date_trunc('month', to_timestamp(date / 1000.0) AT TIME ZONE 'UTC')) * 1000)::bigint,
+                SUM(CASE category
+                    WHEN 'income' THEN ABS(value)
+                    WHEN 'expense' THEN -ABS(value)
+                    ELSE value
+                END),
+                COUNT(*)
+            FROM history_entries
+            GROUP BY 1, 2
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table('item_monthly_totals')
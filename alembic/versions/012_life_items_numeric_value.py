@@ -0,0 +1,106 @@
+"""Add life_items.numeric_value and life_items.currency (typed shadow of value)
+
+Revision ID: 012_life_items_numeric_value
+Revises: 011_item_monthly_totals
+Create Date: 2026-10-19
+
+`value` stays the displayed text; numeric_value holds the parsed number of
+currency and percentage items, maintained by ItemService. The backfill uses
+a frozen copy of app/services/item_values.py (migrations don't import app).
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '012_life_items_numeric_value'
+down_revision: Union[str, None] = '011_item_monthly_totals'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CURRENCY_SYMBOLS = {"€": "EUR", "$": "USD", "£": "GBP", "¥": "JPY", "₣": "CHF"}
+
+
+def _parse_amount(value):
+    if not value:
+        return None
+    text = re.sub(r"[^\d,.\-]", "", value)
+    if "," in text and "." in text:
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif text.count(",") == 1:
+        text = text.replace(",", ".")
+    else:
+        text = text.replace(",", "")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _parse_currency(value):
+    if not value:
+        return None
+    match = re.search(r"\b([A-Z]{3})\b", value)
+    if match:
+        return match.group(1)
+    for symbol, code in CURRENCY_SYMBOLS.items():
+        if symbol in value:
+            return code
+    return None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'life_items' not in inspector.get_table_names():
+        return
+
+    existing_columns = [col['name'] for col in inspector.get_columns('life_items')]
+    existing_indexes = [index['name'] for index in inspector.get_indexes('life_items')]
+
+    if 'numeric_value' not in existing_columns:
+        op.add_column('life_items', sa.Column('numeric_value', sa.Numeric(18, 4), nullable=True))
+    if 'currency' not in existing_columns:
+        op.add_column('life_items', sa.Column('currency', sa.String(3), nullable=True))
+
+    # Backfill the currency and percentage items
+    rows = conn.execute(sa.text(
+        "SELECT id, value, type FROM life_items WHERE type IN ('currency', 'percentage')"
+    )).fetchall()
+    updates = [
+        {
+            "id": item_id,
+            "numeric_value": _parse_amount(value),
+            "currency": _parse_currency(value) if item_type == 'currency' else None,
+        }
+        for item_id, value, item_type in rows
+    ]
+    if updates:
+        conn.execute(
+            sa.text("UPDATE life_items SET numeric_value = :numeric_value, currency = :currency WHERE id = :id"),
+            updates,
+        )
+
+    if 'ix_life_items_numeric_value' not in existing_indexes:
+        op.create_index('ix_life_items_numeric_value', 'life_items', ['numeric_value'])
+    if 'ix_life_items_category_numeric_value' not in existing_indexes:
+        op.create_index('ix_life_items_category_numeric_value', 'life_items', ['category_id', 'numeric_value'])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'life_items' not in inspector.get_table_names():
+        return
+
+    op.execute('DROP INDEX IF EXISTS ix_life_items_category_numeric_value')
+    op.execute('DROP INDEX IF EXISTS ix_life_items_numeric_value')
+    existing_columns = [col['name'] for col in inspector.get_columns('life_items')]
+    if 'currency' in existing_columns:
+        op.drop_column('life_items', 'currency')
+    if 'numeric_value' in existing_columns:
+        op.drop_column('life_items', 'numeric_value')
@@ -0,0 +1,82 @@
+"""Add subscriptions.normalized_name and the subscription_price_changes table
+
+Revision ID: 013_subscription_analytics
+Revises: 012_life_items_numeric_value
+Create Date: 2026-10-19
+
+normalized_name (lower case, no accents nor punctuation) backs the duplicate
+detection of /api/finance/subscriptions/summary; FinanceService keeps it in
+sync. The backfill uses a frozen copy of normalize_subscription_name.
+subscription_price_changes records every amount change from now on.
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '013_subscription_analytics'
+down_revision: Union[str, None] = '012_life_items_numeric_value'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize(name):
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^\w]+", " ", without_accents.casefold()).split())
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+    if 'subscriptions' not in tables:
+        return
+
+    existing_columns = [col['name'] for col in inspector.get_columns('subscriptions')]
+    existing_indexes = [index['name'] for index in inspector.get_indexes('subscriptions')]
+
+    if 'normalized_name' not in existing_columns:
+        op.add_column('subscriptions', sa.Column('normalized_name', sa.String(), nullable=True))
+
+    rows = conn.execute(sa.text("SELECT id, name FROM subscriptions")).fetchall()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE subscriptions SET normalized_name = :normalized_name WHERE id = :id"),
+            [{"id": sub_id, "normalized_name": _normalize(name)} for sub_id, name in rows],
+        )
+
+    if 'ix_subscriptions_normalized_name' not in existing_indexes:
+        op.create_index('ix_subscriptions_normalized_name', 'subscriptions', ['normalized_name'])
+
+    if 'subscription_price_changes' not in tables:
+        op.create_table('subscription_price_changes',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('subscription_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('old_amount', sa.Float(), nullable=False),
+            sa.Column('new_amount', sa.Float(), nullable=False),
+            sa.Column('changed_at', sa.BigInteger(), nullable=False),
+            sa.ForeignKeyConstraint(['subscription_id'], ['subscriptions.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(
+            'ix_subscription_price_changes_subscription_id_changed_at',
+            'subscription_price_changes', ['subscription_id', 'changed_at'],
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    if 'subscription_price_changes' in tables:
+        op.drop_table('subscription_price_changes')
+    if 'subscriptions' in tables:
+        op.execute('DROP INDEX IF EXISTS ix_subscriptions_normalized_name')
+        existing_columns = [col['name'] for col in inspector.get_columns('subscriptions')]
+        if 'normalized_name' in existing_columns:
+            op.drop_column('subscriptions', 'normalized_name')
@@ -0,0 +1,50 @@
+"""Add history_entries.spending_category and category_source
+
+Revision ID: 014_history_spending_category
+Revises: 013_subscription_analytics
+Create Date: 2026-10-19
+
+Fine-grained spending category (groceries, rent...) assigned by the
+categorizer, and where it comes from ("user", "model" or "rule"). Existing
+entries stay uncategorized: POST /api/finance/history/categorize fills
+them in batches.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '014_history_spending_category'
+down_revision: Union[str, None] = '013_subscription_analytics'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'history_entries' not in inspector.get_table_names():
+        return
+
+    existing_columns = [col['name'] for col in inspector.get_columns('history_entries')]
+    existing_indexes = [index['name'] for index in inspector.get_indexes('history_entries')]
+
+    if 'spending_category' not in existing_columns:
+        op.add_column('history_entries', sa.Column('spending_category', sa.String(), nullable=True))
+    if 'category_source' not in existing_columns:
+        op.add_column('history_entries', sa.Column('category_source', sa.String(), nullable=True))
+    if 'ix_history_entries_spending_category' not in existing_indexes:
+        op.create_index('ix_history_entries_spending_category', 'history_entries', ['spending_category'])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'history_entries' not in inspector.get_table_names():
+        return
+
+    op.execute('DROP INDEX IF EXISTS ix_history_entries_spending_category')
+    existing_columns = [col['name'] for col in inspector.get_columns('history_entries')]
+    for column in ('category_source', 'spending_category'):
+        if column in existing_columns:
+            op.drop_column('history_entries', column)
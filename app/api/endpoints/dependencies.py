@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.schemas.dependencies import Dependency, DependencyCreate, DependencyUpdate
+from app.schemas.dependencies import (
+    Dependency, DependencyCreate, DependencyUpdate,
+    DependencyGraph, DependencyTraversal, LinkType,
+)
+from app.services.dependency_graph import Direction, MAX_TRAVERSAL_DEPTH
 from app.services.dependency_service import DependencyService
 
 router = APIRouter()
@@ -27,6 +31,38 @@ async def create_dependency(
 ):
     return await service.create_dependency(dep_in)
 
+# --- Graph ---
+
+@router.get("/graph", response_model=DependencyGraph)
+async def read_dependency_graph(
+    service: DependencyService = Depends(get_dependency_service)
+):
+    """All dependency edges and the items they connect (3D map links)."""
+    return await service.get_graph()
+
+@router.get("/graph/items/{item_id}/neighborhood", response_model=DependencyTraversal)
+async def read_item_neighborhood(
+    item_id: UUID,
+    depth: int = Query(1, ge=1, le=MAX_TRAVERSAL_DEPTH),
+    direction: Direction = "both",
+    link_types: Optional[List[LinkType]] = Query(None),
+    service: DependencyService = Depends(get_dependency_service)
+):
+    """Items within `depth` links of an item ("out": from -> to, "in": reverse)."""
+    return await service.get_neighborhood(item_id, depth, direction, set(link_types) if link_types else None)
+
+@router.get("/graph/items/{item_id}/impact", response_model=DependencyTraversal)
+async def read_item_impact(
+    item_id: UUID,
+    direction: Direction = "both",
+    link_types: Optional[List[LinkType]] = Query(None),
+    service: DependencyService = Depends(get_dependency_service)
+):
+    """Everything transitively linked to an item."""
+    return await service.get_impact(item_id, direction, set(link_types) if link_types else None)
+
+# --- CRUD ---
+
 @router.get("/{dep_id}", response_model=Dependency)
 async def read_dependency(
     dep_id: UUID,
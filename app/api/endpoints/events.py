@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+
+from app.core.change_feed import FeedFull, FeedSubscriber, change_feed
+from app.core.config import settings
+
+router = APIRouter()
+
+
+class FeedStreamingResponse(StreamingResponse):
+    """
+    Streaming response that releases its feed subscriber once sent, even if
+    the client went away before the body generator started (its `finally`
+    never runs then).
+    """
+
+    def __init__(self, subscriber: FeedSubscriber, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.subscriber = subscriber
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.subscriber.close()
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    types: Optional[List[str]] = Query(None, description='Event types or prefixes, e.g. "item" or "history.added"'),
+):
+    """
+    Server-Sent Events stream of the changes (item.created, history.added, ...).
+    On `feed.overflow` the client fell behind: resync from /api/scene.
+    """
+    try:
+        subscriber = change_feed.subscribe(types)
+    except FeedFull:
+        raise HTTPException(status_code=503, detail="Too many change feed subscribers", headers={"Retry-After": "5"})
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                change = await subscriber.next_event(timeout=settings.CHANGE_FEED_HEARTBEAT)
+                yield change.to_sse() if change else ": keep-alive\n\n"
+        finally:
+            subscriber.close()
+
+    return FeedStreamingResponse(
+        subscriber,
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
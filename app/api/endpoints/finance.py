@@ -1,4 +1,7 @@
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,9 +11,12 @@ from app.schemas.finance import (
     HistoryEntry, HistoryEntryCreate, HistoryEntryUpdate,
     Subscription, SubscriptionCreate, SubscriptionUpdate,
     RecurringTransaction, RecurringTransactionCreate, RecurringTransactionUpdate,
-    SyncResult, MigrationResult
+    SyncResult, MigrationResult, CashFlowForecast,
+    SubscriptionSummary, SubscriptionPriceChange,
+    HistoryImportResult, CategorizeResult, CategorizerTrainResult
 )
-from app.services.finance_service import FinanceService
+from app.core.config import settings
+from app.services.finance_service import FinanceService, CATEGORIZE_CHUNK_SIZE, MIGRATION_CHUNK_SIZE, RECENT_PRICE_CHANGES
 
 
 router = APIRouter()
@@ -23,11 +29,12 @@ def get_finance_service(db: AsyncSession = Depends(get_db)) -> FinanceService:
 @router.get("/history", response_model=List[HistoryEntry])
 async def read_history(
     item_id: Optional[UUID] = Query(None, description="Filter by Item ID"),
+    spending_category: Optional[str] = Query(None, description="Filter by spending category (groceries, rent...)"),
     skip: int = 0,
     limit: int = 100,
     service: FinanceService = Depends(get_finance_service)
 ):
-    return await service.get_history(item_id=item_id, skip=skip, limit=limit)
+    return await service.get_history(item_id=item_id, skip=skip, limit=limit, spending_category=spending_category)
 
 @router.post("/history", response_model=HistoryEntry, status_code=status.HTTP_201_CREATED)
 async def create_history_entry(
@@ -36,6 +43,35 @@ async def create_history_entry(
 ):
     return await service.create_history_entry(entry_in)
 
+@router.post("/history/import", response_model=HistoryImportResult, status_code=status.HTTP_201_CREATED)
+async def import_history(
+    entries_in: List[HistoryEntryCreate],
+    service: FinanceService = Depends(get_finance_service)
+):
+    """Bulk import (bank statement): entries without a spendingCategory are categorized in one batch."""
+    if len(entries_in) > settings.HISTORY_IMPORT_MAX_ENTRIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.HISTORY_IMPORT_MAX_ENTRIES} entries per request",
+        )
+    return await service.import_history_entries(entries_in)
+
+@router.post("/history/categorize", response_model=CategorizeResult)
+async def categorize_history(
+    recategorize: bool = Query(False, description="Also replace the categories not set by hand"),
+    chunk_size: int = Query(CATEGORIZE_CHUNK_SIZE, ge=1, le=10000, description="Entries per batch"),
+    service: FinanceService = Depends(get_finance_service)
+):
+    """Categorize the stored history (entries from before the categorizer, or after retraining)."""
+    return await service.categorize_history(recategorize=recategorize, chunk_size=chunk_size)
+
+@router.post("/categorizer/train", response_model=CategorizerTrainResult)
+async def train_categorizer(
+    service: FinanceService = Depends(get_finance_service)
+):
+    """Retrain the categorizer on the hand-set categories now (corrections retrain it in the background)."""
+    return await service.train_categorizer()
+
 @router.get("/history/{entry_id}", response_model=HistoryEntry)
 async def read_history_entry(
     entry_id: UUID,
@@ -66,6 +102,17 @@ async def delete_history_entry(
     if not success:
         raise HTTPException(status_code=404, detail="History entry not found")
 
+# Forecast
+
+@router.get("/forecast", response_model=CashFlowForecast)
+async def read_forecast(
+    months: int = Query(12, ge=1, le=settings.FORECAST_MAX_MONTHS, description="Horizon, current month included"),
+    account_id: Optional[UUID] = Query(None, description="Forecast one account only"),
+    service: FinanceService = Depends(get_finance_service)
+):
+    """Projected balance of each account, month by month, from its recurring transactions and subscriptions."""
+    return await service.get_forecast(months=months, account_id=account_id)
+
 # Subscriptions
 
 @router.get("/subscriptions", response_model=List[Subscription])
@@ -84,6 +131,23 @@ async def create_subscription(
 ):
     return await service.create_subscription(subscription_in)
 
+@router.get("/subscriptions/summary", response_model=SubscriptionSummary)
+async def read_subscription_summary(
+    price_changes: int = Query(RECENT_PRICE_CHANGES, ge=0, le=500, description="Latest price changes returned"),
+    service: FinanceService = Depends(get_finance_service)
+):
+    """Monthly / annual burn per account, likely duplicates and latest price changes of the active subscriptions."""
+    return await service.get_subscription_summary(price_changes_limit=price_changes)
+
+@router.get("/subscriptions/{subscription_id}/price-history", response_model=List[SubscriptionPriceChange])
+async def read_subscription_price_history(
+    subscription_id: UUID,
+    service: FinanceService = Depends(get_finance_service)
+):
+    if not await service.get_subscription(subscription_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return await service.get_subscription_price_history(subscription_id)
+
 @router.get("/subscriptions/{subscription_id}", response_model=Subscription)
 async def read_subscription(
     subscription_id: UUID,
@@ -172,8 +236,17 @@ async def sync_recurring_transactions(
 
 @router.post("/recurring/migrate", response_model=MigrationResult)
 async def migrate_subscriptions(
+    chunk_size: int = Query(MIGRATION_CHUNK_SIZE, ge=1, le=10000, description="Subscriptions per bulk insert"),
+    stream: bool = Query(False, description="Stream progress as NDJSON, one line per chunk"),
     service: FinanceService = Depends(get_finance_service)
 ):
     """Migrate existing Subscriptions to RecurringTransactions."""
-    result = await service.migrate_subscriptions_to_recurring()
+    if stream:
+        async def progress_lines():
+            async for progress in service.iter_migrate_subscriptions_to_recurring(chunk_size=chunk_size):
+                yield json.dumps(progress) + "\n"
+
+        return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
+
+    result = await service.migrate_subscriptions_to_recurring(chunk_size=chunk_size)
     return MigrationResult(**result)
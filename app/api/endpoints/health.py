@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from typing import List, Literal, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.schemas.health import (
-    BodyMetric, BodyMetricCreate, BodyMetricUpdate,
+    BodyMetric, BodyMetricCreate, BodyMetricUpdate, BodyMetricBatchResult, MetricSeries,
     HealthAppointment, HealthAppointmentCreate, HealthAppointmentUpdate
 )
-from app.services.health_service import HealthService
+from app.core.config import settings
+from app.services.health_service import DuplicateMetric, HealthService
+from app.services.metric_ingest import (
+    IngestBacklogFull, IngestRejected, IngestUnavailable, metric_ingest, parse_readings,
+)
 
 router = APIRouter()
 
@@ -26,12 +32,63 @@ async def read_metrics(
 ):
     return await service.get_metrics(item_id=item_id, skip=skip, limit=limit)
 
+@router.get("/body-metrics/series", response_model=MetricSeries)
+async def read_metrics_series(
+    item_id: Optional[UUID] = Query(None, description="Filter by Item ID"),
+    start: Optional[int] = Query(None, alias="from", description="Range start (timestamp ms), defaults to the first measurement"),
+    end: Optional[int] = Query(None, alias="to", description="Range end (timestamp ms), defaults to the last measurement"),
+    points: int = Query(200, ge=2, le=2000, description="Number of buckets"),
+    metric: Literal["weight", "bodyFat", "muscleMass"] = "weight",
+    window_days: int = Query(7, ge=1, le=365, description="Rolling average window"),
+    service: HealthService = Depends(get_health_service)
+):
+    """Chart-ready series: at most `points` buckets (min / avg / max) whatever the history length."""
+    return await service.get_metrics_series(
+        item_id=item_id, start=start, end=end, points=points, metric=metric, window_days=window_days,
+    )
+
 @router.post("/body-metrics", response_model=BodyMetric, status_code=status.HTTP_201_CREATED)
 async def create_metric(
     metric_in: BodyMetricCreate,
     service: HealthService = Depends(get_health_service)
 ):
-    return await service.create_metric(metric_in)
+    try:
+        return await service.create_metric(metric_in)
+    except DuplicateMetric as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/body-metrics/batch", response_model=BodyMetricBatchResult)
+async def ingest_metrics(request: Request, service: HealthService = Depends(get_health_service)):
+    """
+    Batched ingest for scales / wearables: a JSON array of readings, or
+    NDJSON (Content-Type: application/x-ndjson). Answers once the readings
+    are committed; readings already stored for the same item and date are skipped.
+    Unknown items and readings the database refuses get a 422, an unreachable database a 503.
+    """
+    try:
+        readings = parse_readings(await request.body(), request.headers.get("content-type", ""))
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(readings) > settings.BODY_METRIC_INGEST_MAX_REQUEST:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BODY_METRIC_INGEST_MAX_REQUEST} readings per request",
+        )
+    unknown = await service.unknown_items({reading.itemId for reading in readings})
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown itemId: {', '.join(sorted(map(str, unknown)))}")
+    await service.db.rollback()  # Don't hold a pooled connection while the flush is awaited
+    try:
+        received = await metric_ingest.submit(readings)
+    except IngestBacklogFull:
+        raise HTTPException(status_code=429, detail="Ingest backlog full, retry later", headers={"Retry-After": "1"})
+    except IngestRejected as e:
+        raise HTTPException(status_code=422, detail=f"Readings refused: {e}")
+    except IngestUnavailable:
+        raise HTTPException(status_code=503, detail="Readings could not be stored, retry later", headers={"Retry-After": "1"})
+    return {"received": received}
 
 @router.get("/body-metrics/{metric_id}", response_model=BodyMetric)
 async def read_metric(
@@ -49,7 +106,10 @@ async def update_metric(
     metric_in: BodyMetricUpdate,
     service: HealthService = Depends(get_health_service)
 ):
-    metric = await service.update_metric(metric_id, metric_in)
+    try:
+        metric = await service.update_metric(metric_id, metric_in)
+    except DuplicateMetric as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not metric:
         raise HTTPException(status_code=404, detail="Metric not found")
     return metric
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Literal, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.schemas.items import LifeItem, LifeItemCreate, LifeItemUpdate, WidgetOrderUpdate
+from app.schemas.enums import ItemType
+from app.schemas.items import LifeItem, LifeItemDetails, LifeItemCreate, LifeItemUpdate, WidgetOrderUpdate
 from app.services.item_service import ItemService
 
 router = APIRouter()
@@ -16,9 +17,19 @@ def get_item_service(db: AsyncSession = Depends(get_db)) -> ItemService:
 async def read_items(
     skip: int = 0,
     limit: int = 100,
+    category_id: Optional[UUID] = Query(None, description="Filter by category (island)"),
+    type: Optional[ItemType] = Query(None, description="Filter by item type"),
+    currency: Optional[str] = Query(None, min_length=3, max_length=3, description="Filter by ISO currency code"),
+    min_value: Optional[float] = Query(None, description="Minimum numeric value (currency/percentage items)"),
+    max_value: Optional[float] = Query(None, description="Maximum numeric value (currency/percentage items)"),
+    sort: Optional[Literal["value", "-value"]] = Query(None, description="Sort by numeric value, '-' for descending"),
+    top_per_category: Optional[int] = Query(None, ge=1, le=100, description="Keep the N highest values of each category"),
     service: ItemService = Depends(get_item_service)
 ):
-    return await service.get_items(skip=skip, limit=limit)
+    return await service.get_items(
+        skip=skip, limit=limit, category_id=category_id, item_type=type, currency=currency,
+        min_value=min_value, max_value=max_value, sort=sort, top_per_category=top_per_category,
+    )
 
 @router.post("", response_model=LifeItem, status_code=status.HTTP_201_CREATED)
 async def create_item(
@@ -27,6 +38,16 @@ async def create_item(
 ):
     return await service.create_item(item_in)
 
+@router.get("/details", response_model=List[LifeItemDetails])
+async def read_items_details(
+    ids: Optional[List[UUID]] = Query(None),
+    skip: int = 0,
+    limit: int = 100,
+    service: ItemService = Depends(get_item_service)
+):
+    """Items (all, or the given ids) with their alerts, subscriptions and recent history."""
+    return await service.get_items_details(item_ids=ids, skip=skip, limit=limit)
+
 @router.get("/{item_id}", response_model=LifeItem)
 async def read_item(
     item_id: UUID,
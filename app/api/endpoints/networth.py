@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.schemas.finance import NetWorth
+from app.services.networth_service import NetWorthService
+
+router = APIRouter()
+
+def get_networth_service(db: AsyncSession = Depends(get_db)) -> NetWorthService:
+    return NetWorthService(db)
+
+@router.get("", response_model=NetWorth)
+async def read_net_worth(
+    start: Optional[int] = Query(None, alias="from", description="Series start (timestamp ms), defaults to 12 months ago"),
+    end: Optional[int] = Query(None, alias="to", description="Series end (timestamp ms), defaults to now"),
+    bucket: Literal["month", "year"] = "month",
+    service: NetWorthService = Depends(get_networth_service)
+):
+    """Current net worth of all items (accounts, properties, debts...) and its history."""
+    try:
+        return await service.get_net_worth(start=start, end=end, bucket=bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -5,8 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.schemas.real_estate import (
-    PropertyValuation, PropertyValuationCreate, PropertyValuationUpdate,
-    EnergyConsumption, EnergyConsumptionCreate, EnergyConsumptionUpdate,
+    PropertyValuation, PropertyValuationCreate, PropertyValuationUpdate, LoanAmortization, EquityOverview,
+    EnergyConsumption, EnergyConsumptionCreate, EnergyConsumptionUpdate, EnergyAnalytics,
     MaintenanceTask, MaintenanceTaskCreate, MaintenanceTaskUpdate
 )
 from app.services.real_estate_service import RealEstateService
@@ -34,6 +34,25 @@ async def create_valuation(
 ):
     return await service.create_valuation(valuation_in)
 
+@router.get("/valuations/equity", response_model=EquityOverview)
+async def read_equity(
+    at: Optional[int] = Query(None, description="Position date (timestamp ms), defaults to now"),
+    service: RealEstateService = Depends(get_real_estate_service)
+):
+    """Equity of all properties and the combined equity curve over the loans' lifetime."""
+    return await service.get_equity(at=at)
+
+@router.get("/valuations/{valuation_id}/amortization", response_model=LoanAmortization)
+async def read_amortization(
+    valuation_id: UUID,
+    at: Optional[int] = Query(None, description="Position date (timestamp ms), defaults to now"),
+    service: RealEstateService = Depends(get_real_estate_service)
+):
+    amortization = await service.get_amortization(valuation_id, at=at)
+    if not amortization:
+        raise HTTPException(status_code=404, detail="Valuation not found")
+    return amortization
+
 @router.get("/valuations/{valuation_id}", response_model=PropertyValuation)
 async def read_valuation(
     valuation_id: UUID,
@@ -82,6 +101,14 @@ async def create_energy_record(
 ):
     return await service.create_energy_record(record_in)
 
+@router.get("/energy-consumption/analytics", response_model=EnergyAnalytics)
+async def read_energy_analytics(
+    item_id: UUID = Query(..., description="Property item ID"),
+    service: RealEstateService = Depends(get_real_estate_service)
+):
+    """Monthly / yearly totals, year-over-year deltas and projected annual cost of a property."""
+    return await service.get_energy_analytics(item_id)
+
 @router.get("/energy-consumption/{record_id}", response_model=EnergyConsumption)
 async def read_energy_record(
     record_id: UUID,
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.schemas.scene import SceneDiff, SceneSnapshot
+from app.services.scene_service import SceneService
+
+router = APIRouter()
+
+def get_scene_service(db: AsyncSession = Depends(get_db)) -> SceneService:
+    return SceneService(db)
+
+@router.get("", response_model=SceneSnapshot)
+async def read_scene(
+    request: Request,
+    service: SceneService = Depends(get_scene_service)
+):
+    """Whole 3D map (islands, items, links, asset configs), versioned; ETag is the version."""
+    version, payload = await service.get_snapshot()
+    etag = f'"{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/diff", response_model=SceneDiff)
+async def read_scene_diff(
+    since: int = Query(..., ge=0),
+    service: SceneService = Depends(get_scene_service)
+):
+    """Islands, items, links and asset configs changed after version `since`."""
+    return await service.get_diff(since)
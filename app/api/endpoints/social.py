@@ -6,9 +6,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.schemas.social import (
     SocialEvent, SocialEventCreate, SocialEventUpdate,
-    Contact, ContactCreate, ContactUpdate
+    Contact, ContactCreate, ContactUpdate, UpcomingBirthday,
+    ContactEventsPage, ContactInteractions
 )
-from app.services.social_service import SocialService
+from app.services.social_service import SocialService, decode_event_cursor, encode_event_cursor
 
 router = APIRouter()
 
@@ -81,6 +82,25 @@ async def create_contact(
 ):
     return await service.create_contact(contact_in)
 
+@router.get("/contacts/overdue", response_model=List[Contact])
+async def read_overdue_contacts(
+    item_id: Optional[UUID] = Query(None, description="Filter by Item ID"),
+    skip: int = 0,
+    limit: int = 100,
+    service: SocialService = Depends(get_social_service)
+):
+    """Contacts to get back in touch with: nextContactDue is past (most overdue first)."""
+    return await service.get_overdue_contacts(item_id=item_id, skip=skip, limit=limit)
+
+@router.get("/contacts/birthdays/upcoming", response_model=List[UpcomingBirthday])
+async def read_upcoming_birthdays(
+    days: int = Query(30, ge=0, le=366, description="Window in days, today included"),
+    item_id: Optional[UUID] = Query(None, description="Filter by Item ID"),
+    limit: int = 100,
+    service: SocialService = Depends(get_social_service)
+):
+    return await service.get_upcoming_birthdays(days=days, item_id=item_id, limit=limit)
+
 @router.get("/contacts/{contact_id}", response_model=Contact)
 async def read_contact(
     contact_id: UUID,
@@ -91,6 +111,36 @@ async def read_contact(
         raise HTTPException(status_code=404, detail="Contact not found")
     return contact
 
+@router.get("/contacts/{contact_id}/events", response_model=ContactEventsPage)
+async def read_contact_events(
+    contact_id: UUID,
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    service: SocialService = Depends(get_social_service)
+):
+    """Events the contact took part in, newest first (keyset pagination)."""
+    try:
+        before = decode_event_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not await service.get_contact(contact_id):
+        raise HTTPException(status_code=404, detail="Contact not found")
+    events = await service.get_contact_events(contact_id, limit=limit + 1, before=before)
+    page = events[:limit]
+    return {
+        "items": page,
+        "nextCursor": encode_event_cursor(page[-1]) if len(events) > limit else None,
+    }
+
+@router.get("/contacts/{contact_id}/interactions", response_model=ContactInteractions)
+async def read_contact_interactions(
+    contact_id: UUID,
+    service: SocialService = Depends(get_social_service)
+):
+    if not await service.get_contact(contact_id):
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return await service.get_contact_interactions(contact_id)
+
 @router.put("/contacts/{contact_id}", response_model=Contact)
 async def update_contact(
     contact_id: UUID,
@@ -6,6 +6,8 @@ from typing import Dict
 from app.core.database import get_db as get_async_session
 from app.models.asset_config import AssetConfig
 from app.schemas.asset_config import AssetConfig as AssetConfigSchema, AssetConfigUpdate, FrontendAssetConfig, AssetConfigUpdateInput
+from app.core.change_feed import queue_event
+from app.services.scene_service import ASSET, frontend_asset, record_scene_changes
 
 router = APIRouter()
 
@@ -47,6 +49,7 @@ async def get_all_asset_configs(session: AsyncSession = Depends(get_async_sessio
             session.add(conf)
             new_configs.append(conf)
         
+        await record_scene_changes(session, ASSET, default_configs)
         await session.commit()
         configs = new_configs
 
@@ -108,6 +111,8 @@ async def update_asset_config(
         
         config.preview_scale = updates.previewScale
     
+    await record_scene_changes(session, ASSET, [asset_type])
+    queue_event(session, "asset.updated", asset_type, frontend_asset(config))
     await session.commit()
     await session.refresh(config)
     
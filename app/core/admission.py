@@ -0,0 +1,236 @@
+"""
+Admission control for the LifeMap server.
+
+Agent routes (ADK /run, /run_sse, /api/agent) and the CRUD API run in
+separate concurrency pools, so a burst of slow model calls cannot starve
+the cheap routes of the same process. Each pool has a bounded wait queue:
+- queue full      -> 429 Too Many Requests + Retry-After (rejected at once)
+- waited too long -> 503 Service Unavailable + Retry-After
+Queue times are recorded per route template for the metrics endpoint
+(resolved against the app's routes, since admission runs before routing).
+Long-lived streams (the /api/events change feed) bypass the pools: they
+would hold a slot for their whole lifetime and cap their own subscribers.
+"""
+import asyncio
+import bisect
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+AGENT_PATH_PREFIXES = ("/run", "/api/agent")
+EXEMPT_PATH_PREFIXES = ("/api/events",)
+QUEUE_TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"  # Paths no route serves (scanners, typos): one series for all
+
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|\d+)(?=/|$)")
+
+
+class PoolFull(Exception):
+    """The pool wait queue is full."""
+
+
+class QueueTimeout(Exception):
+    """The request waited longer than the pool queue timeout."""
+
+
+class ConcurrencyPool:
+    """Semaphore with a bounded number of waiters and a wait timeout."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying."""
+        return max(1, math.ceil(self.queue_timeout))
+
+    async def acquire(self) -> None:
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                raise PoolFull(self.name)
+            self.waiting += 1
+            acquire = asyncio.ensure_future(self._semaphore.acquire())
+            try:
+                done, _ = await asyncio.wait({acquire}, timeout=self.queue_timeout)
+            except BaseException:  # Cancelled while queued
+                self._abandon(acquire)
+                raise
+            finally:
+                self.waiting -= 1
+            if not done:
+                self._abandon(acquire)
+                raise QueueTimeout(self.name)
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+
+    def _abandon(self, acquire: asyncio.Future) -> None:
+        """Give up a queued acquire; a permit granted at the last moment goes back to the pool."""
+        if not acquire.done():
+            acquire.cancel()  # Semaphore.acquire hands back a permit granted before the cancellation lands
+        elif not acquire.cancelled():
+            self._semaphore.release()
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+
+@dataclass
+class RouteQueueStats:
+    """Queue time histogram and rejections of one (pool, method, route)."""
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(QUEUE_TIME_BUCKETS))
+    rejected: Dict[str, int] = field(default_factory=dict)  # reason -> count
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        index = bisect.bisect_left(QUEUE_TIME_BUCKETS, seconds)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+
+    def reject(self, reason: str) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+
+
+class AdmissionMetrics:
+    """In-process admission metrics, keyed by (pool, method, route)."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str, str], RouteQueueStats] = {}
+        self.pools: Dict[str, ConcurrencyPool] = {}
+
+    def route(self, pool: str, method: str, route: str) -> RouteQueueStats:
+        key = (pool, method, route)
+        if key not in self.routes:
+            self.routes[key] = RouteQueueStats()
+        return self.routes[key]
+
+
+admission_metrics = AdmissionMetrics()
+
+
+def route_template(path: str) -> str:
+    """Collapse UUID / numeric path segments so metrics keep a bounded cardinality."""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def matched_route_template(scope) -> str:
+    """
+    Template of the route the request will be dispatched to, resolved before
+    routing ("/apps/{app_name}/users/{user_id}/..."), or UNMATCHED_ROUTE.
+    """
+    router = getattr(scope.get("app"), "router", None)
+    if router is None:
+        return route_template(scope["path"])
+    partial = None
+    for route in router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path_format", None) or route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route  # Path matches, method does not (405)
+    if partial is not None:
+        return getattr(partial, "path_format", None) or partial.path
+    return UNMATCHED_ROUTE
+
+
+def default_pools() -> Dict[str, ConcurrencyPool]:
+    """Agent and CRUD pools sized from settings."""
+    return {
+        "agent": ConcurrencyPool(
+            "agent",
+            max_concurrent=settings.AGENT_MAX_CONCURRENCY,
+            max_queue=settings.AGENT_MAX_QUEUE,
+            queue_timeout=settings.AGENT_QUEUE_TIMEOUT,
+        ),
+        "api": ConcurrencyPool(
+            "api",
+            max_concurrent=settings.API_MAX_CONCURRENCY,
+            max_queue=settings.API_MAX_QUEUE,
+            queue_timeout=settings.API_QUEUE_TIMEOUT,
+        ),
+    }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware routing each HTTP request to the agent or API pool.
+    The pool slot is held until the response is fully sent (SSE included).
+    """
+
+    def __init__(
+        self,
+        app,
+        pools: Optional[Dict[str, ConcurrencyPool]] = None,
+        agent_prefixes: Tuple[str, ...] = AGENT_PATH_PREFIXES,
+        metrics: AdmissionMetrics = admission_metrics,
+        exempt_prefixes: Tuple[str, ...] = EXEMPT_PATH_PREFIXES,
+    ):
+        self.app = app
+        self.pools = pools or default_pools()
+        self.agent_prefixes = agent_prefixes
+        self.exempt_prefixes = exempt_prefixes
+        self.metrics = metrics
+        self.metrics.pools.update(self.pools)
+
+    def _pool_for(self, path: str) -> ConcurrencyPool:
+        if path.startswith(self.agent_prefixes):
+            return self.pools["agent"]
+        return self.pools["api"]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        pool = self._pool_for(scope["path"])
+        stats = self.metrics.route(pool.name, scope["method"], matched_route_template(scope))
+        start = time.perf_counter()
+        try:
+            await pool.acquire()
+        except PoolFull:
+            stats.reject("queue_full")
+            logger.warning(f"[ADMISSION] {pool.name} pool full, rejecting {scope['method']} {scope['path']}")
+            await self._reject(pool, 429, "Too many concurrent requests, retry later", scope, receive, send)
+            return
+        except QueueTimeout:
+            stats.reject("queue_timeout")
+            logger.warning(f"[ADMISSION] {pool.name} queue timeout for {scope['method']} {scope['path']}")
+            await self._reject(pool, 503, "Server busy, retry later", scope, receive, send)
+            return
+
+        stats.observe(time.perf_counter() - start)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release()
+
+    @staticmethod
+    async def _reject(pool: ConcurrencyPool, status_code: int, detail: str, scope, receive, send):
+        response = JSONResponse(
+            status_code=status_code,
+            content={"detail": detail},
+            headers={"Retry-After": str(pool.retry_after)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,154 @@
+"""
+Change feed for live map updates.
+
+Services queue typed events (`item.created`, `history.added`, ...) on their
+AsyncSession; they are published to the in-process feed only once the
+session commits (dropped on rollback). The /api/events endpoint streams
+them to each client as Server-Sent Events.
+
+Backpressure: every subscriber has a bounded buffer. A client too slow to
+drain it doesn't slow down the writers nor grow memory: its buffered events
+are dropped and replaced by a single `feed.overflow` event, after which the
+client resyncs from /api/scene (or /api/scene/diff).
+
+The feed is per process: with several workers, each streams the writes
+made by its own requests and agent turns.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Set
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_EVENT = "feed.overflow"
+_PENDING_KEY = "change_feed_pending"
+
+
+class FeedFull(Exception):
+    """Too many open subscriptions."""
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    id: int
+    type: str
+    entityId: Optional[str]
+    data: Optional[Any]
+    ts: int  # ms timestamp
+
+    def to_sse(self) -> str:
+        payload = json.dumps({"type": self.type, "entityId": self.entityId, "data": self.data, "ts": self.ts})
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class FeedSubscriber:
+    """Bounded buffer of the events matching `types` (exact types or prefixes like "item")."""
+
+    def __init__(self, feed: "ChangeFeed", types: Optional[Set[str]], buffer_size: int):
+        self.feed = feed
+        self.types = types
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = 0
+
+    def matches(self, event_type: str) -> bool:
+        if not self.types:
+            return True
+        return event_type in self.types or event_type.split(".", 1)[0] in self.types
+
+    def offer(self, change: ChangeEvent) -> None:
+        if not self.matches(change.type):
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self._overflow()
+
+    def _overflow(self) -> None:
+        """Replace the backlog by one overflow marker: the client must resync."""
+        dropped = self.queue.qsize() + 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.dropped += dropped
+        self.queue.put_nowait(self.feed.make_event(OVERFLOW_EVENT, data={"dropped": dropped}))
+        logger.warning(f"[FEED] Subscriber overflow, {dropped} events dropped")
+
+    async def next_event(self, timeout: float) -> Optional[ChangeEvent]:
+        """Next event, or None after `timeout` seconds without any."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.feed.unsubscribe(self)
+
+
+class ChangeFeed:
+    """In-process pub/sub of change events."""
+
+    def __init__(self):
+        self.subscribers: Set[FeedSubscriber] = set()
+        self._ids = itertools.count(1)
+
+    def make_event(self, event_type: str, entity_id: Any = None, data: Any = None) -> ChangeEvent:
+        return ChangeEvent(
+            id=next(self._ids),
+            type=event_type,
+            entityId=str(entity_id) if entity_id is not None else None,
+            data=data,
+            ts=int(time.time() * 1000),
+        )
+
+    def subscribe(self, types: Optional[Iterable[str]] = None, buffer_size: Optional[int] = None) -> FeedSubscriber:
+        if len(self.subscribers) >= settings.CHANGE_FEED_MAX_SUBSCRIBERS:
+            raise FeedFull()
+        subscriber = FeedSubscriber(
+            self,
+            set(types) if types else None,
+            buffer_size or settings.CHANGE_FEED_BUFFER_SIZE,
+        )
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: FeedSubscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, entity_id: Any = None, data: Any = None) -> ChangeEvent:
+        change = self.make_event(event_type, entity_id, data)
+        for subscriber in list(self.subscribers):
+            subscriber.offer(change)
+        return change
+
+
+change_feed = ChangeFeed()
+
+
+# === SESSION INTEGRATION ===
+
+def queue_event(db: AsyncSession, event_type: str, entity_id: Any = None, data: Any = None) -> None:
+    """Publish an event once `db` commits (pydantic models are dumped to JSON now)."""
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    db.info.setdefault(_PENDING_KEY, []).append((event_type, entity_id, data))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for event_type, entity_id, data in session.info.pop(_PENDING_KEY, []):
+        change_feed.publish(event_type, entity_id, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -6,6 +7,41 @@ class Settings(BaseSettings):
     GEMINI_MODEL: str = "gemini-2.5-flash"
     DATABASE_URL: str
     DEBUG: bool = False  # Set to True in .env for development
+    AGENT_CONTEXT_CACHE: bool = True  # Gemini context caching of the agent instruction + tool schemas
+    AGENT_TRACE_FILE: Optional[str] = None  # JSON lines span sink for agent turns (disabled if unset)
+    # Query log: per-request statement counts, slow queries (+ EXPLAIN), N+1 detection
+    QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 250.0
+    SLOW_QUERY_EXPLAIN: bool = False  # Debugging aid: EXPLAIN runs on the request path
+    N_PLUS_ONE_THRESHOLD: int = 5  # Identical statements within one request/tool call
+    # Admission control: separate concurrency pools for agent and CRUD routes
+    AGENT_MAX_CONCURRENCY: int = 4
+    AGENT_MAX_QUEUE: int = 8
+    AGENT_QUEUE_TIMEOUT: float = 10.0  # Seconds
+    API_MAX_CONCURRENCY: int = 64
+    API_MAX_QUEUE: int = 256
+    API_QUEUE_TIMEOUT: float = 2.0  # Seconds
+    DEPENDENCY_GRAPH_TTL: float = 300.0  # Seconds before the in-memory graph index is reloaded
+    SCENE_CHANGE_RETENTION_DAYS: int = 30  # Older scene diffs fall back to a full resync
+    ENERGY_ANALYTICS_TTL: float = 300.0  # Seconds an item's energy analytics stay cached (writes of this process invalidate it)
+    FORECAST_TTL: float = 300.0  # Seconds a cash-flow forecast stays cached (writes of this process invalidate it)
+    FORECAST_MAX_MONTHS: int = 120
+    # Spending categories of history entries (app/services/categorizer.py)
+    CATEGORIZER_MODEL_PATH: str = "data/categorizer.npz"  # Trained model, shared by the workers
+    CATEGORIZER_RELOAD_INTERVAL: float = 5.0  # Seconds between checks of the model file for another worker's retrain
+    CATEGORIZER_MIN_SCORE: float = 0.35  # Cosine below which the keyword rules decide
+    CATEGORIZER_MAX_SAMPLES: int = 5000  # Most recent corrections used for training
+    CATEGORIZER_RETRAIN_DELAY: float = 5.0  # Seconds a correction waits for others before the background retrain
+    HISTORY_IMPORT_MAX_ENTRIES: int = 10000  # Entries per POST /api/finance/history/import
+    # Change feed (SSE /api/events)
+    CHANGE_FEED_BUFFER_SIZE: int = 256  # Events buffered per client before it must resync
+    CHANGE_FEED_MAX_SUBSCRIBERS: int = 100
+    CHANGE_FEED_HEARTBEAT: float = 15.0  # Seconds between keep-alive comments
+    # Body metric ingest (POST /api/health/body-metrics/batch)
+    BODY_METRIC_INGEST_FLUSH_MS: float = 50.0  # Max time a reading waits in the write-behind buffer
+    BODY_METRIC_INGEST_BATCH_SIZE: int = 5000  # Buffered readings that trigger an immediate flush
+    BODY_METRIC_INGEST_MAX_PENDING: int = 50000  # Buffered readings before batches are refused (429)
+    BODY_METRIC_INGEST_MAX_REQUEST: int = 10000  # Readings per request
     CORS_ORIGINS: str = "http://localhost:5173,http://127.0.0.1:5173,http://localhost:3000,http://localhost:8000,http://localhost:8080"
 
     @property
@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
+from app.core.query_log import install_query_log
 
 engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+install_query_log()  # Slow-query log + N+1 detection on every engine
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
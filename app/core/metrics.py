@@ -0,0 +1,295 @@
+"""
+Prometheus-style metrics for the LifeMap server.
+
+A small in-process registry rendered in the Prometheus text format by the
+/metrics endpoint:
+- HTTP request latency per route template, and in-flight requests
+- Admission control queue times and rejections (app/core/admission.py)
+- SQLAlchemy pool stats and per-statement timing of the registered engines
+- Scheduled job durations and the counts returned by the jobs
+"""
+import bisect
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.admission import QUEUE_TIME_BUCKETS, UNMATCHED_ROUTE, AdmissionMetrics, admission_metrics, route_template
+from app.core.statement_timing import observe_statements
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+LabelValues = Tuple[str, ...]
+_INF_BUCKET = 'le="+Inf"'
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# === METRIC TYPES ===
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return self.header() + list(self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self.values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float) -> None:
+        self.values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self.series: Dict[LabelValues, List] = {}  # labels -> [bucket counts, count, sum]
+
+    def observe(self, *labels: str, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * len(self.buckets), 0, 0.0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += 1
+        series[2] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, (bucket_counts, count, total) in self.series.items():
+            yield from _histogram_samples(self.name, self.labelnames, labels, self.buckets, bucket_counts, count, total)
+
+
+def _histogram_samples(name, labelnames, labels, buckets, bucket_counts, count, total) -> Iterable[str]:
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, bucket_counts):
+        cumulative += bucket_count
+        le = f'le="{_format_value(float(bound))}"'
+        yield f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}"
+    yield f"{name}_bucket{_format_labels(labelnames, labels, _INF_BUCKET)} {count}"
+    yield f"{name}_count{_format_labels(labelnames, labels)} {count}"
+    yield f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(float(total))}"
+
+
+# === REGISTRY ===
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method",),
+)
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time",
+    ("engine", "operation"), buckets=QUERY_BUCKETS,
+)
+job_duration = Histogram(
+    "scheduler_job_duration_seconds", "Scheduled job duration", ("job", "status"), buckets=JOB_BUCKETS,
+)
+job_result_count = Counter(
+    "scheduler_job_result_total", "Counts returned by scheduled jobs", ("job", "key"),
+)
+
+REGISTRY: List[_Metric] = [
+    http_request_duration,
+    http_requests_in_flight,
+    db_statement_duration,
+    job_duration,
+    job_result_count,
+]
+
+_engines: Dict[str, object] = {}
+_engine_names: Dict[object, str] = {}  # sync engine -> registered name
+
+
+# === SQLALCHEMY ===
+
+def _statement_operation(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"} else "OTHER"
+
+
+def register_engine(name: str, engine) -> None:
+    """Expose pool stats and statement timings of an (async) engine, once per name."""
+    if name in _engines:
+        return
+    sync_engine = getattr(engine, "sync_engine", engine)
+    _engines[name] = sync_engine
+    _engine_names[sync_engine] = name
+    observe_statements(_time_statement)
+
+
+def _time_statement(conn, statement, parameters, executemany, seconds):
+    name = _engine_names.get(conn.engine)
+    if name is not None:
+        db_statement_duration.observe(name, _statement_operation(statement), value=seconds)
+
+
+def _pool_samples() -> List[str]:
+    lines = []
+    stats = {
+        "db_pool_size": ("Configured pool size", "size"),
+        "db_pool_checked_out": ("Connections currently in use", "checkedout"),
+        "db_pool_checked_in": ("Idle connections in the pool", "checkedin"),
+        "db_pool_overflow": ("Connections opened beyond the pool size", "overflow"),
+    }
+    for metric, (documentation, method) in stats.items():
+        lines += [f"# HELP {metric} {documentation}", f"# TYPE {metric} gauge"]
+        for name, sync_engine in _engines.items():
+            getter = getattr(sync_engine.pool, method, None)
+            if getter is not None:
+                lines.append(f'{metric}{{engine="{_escape(name)}"}} {getter()}')
+    return lines
+
+
+# === SCHEDULED JOBS ===
+
+@contextmanager
+def track_job(job: str):
+    """Time a scheduled job; numeric values of the dict set on the yielded holder are counted."""
+    holder: Dict[str, Optional[dict]] = {"result": None}
+    start = time.perf_counter()
+    status = "success"
+    try:
+        yield holder
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        job_duration.observe(job, status, value=time.perf_counter() - start)
+        for key, value in (holder["result"] or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                job_result_count.inc(job, key, amount=value)
+            elif isinstance(value, list):
+                job_result_count.inc(job, key, amount=len(value))
+
+
+# === ADMISSION ===
+
+def _admission_samples(metrics: AdmissionMetrics) -> List[str]:
+    labelnames = ("pool", "method", "route")
+    lines = [
+        "# HELP admission_queue_seconds Time spent waiting for a concurrency slot",
+        "# TYPE admission_queue_seconds histogram",
+    ]
+    for key, stats in metrics.routes.items():
+        lines += _histogram_samples(
+            "admission_queue_seconds", labelnames, key, QUEUE_TIME_BUCKETS,
+            stats.buckets, stats.count, stats.total_seconds,
+        )
+    lines += [
+        "# HELP admission_rejected_total Requests rejected by admission control",
+        "# TYPE admission_rejected_total counter",
+    ]
+    for key, stats in metrics.routes.items():
+        for reason, count in stats.rejected.items():
+            lines.append(f"admission_rejected_total{_format_labels(labelnames + ('reason',), key + (reason,))} {count}")
+    for metric, attribute, documentation in (
+        ("admission_pool_active", "active", "Requests holding a pool slot"),
+        ("admission_pool_waiting", "waiting", "Requests waiting for a pool slot"),
+        ("admission_pool_limit", "max_concurrent", "Pool concurrency limit"),
+    ):
+        lines += [f"# HELP {metric} {documentation}", f"# TYPE {metric} gauge"]
+        for name, pool in metrics.pools.items():
+            lines.append(f'{metric}{{pool="{_escape(name)}"}} {getattr(pool, attribute)}')
+    return lines
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    lines += _pool_samples()
+    lines += _admission_samples(admission_metrics)
+    return "\n".join(lines) + "\n"
+
+
+# === HTTP MIDDLEWARE ===
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency per route template and in-flight requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec(method)
+            route = scope.get("route")
+            if route is not None:
+                template = getattr(route, "path_format", None) or route.path
+            elif status["code"] == 404:
+                template = UNMATCHED_ROUTE  # Keep scanners from creating new series
+            else:
+                template = route_template(scope["path"])
+            http_request_duration.observe(method, template, str(status["code"]), value=time.perf_counter() - start)
@@ -0,0 +1,157 @@
+"""
+Query log for the LifeMap service layer.
+
+Counts the SQL statements run inside a scope (one HTTP request, one agent
+tool call, one test block), logs slow statements with their EXPLAIN plan,
+and flags N+1 patterns: the same statement repeated within one scope.
+
+Statements are timed by the shared listeners of app/core/statement_timing.py,
+attached to the SQLAlchemy Engine class, so every engine (app, agents,
+tests) is covered. Outside a scope only the slow-query log
+applies. The EXPLAIN of slow statements is opt-in (SLOW_QUERY_EXPLAIN, for
+debugging): it runs synchronously on the request's connection, inside a
+SAVEPOINT so a failing EXPLAIN leaves the request's transaction usable, and
+never with ANALYZE: the statement isn't re-executed.
+"""
+import contextvars
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.statement_timing import observe_statements
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+EXPLAIN_SAVEPOINT = "query_log_explain"
+
+
+@dataclass
+class QueryScope:
+    """Statements run within one request / tool call."""
+    name: str
+    parent: Optional["QueryScope"] = None  # Enclosing scope (e.g. request around a tool call)
+    statements: List[str] = field(default_factory=list)
+    total_seconds: float = 0.0
+    slow: List[Tuple[str, float]] = field(default_factory=list)  # (statement, seconds)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least `threshold` times (N+1 candidates)."""
+        return [(sql, n) for sql, n in Counter(self.statements).most_common() if n >= threshold]
+
+
+_query_scope: contextvars.ContextVar[Optional[QueryScope]] = contextvars.ContextVar("_query_scope", default=None)
+
+
+def current_scope() -> Optional[QueryScope]:
+    return _query_scope.get()
+
+
+# === ENGINE LISTENERS ===
+
+def _explain(conn, statement: str, parameters) -> str:
+    """
+    EXPLAIN plan of a statement, on a fresh DBAPI cursor of the same
+    connection. On Postgres a failed statement aborts the whole transaction:
+    the EXPLAIN runs in a SAVEPOINT, rolled back to on failure.
+    """
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return ""
+    explain_cursor = conn.connection.cursor()
+    try:
+        explain_cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        try:
+            explain_cursor.execute(f"EXPLAIN {statement}", parameters)
+            rows = explain_cursor.fetchall()
+        except Exception:
+            explain_cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            raise
+        finally:
+            explain_cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+    except Exception as e:
+        return f"(EXPLAIN failed: {e})"
+    finally:
+        explain_cursor.close()
+    return "\n".join(" | ".join(str(col) for col in row) for row in rows)
+
+
+def _log_statement(conn, statement, parameters, executemany, elapsed):
+    scope = _query_scope.get()
+    enclosing = scope
+    while enclosing is not None:
+        enclosing.statements.append(statement)
+        enclosing.total_seconds += elapsed
+        enclosing = enclosing.parent
+
+    if elapsed * 1000 < settings.SLOW_QUERY_MS:
+        return
+    if scope is not None:
+        scope.slow.append((statement, elapsed))
+    plan = _explain(conn, statement, parameters) if settings.SLOW_QUERY_EXPLAIN and not executemany else ""
+    logger.warning(
+        f"[SLOW QUERY] {elapsed * 1000:.0f}ms in {scope.name if scope else 'unscoped'}: "
+        f"{' '.join(statement.split())[:500]}" + (f"\n{plan}" if plan else "")
+    )
+
+
+def install_query_log() -> None:
+    """Attach the query log listeners to every engine, once."""
+    if settings.QUERY_LOG_ENABLED:
+        observe_statements(_log_statement)
+
+
+# === SCOPES ===
+
+def begin_scope(name: str) -> contextvars.Token:
+    """Start counting statements for `name` in the current context."""
+    return _query_scope.set(QueryScope(name=name, parent=_query_scope.get()))
+
+
+def end_scope(token: contextvars.Token) -> Optional[QueryScope]:
+    """Stop counting, log N+1 candidates and return the finished scope."""
+    scope = _query_scope.get()
+    try:
+        _query_scope.reset(token)
+    except ValueError:
+        _query_scope.set(None)  # Ended from another context
+    if scope is None:
+        return None
+
+    for statement, times in scope.repeated(settings.N_PLUS_ONE_THRESHOLD):
+        logger.warning(
+            f"[N+1] {scope.name}: same statement run {times}x: {' '.join(statement.split())[:300]}"
+        )
+    logger.debug(f"[QUERIES] {scope.name}: {scope.count} statements, {scope.total_seconds * 1000:.0f}ms")
+    return scope
+
+
+@contextmanager
+def query_scope(name: str):
+    """Count the statements run in the block (yields the QueryScope)."""
+    token = begin_scope(name)
+    scope = _query_scope.get()
+    try:
+        yield scope
+    finally:
+        end_scope(token)
+
+
+class QueryLogMiddleware:
+    """ASGI middleware opening one query scope per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with query_scope(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
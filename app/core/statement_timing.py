@@ -0,0 +1,53 @@
+"""
+Statement timing shared by the SQL instrumentation: slow-query log and N+1
+detection (app/core/query_log.py), Prometheus statement durations
+(app/core/metrics.py) and agent tool spans (agents/plugins/tracing.py).
+
+One pair of cursor listeners on the Engine class times every statement and
+hands its duration to the registered observers. Start times are stacked on
+the connection. A statement that raises never reaches after_cursor_execute:
+the handle_error listener pops its start instead, so the stack of a pooled
+connection doesn't grow and later statements keep their own start time.
+"""
+import time
+from typing import Any, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# observer(conn, statement, parameters, executemany, seconds)
+StatementObserver = Callable[[Any, str, Any, bool, float], None]
+
+START_KEY = "_statement_start"  # conn.info stack of (statement, perf_counter start)
+
+_observers: List[StatementObserver] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(START_KEY, []).append((statement, time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _, start = conn.info[START_KEY].pop()
+    seconds = time.perf_counter() - start
+    for observer in _observers:
+        observer(conn, statement, parameters, executemany, seconds)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    starts = conn.info.get(START_KEY) if conn is not None else None
+    # Errors raised before the cursor ran (no start pushed) leave the stack alone
+    if starts and starts[-1][0] == exception_context.statement:
+        starts.pop()
+
+
+def observe_statements(observer: StatementObserver) -> None:
+    """Call `observer` after every statement of every engine; registering it again is a no-op."""
+    if observer not in _observers:
+        _observers.append(observer)
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
@@ -3,8 +3,9 @@ from app.models.categories import Category
 from app.models.dependencies import Dependency
 from app.models.social import SocialEvent, Contact
 from app.models.health import BodyMetric, HealthAppointment
-from app.models.finance import HistoryEntry, Subscription, RecurringTransaction
+from app.models.finance import HistoryEntry, Subscription, SubscriptionPriceChange, RecurringTransaction, ItemMonthlyTotal
 from app.models.alerts import Alert
 from app.models.settings import UserSettings
 from app.models.real_estate import PropertyValuation, EnergyConsumption, MaintenanceTask
 from app.models.asset_config import AssetConfig
+from app.models.scene import SceneChange
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, ForeignKey, Enum as SqEnum
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, ForeignKey, Index, Enum as SqEnum
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from app.core.database import Base
@@ -6,6 +6,9 @@ from app.schemas.enums import HistoryCategory
 
 class HistoryEntry(Base):
     __tablename__ = "history_entries"
+    __table_args__ = (
+        Index("ix_history_entries_spending_category", "spending_category"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     itemId = Column("item_id", UUID(as_uuid=True), ForeignKey("life_items.id", ondelete="CASCADE"), nullable=False)
@@ -13,19 +16,38 @@ class HistoryEntry(Base):
     value = Column(Float, nullable=False)
     label = Column(String, nullable=False)
     category = Column(SqEnum(HistoryCategory, values_callable=lambda x: [e.value for e in x]), nullable=False)
+    spendingCategory = Column("spending_category", String, nullable=True)  # groceries, rent... (categorizer)
+    categorySource = Column("category_source", String, nullable=True)  # "user", "model" or "rule"
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        Index("ix_subscriptions_normalized_name", "normalized_name"),  # Duplicate detection
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     itemId = Column("item_id", UUID(as_uuid=True), ForeignKey("life_items.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
+    normalizedName = Column("normalized_name", String, nullable=True)  # Kept in sync by FinanceService
     amount = Column(Float, nullable=False)
     billingDay = Column("billing_day", Integer, nullable=False)
     icon = Column(String, nullable=True)
     color = Column(String, nullable=True)
     isActive = Column("is_active", Boolean, default=True)
 
+class SubscriptionPriceChange(Base):
+    """Amount change of a subscription, written by FinanceService.update_subscription."""
+    __tablename__ = "subscription_price_changes"
+    __table_args__ = (
+        Index("ix_subscription_price_changes_subscription_id_changed_at", "subscription_id", "changed_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    subscriptionId = Column("subscription_id", UUID(as_uuid=True), ForeignKey("subscriptions.id", ondelete="CASCADE"), nullable=False)
+    oldAmount = Column("old_amount", Float, nullable=False)
+    newAmount = Column("new_amount", Float, nullable=False)
+    changedAt = Column("changed_at", BigInteger, nullable=False)  # Timestamp ms
+
 class RecurringTransaction(Base):
     __tablename__ = "recurring_transactions"
 
@@ -46,3 +68,12 @@ class RecurringTransaction(Base):
     createdAt = Column("created_at", BigInteger, nullable=False)
     updatedAt = Column("updated_at", BigInteger, nullable=False)
 
+
+class ItemMonthlyTotal(Base):
+    """Running totals of an item's history: signed sum of its entries per UTC month (net worth)."""
+    __tablename__ = "item_monthly_totals"
+
+    itemId = Column("item_id", UUID(as_uuid=True), ForeignKey("life_items.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(BigInteger, primary_key=True)  # Timestamp ms of the first day of the month
+    total = Column(Float, nullable=False, default=0.0)  # Income positive, expense negative
+    entries = Column(Integer, nullable=False, default=0)
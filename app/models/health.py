@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, Float, Boolean, ForeignKey, Enum as SqEnum
+from sqlalchemy import Column, String, BigInteger, Float, Boolean, ForeignKey, Index, Enum as SqEnum
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from app.core.database import Base
@@ -16,6 +16,11 @@ class BodyMetric(Base):
     muscleMass = Column("muscle_mass", Float, nullable=True)
     note = Column(String, nullable=True)
 
+    __table_args__ = (
+        # One reading per item and timestamp (ingest dedup), also serves time-range reads
+        Index("uq_body_metrics_item_id_date", "item_id", "date", unique=True),
+    )
+
 class HealthAppointment(Base):
     __tablename__ = "health_appointments"
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, Enum as SqEnum, JSON
+from sqlalchemy import Column, String, Integer, Float, Numeric, Boolean, ForeignKey, Index, Enum as SqEnum, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -7,12 +7,19 @@ from app.schemas.enums import ItemType, ItemStatus, AssetType
 
 class LifeItem(Base):
     __tablename__ = "life_items"
+    __table_args__ = (
+        Index("ix_life_items_numeric_value", "numeric_value"),
+        Index("ix_life_items_category_numeric_value", "category_id", "numeric_value"),  # Top-N per category
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     categoryId = Column("category_id", UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), nullable=True) # Nullable for now to ease migration, but should be required eventually
     
     name = Column(String, nullable=False)
     value = Column(String, nullable=True)
+    # Typed shadow of `value` for currency/percentage items, kept in sync by ItemService (app/services/item_values.py)
+    numericValue = Column("numeric_value", Numeric(18, 4, asdecimal=False), nullable=True)
+    currency = Column(String(3), nullable=True)  # ISO 4217 code
     
     # Relationship
     category = relationship("Category", back_populates="items")
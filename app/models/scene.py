@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, BigInteger, Integer
+from app.core.database import Base
+
+
+class SceneChange(Base):
+    """
+    Change log of the 3D map entities (islands, items, links, asset configs).
+    `version` is the monotonically increasing scene version.
+    """
+    __tablename__ = "scene_changes"
+
+    version = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)  # "island", "item", "link", "asset"
+    entityId = Column("entity_id", String, nullable=False)  # UUID, or asset_type for assets
+    createdAt = Column("created_at", BigInteger, nullable=False, index=True)  # ms timestamp
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, Integer, Float, Boolean, ForeignKey, Enum as SqEnum
+from sqlalchemy import Column, String, BigInteger, Integer, Float, Boolean, ForeignKey, Index, Enum as SqEnum
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 import uuid
 from app.core.database import Base
@@ -15,6 +15,11 @@ class SocialEvent(Base):
     type = Column(SqEnum(SocialEventType, values_callable=lambda x: [e.value for e in x]), nullable=False)
     contactIds = Column("contact_ids", ARRAY(String), nullable=True)
 
+    __table_args__ = (
+        # Serves `contact_ids @> ARRAY[:contact_id]` (events of a contact)
+        Index("ix_social_events_contact_ids", "contact_ids", postgresql_using="gin"),
+    )
+
 class Contact(Base):
     __tablename__ = "contacts"
 
@@ -24,5 +29,8 @@ class Contact(Base):
     birthday = Column(BigInteger, nullable=True)
     lastContactDate = Column("last_contact_date", BigInteger, nullable=True)
     contactFrequencyDays = Column("contact_frequency_days", Integer, nullable=True) # Keep as Integer - not a timestamp
+    # Maintained by SocialService on write, indexed for the reminder queries
+    nextContactDue = Column("next_contact_due", BigInteger, nullable=True, index=True) # lastContactDate + frequency (ms)
+    birthdayDay = Column("birthday_day", Integer, nullable=True, index=True) # Birthday as month * 100 + day (UTC)
     avatar = Column(String, nullable=True)
     notes = Column(String, nullable=True)
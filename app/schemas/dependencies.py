@@ -1,4 +1,4 @@
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -35,3 +35,20 @@ class Dependency(DependencyBase):
 
     class Config:
         from_attributes = True
+
+
+class GraphNode(BaseModel):
+    id: UUID
+    name: Optional[str] = None  # None if the item was deleted meanwhile
+    categoryId: Optional[UUID] = None
+    assetType: Optional[str] = None
+    depth: Optional[int] = None  # Hops from the root item (traversals only)
+
+
+class DependencyGraph(BaseModel):
+    nodes: List[GraphNode]
+    edges: List[Dependency]
+
+
+class DependencyTraversal(DependencyGraph):
+    rootId: UUID
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, ConfigDict
 from app.schemas.enums import HistoryCategory
@@ -9,6 +9,7 @@ class HistoryEntryBase(BaseModel):
     value: float
     label: str
     category: HistoryCategory
+    spendingCategory: Optional[str] = Field(None, min_length=1, max_length=50)  # Set by hand; categorized otherwise
 
 class HistoryEntryCreate(HistoryEntryBase):
     pass
@@ -18,10 +19,25 @@ class HistoryEntryUpdate(BaseModel):
     value: Optional[float] = None
     label: Optional[str] = None
     category: Optional[HistoryCategory] = None
+    spendingCategory: Optional[str] = Field(None, min_length=1, max_length=50)  # A correction the categorizer learns from
 
 class HistoryEntry(HistoryEntryBase):
     model_config = ConfigDict(from_attributes=True)
     id: UUID
+    spendingCategory: Optional[str] = None
+    categorySource: Optional[str] = None  # "user", "model" or "rule"
+
+class HistoryImportResult(BaseModel):
+    importedCount: int
+    categorizedCount: int
+
+class CategorizeResult(BaseModel):
+    categorizedCount: int
+    uncategorizedCount: int
+
+class CategorizerTrainResult(BaseModel):
+    samples: int
+    categories: list[str] = []
 
 class SubscriptionBase(BaseModel):
     itemId: UUID
@@ -96,3 +112,84 @@ class MigrationResult(BaseModel):
     skippedCount: int
     errors: list[str] = []
 
+
+# --- Net worth ---
+
+class NetWorthItem(BaseModel):
+    itemId: UUID
+    name: str
+    assetType: Optional[str] = None
+    source: Literal["history", "valuation", "value"]  # Balance from history, property equity, or parsed item value
+    amount: float  # Negative for liabilities
+
+class NetWorthPoint(BaseModel):
+    date: int  # First day of the bucket (timestamp ms); value at the end of the bucket
+    netWorth: float
+
+class NetWorth(BaseModel):
+    asOf: int
+    netWorth: float
+    assets: float
+    liabilities: float
+    items: List[NetWorthItem]
+    bucket: Literal["month", "year"]
+    series: List[NetWorthPoint]
+
+# --- Cash-flow forecast ---
+
+class ForecastPoint(BaseModel):
+    date: int  # First day of the month (timestamp ms); balance at the end of the month
+    balance: float
+
+class AccountForecast(BaseModel):
+    itemId: UUID
+    name: str
+    currentBalance: float
+    monthlyNet: float  # Average net flow per month over the horizon
+    endBalance: float
+    lowestBalance: float
+    lowestBalanceDate: int
+    points: List[ForecastPoint]
+
+class CashFlowForecast(BaseModel):
+    asOf: int
+    months: int
+    schedules: int  # Recurring transactions and subscriptions projected
+    accounts: List[AccountForecast]
+    total: List[ForecastPoint]
+
+# --- Subscription summary ---
+
+class SubscriptionPriceChange(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: UUID
+    subscriptionId: UUID
+    oldAmount: float
+    newAmount: float
+    changedAt: int  # Timestamp ms
+
+class RecentPriceChange(BaseModel):
+    subscriptionId: UUID
+    name: str
+    oldAmount: float
+    newAmount: float
+    changedAt: int
+
+class AccountSubscriptionBurn(BaseModel):
+    itemId: UUID
+    activeCount: int
+    monthlyBurn: float
+    annualBurn: float
+
+class DuplicateSubscriptions(BaseModel):
+    reason: Literal["name", "amount"]  # Same normalized name, or same amount on several accounts
+    key: str
+    subscriptions: List[Subscription]
+
+class SubscriptionSummary(BaseModel):
+    activeCount: int
+    monthlyBurn: float
+    annualBurn: float
+    accounts: List[AccountSubscriptionBurn]  # Highest burn first
+    duplicates: List[DuplicateSubscriptions]
+    priceChanges: List[RecentPriceChange]  # Most recent first
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel
 from app.schemas.enums import HealthAppointmentType
@@ -29,6 +29,26 @@ class BodyMetric(BodyMetricBase):
     class Config:
         from_attributes = True
 
+class BodyMetricBatchResult(BaseModel):
+    received: int  # Readings committed (duplicates of stored readings included, skipped)
+
+class MetricSeriesPoint(BaseModel):
+    date: int  # Mean timestamp of the bucket's measurements (ms)
+    count: int
+    min: float
+    avg: float
+    max: float
+    rollingAvg: float
+
+class MetricSeries(BaseModel):
+    metric: str
+    start: Optional[int] = None
+    end: Optional[int] = None
+    bucketMs: Optional[int] = None
+    count: int  # Raw measurements in the range
+    trendPerDay: Optional[float] = None  # Least-squares slope, metric units per day
+    points: List[MetricSeriesPoint]
+
 class HealthAppointmentBase(BaseModel):
     itemId: UUID
     title: str
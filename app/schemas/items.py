@@ -2,10 +2,13 @@ from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, ConfigDict
 from app.schemas.enums import ItemType, ItemStatus, AssetType
+from app.schemas.alerts import Alert
+from app.schemas.finance import HistoryEntry, Subscription
 
 class LifeItemBase(BaseModel):
     name: str
     value: str
+    currency: Optional[str] = Field(None, min_length=3, max_length=3)  # ISO code, detected from value when omitted
     type: ItemType
     status: ItemStatus
     categoryId: Optional[UUID] = None
@@ -36,6 +39,13 @@ class LifeItemBase(BaseModel):
 class LifeItem(LifeItemBase):
     model_config = ConfigDict(from_attributes=True)
     id: UUID
+    numericValue: Optional[float] = None  # Parsed value of currency/percentage items
+
+class LifeItemDetails(LifeItem):
+    """Item with its related records, loaded in batch for many items."""
+    alerts: List[Alert] = []
+    subscriptions: List[Subscription] = []
+    recentHistory: List[HistoryEntry] = []  # Latest entries, newest first
 
 class LifeItemCreate(LifeItemBase):
     pass
@@ -43,6 +53,7 @@ class LifeItemCreate(LifeItemBase):
 class LifeItemUpdate(BaseModel):
     name: Optional[str] = None
     value: Optional[str] = None
+    currency: Optional[str] = Field(None, min_length=3, max_length=3)
     type: Optional[ItemType] = None
     status: Optional[ItemStatus] = None
     categoryId: Optional[UUID] = None
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel
 from app.schemas.enums import MaintenanceUrgency
@@ -37,6 +37,48 @@ class PropertyValuation(PropertyValuationBase):
     class Config:
         from_attributes = True
 
+class AmortizationRow(BaseModel):
+    number: int
+    date: int  # Due date (timestamp ms)
+    payment: float
+    interest: float
+    principal: float
+    balance: float  # Outstanding principal after the payment
+    equity: float  # estimatedValue - balance
+
+class LoanAmortization(BaseModel):
+    valuationId: UUID
+    itemId: UUID
+    estimatedValue: float
+    loanAmount: Optional[float] = None
+    monthlyPayment: Optional[float] = None
+    totalInterest: Optional[float] = None
+    asOf: int
+    remainingPrincipal: float
+    capitalRepaid: Optional[float] = None
+    equity: float
+    schedule: List[AmortizationRow]  # Empty when the loan terms are incomplete
+
+class PropertyEquity(BaseModel):
+    valuationId: UUID
+    itemId: UUID
+    estimatedValue: float
+    outstandingPrincipal: float
+    equity: float
+
+class EquityPoint(BaseModel):
+    date: int  # First day of the month (timestamp ms)
+    outstandingPrincipal: float
+    equity: float
+
+class EquityOverview(BaseModel):
+    asOf: int
+    totalEstimatedValue: float
+    totalOutstandingPrincipal: float
+    totalEquity: float
+    properties: List[PropertyEquity]
+    curve: List[EquityPoint]
+
 # --- Energy Consumption ---
 
 class EnergyConsumptionBase(BaseModel):
@@ -63,6 +105,32 @@ class EnergyConsumption(EnergyConsumptionBase):
     class Config:
         from_attributes = True
 
+class EnergyTotals(BaseModel):
+    electricityCost: float
+    gasCost: float
+    totalCost: float
+    electricityKwh: float
+    gasM3: float
+    costPerKwh: Optional[float] = None
+    costPerM3: Optional[float] = None
+    records: int
+    yoyDelta: Optional[float] = None  # totalCost minus the same period one year earlier
+
+class EnergyMonth(EnergyTotals):
+    month: str  # YYYY-MM (UTC)
+
+class EnergyYear(EnergyTotals):
+    year: int
+    months: int  # Months with at least one record
+    yoyMonths: int = 0  # Months recorded in both years: what yoyDelta / yoyPct compare
+    yoyPct: Optional[float] = None
+
+class EnergyAnalytics(BaseModel):
+    itemId: UUID
+    months: List[EnergyMonth]
+    years: List[EnergyYear]
+    projectedAnnualCost: Optional[float] = None  # Average of the last 12 months of data x 12
+
 # --- Maintenance Task ---
 
 class MaintenanceTaskBase(BaseModel):
@@ -0,0 +1,41 @@
+from typing import Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+from app.schemas.items import LifeItem
+from app.schemas.dependencies import Dependency
+from app.schemas.asset_config import FrontendAssetConfig
+
+
+class SceneIsland(BaseModel):
+    """Category without its items (items are listed flat, with their categoryId)."""
+    model_config = ConfigDict(from_attributes=True)
+    id: UUID
+    name: str
+    color: str
+    icon: Optional[str] = None
+
+
+class SceneSnapshot(BaseModel):
+    version: int
+    islands: List[SceneIsland]
+    items: List[LifeItem]
+    links: List[Dependency]
+    assets: Dict[str, FrontendAssetConfig]
+
+
+class SceneDeleted(BaseModel):
+    islands: List[UUID] = []
+    items: List[UUID] = []
+    links: List[UUID] = []
+    assets: List[str] = []
+
+
+class SceneDiff(BaseModel):
+    version: int
+    since: int
+    full: bool = False  # True: `since` is too old (or unknown), the payload is the whole scene
+    islands: List[SceneIsland] = []
+    items: List[LifeItem] = []
+    links: List[Dependency] = []
+    assets: Dict[str, FrontendAssetConfig] = {}
+    deleted: SceneDeleted = SceneDeleted()
@@ -27,6 +27,16 @@ class SocialEvent(SocialEventBase):
     class Config:
         from_attributes = True
 
+class ContactEventsPage(BaseModel):
+    items: List[SocialEvent]
+    nextCursor: Optional[str] = None  # Pass as `cursor` to get the next page
+
+class ContactInteractions(BaseModel):
+    contactId: UUID
+    count: int
+    firstEventDate: Optional[int] = None
+    lastEventDate: Optional[int] = None
+
 class ContactBase(BaseModel):
     itemId: UUID
     name: str
@@ -49,6 +59,12 @@ class ContactUpdate(BaseModel):
 
 class Contact(ContactBase):
     id: UUID
+    nextContactDue: Optional[int] = None  # lastContactDate + contactFrequencyDays (ms)
 
     class Config:
         from_attributes = True
+
+class UpcomingBirthday(BaseModel):
+    contact: Contact
+    nextBirthday: int  # Timestamp in milliseconds (UTC midnight)
+    daysUntil: int
@@ -8,14 +8,20 @@ import logging
 from pathlib import Path
 
 import uvicorn
+from fastapi.middleware import Middleware
 from google.adk.cli.fast_api import get_fast_api_app
 
 from app.core.config import settings
+from app.core.admission import AdmissionControlMiddleware
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.core.metrics import MetricsMiddleware, register_engine, track_job
+from app.core.query_log import QueryLogMiddleware
 from app.api.endpoints import (
     agent, items, social, health, finance, alerts, real_estate,
-    categories, dependencies, settings as settings_endpoint
+    categories, dependencies, events, metrics, networth, scene, settings as settings_endpoint
 )
 from app.api.v1.endpoints import assets
+from agents.sessions import register_session_service
 
 from contextlib import asynccontextmanager
 from app import models  # Register models with Base.metadata
@@ -23,6 +29,9 @@ from app import models  # Register models with Base.metadata
 # APScheduler for CRON jobs
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.services.finance_service import FinanceService
+from app.services.categorizer import retrain_scheduler
+from app.services.metric_ingest import metric_ingest
+from app.services.scene_service import SceneService
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,22 +45,46 @@ scheduler = AsyncIOScheduler()
 
 async def process_recurring_job():
     """CRON job to process recurring transactions daily."""
-    async with AsyncSessionLocal() as session:
-        service = FinanceService(session)
-        result = await service.process_recurring_transactions()
-        logger.info(f"[CRON] Recurring transactions processed: {result}")
+    with track_job("recurring_sync") as job:
+        async with AsyncSessionLocal() as session:
+            service = FinanceService(session)
+            result = await service.process_recurring_transactions()
+            job["result"] = result
+            logger.info(f"[CRON] Recurring transactions processed: {result}")
+
+
+async def prune_scene_changes_job():
+    """CRON job dropping scene changes older than the retention."""
+    with track_job("scene_changes_prune") as job:
+        async with AsyncSessionLocal() as session:
+            result = await SceneService(session).prune_changes(settings.SCENE_CHANGE_RETENTION_DAYS)
+            job["result"] = result
+            logger.info(f"[CRON] Scene changes pruned: {result}")
 
 
 # === Create ADK + FastAPI App ===
 # google-adk 1.21.0 uses agents_dir (plural) - points to parent containing agents folder
 AGENTS_DIR = str(Path(__file__).resolve().parent.parent)
 
+# Agent sessions are stored in Postgres, with history compaction (agents/sessions.py)
+register_session_service()
+
 app = get_fast_api_app(
     agents_dir=AGENTS_DIR,
+    session_service_uri=settings.DATABASE_URL,
+    session_db_kwargs={"pool_pre_ping": True, "pool_size": 5, "max_overflow": 5},
     allow_origins=settings.cors_origins_list,
     web=True,  # Enable ADK Dev UI at /dev-ui
 )
 
+# Separate agent / CRUD concurrency pools, shed load with 429/503 + Retry-After.
+# Appended (innermost) rather than add_middleware: rejections still get CORS headers.
+app.user_middleware.append(Middleware(AdmissionControlMiddleware))
+app.user_middleware.append(Middleware(QueryLogMiddleware))  # Statements per admitted request
+# Outermost: latency includes admission queueing
+app.add_middleware(MetricsMiddleware)
+register_engine("app", engine)
+
 # === Lifespan Events ===
 # Note: ADK's get_fast_api_app already has its own lifespan.
 # We need to add our startup/shutdown logic differently.
@@ -64,15 +97,18 @@ async def startup():
     logger.info("[STARTUP] Database tables created/verified")
     
     scheduler.add_job(process_recurring_job, 'cron', hour=0, minute=1, id='recurring_sync')
+    scheduler.add_job(prune_scene_changes_job, 'cron', hour=3, minute=0, id='scene_changes_prune')
     scheduler.start()
     logger.info("[STARTUP] APScheduler started - recurring sync scheduled daily at 00:01")
 
 
 @app.on_event("shutdown")
 async def shutdown():
-    """Shutdown: Stop scheduler."""
+    """Shutdown: Stop scheduler, flush buffered body metric readings, finish a pending categorizer retrain."""
     scheduler.shutdown()
     logger.info("[SHUTDOWN] APScheduler stopped")
+    await metric_ingest.drain()
+    await retrain_scheduler.drain()
 
 
 # === Include LifeMap API Routers ===
@@ -80,13 +116,17 @@ app.include_router(agent.router, prefix="/api/agent", tags=["agent"])
 app.include_router(items.router, prefix="/api/items", tags=["items"])
 app.include_router(categories.router, prefix="/api/categories", tags=["categories"])
 app.include_router(dependencies.router, prefix="/api/dependencies", tags=["dependencies"])
+app.include_router(scene.router, prefix="/api/scene", tags=["scene"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
 app.include_router(social.router, prefix="/api/social", tags=["social"])
 app.include_router(health.router, prefix="/api/health", tags=["health"])
 app.include_router(finance.router, prefix="/api/finance", tags=["finance"])
+app.include_router(networth.router, prefix="/api/networth", tags=["networth"])
 app.include_router(alerts.router, prefix="/api/alerts", tags=["alerts"])
 app.include_router(real_estate.router, prefix="/api/real-estate", tags=["real-estate"])
 app.include_router(settings_endpoint.router, prefix="/api/settings", tags=["settings"])
 app.include_router(assets.router, prefix="/api/assets", tags=["assets"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 
 @app.get("/", tags=["root"])
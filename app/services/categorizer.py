@@ -0,0 +1,285 @@
+"""
+Spending categories of history entries (groceries, rent, transport...).
+
+`HistoryEntry.category` only says income or expense; `spendingCategory` is
+the fine-grained category, assigned in-process without any LLM call:
+
+1. a TF-IDF nearest-centroid classifier trained from the user's own
+   corrections (entries whose category was set by hand), when it is
+   confident enough (cosine >= CATEGORIZER_MIN_SCORE);
+2. otherwise the keyword rules below (cold start, unseen merchants);
+3. otherwise no category.
+
+Labels are bank-statement strings ("CB CARREFOUR 12/03 PARIS"): they are
+normalized (case, accents, digits) and turned into word and character
+trigram features, hashed into N_FEATURES columns so the model needs no
+vocabulary. Classification works on whole batches: one sparse
+(row, feature, weight) triplet per label and feature, scored against every
+centroid at once.
+
+The model is a compressed .npz at CATEGORIZER_MODEL_PATH, loaded once per
+worker and reloaded when its file changes (retrained by another worker);
+the file is checked at most every CATEGORIZER_RELOAD_INTERVAL seconds.
+Corrections don't retrain inline: they ask retrain_scheduler for one
+background retrain, CATEGORIZER_RETRAIN_DELAY seconds later, shared by every
+correction made in the meantime.
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 1 << 14
+
+SOURCE_USER = "user"
+SOURCE_MODEL = "model"
+SOURCE_RULE = "rule"
+
+# First match wins: more specific keywords ("uber eats") before generic ones ("uber").
+# Merchant names or multi-word patterns only: a common word ("bar", "total",
+# "orange") would misfile every label that happens to contain it.
+RULES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("restaurants", (
+        "uber eats", "deliveroo", "just eat", "restaurant", "brasserie", "mcdonald", "mcdo",
+        "burger king", "kfc", "starbucks", "boulangerie", "cafe",
+    )),
+    ("subscriptions", (
+        "netflix", "spotify", "deezer", "disney", "canal plus", "canalplus", "amazon prime",
+        "youtube premium", "icloud", "google storage", "abonnement",
+    )),
+    ("groceries", (
+        "carrefour", "leclerc", "auchan", "lidl", "aldi", "intermarche", "monoprix", "franprix",
+        "geant casino", "petit casino", "casino shop", "super u", "hyper u", "picard", "biocoop",
+        "grand frais", "supermarche", "courses",
+    )),
+    ("rent", ("loyer", "rent", "foncia", "nexity")),
+    ("utilities", (
+        "edf", "engie", "totalenergies", "electricite", "gaz", "veolia", "suez", "eau de paris", "saur",
+        "orange sa", "sosh", "sfr", "bouygues", "free mobile", "free telecom", "freebox", "internet",
+    )),
+    ("transport", (
+        "sncf", "ratp", "navigo", "uber", "bolt", "taxi", "blablacar", "essence", "carburant",
+        "station service", "total access", "shell", "esso", "peage", "autoroute", "parking", "velib",
+    )),
+    ("health", (
+        "pharmacie", "medecin", "docteur", "doctolib", "dentiste", "opticien", "kine",
+        "hopital", "clinique", "laboratoire",
+    )),
+    ("insurance", ("assurance", "mutuelle", "maif", "macif", "matmut", "axa", "allianz", "groupama")),
+    ("shopping", (
+        "amazon", "fnac", "darty", "cdiscount", "decathlon", "ikea", "leroy merlin", "zara",
+        "primark", "vinted",
+    )),
+    ("leisure", (
+        "cinema", "ugc", "pathe", "concert", "theatre", "musee", "hotel", "airbnb", "booking",
+        "basic fit", "salle de sport",
+    )),
+    ("salary", ("salaire", "paie", "payroll", "salary")),
+    ("taxes", ("impot", "impots", "dgfip", "taxe", "urssaf", "amende")),
+    ("transfer", ("virement", "vir sepa", "vir inst", "transfer")),
+]
+
+_RULE_PATTERNS = [
+    (category, re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")\b"))
+    for category, keywords in RULES
+]
+
+
+def normalize_label(label: Optional[str]) -> str:
+    """"CB CARREFOUR 12/03 Évry" -> "cb carrefour evry"."""
+    decomposed = unicodedata.normalize("NFKD", label or "")
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^a-z]+", " ", without_accents.casefold()).split())
+
+
+def normalize_category(category: str) -> str:
+    return " ".join(category.casefold().split())
+
+
+def rule_category(normalized: str) -> Optional[str]:
+    for category, pattern in _RULE_PATTERNS:
+        if pattern.search(normalized):
+            return category
+    return None
+
+
+def label_features(normalized: str) -> List[int]:
+    """Hashed features of a normalized label: its words and their character trigrams."""
+    tokens = []
+    for word in normalized.split():
+        tokens.append("w:" + word)
+        padded = f" {word} "
+        tokens.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    # crc32, not hash(): features must be stable across processes
+    return [zlib.crc32(token.encode()) & (N_FEATURES - 1) for token in tokens]
+
+
+def term_counts(normalized: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sparse (row, feature, count) triplets of a batch of normalized labels, one per distinct pair."""
+    features = [label_features(label) for label in normalized]
+    rows = np.repeat(np.arange(len(features)), [len(row) for row in features])
+    cols = np.fromiter((feature for row in features for feature in row), dtype=np.int64, count=len(rows))
+    pairs, counts = np.unique(rows * N_FEATURES + cols, return_counts=True)
+    return pairs // N_FEATURES, pairs % N_FEATURES, counts.astype(np.float64)
+
+
+def _l2_normalize(rows: np.ndarray, values: np.ndarray, row_count: int) -> np.ndarray:
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=row_count))
+    return values / norms[rows]
+
+
+@dataclass(frozen=True)
+class CategorizerModel:
+    classes: np.ndarray  # (C,) category names
+    idf: np.ndarray  # (N_FEATURES,)
+    centroids: np.ndarray  # (C, N_FEATURES), L2-normalized TF-IDF centroids
+
+    @classmethod
+    def fit(cls, labels: Sequence[str], categories: Sequence[str]) -> "CategorizerModel":
+        normalized = [normalize_label(label) for label in labels]
+        rows, cols, counts = term_counts(normalized)
+        document_frequency = np.bincount(cols, minlength=N_FEATURES)
+        idf = np.log((1 + len(normalized)) / (1 + document_frequency)) + 1
+        values = _l2_normalize(rows, counts * idf[cols], len(normalized))
+
+        classes, targets = np.unique(np.asarray(categories, dtype=str), return_inverse=True)
+        centroids = np.zeros((len(classes), N_FEATURES))
+        np.add.at(centroids, (targets[rows], cols), values)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroids = np.divide(centroids, norms, out=np.zeros_like(centroids), where=norms > 0)
+        return cls(classes=classes, idf=idf.astype(np.float32), centroids=centroids.astype(np.float32))
+
+    def predict(self, normalized: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Best class index and its cosine score for each normalized label (score 0 without features)."""
+        rows, cols, counts = term_counts(normalized)
+        values = _l2_normalize(rows, counts * self.idf[cols], len(normalized))
+        scores = np.zeros((len(normalized), len(self.classes)))
+        np.add.at(scores, rows, values[:, None] * self.centroids[:, cols].T)
+        best = scores.argmax(axis=1)
+        return best, scores[np.arange(len(normalized)), best]
+
+    def save(self, path: str) -> None:
+        """Atomic write: workers reloading the model never read a partial file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "wb") as file:
+            np.savez_compressed(file, classes=self.classes, idf=self.idf, centroids=self.centroids)
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CategorizerModel":
+        with np.load(path) as data:
+            return cls(classes=data["classes"], idf=data["idf"], centroids=data["centroids"])
+
+
+class TransactionCategorizer:
+    """Per-worker holder of the trained model (see module docstring)."""
+
+    def __init__(self):
+        self._model: Optional[CategorizerModel] = None
+        self._version: Optional[Tuple[str, int]] = None  # (path, mtime) of the loaded file
+        self._checked: Optional[Tuple[str, float]] = None  # (path, monotonic time) of the last stat
+
+    def model(self) -> Optional[CategorizerModel]:
+        path = settings.CATEGORIZER_MODEL_PATH
+        now = time.monotonic()
+        if (
+            self._checked is not None
+            and self._checked[0] == path
+            and now - self._checked[1] < settings.CATEGORIZER_RELOAD_INTERVAL
+        ):
+            return self._model
+        self._checked = (path, now)
+        try:
+            version = (path, os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            version = None
+        if version != self._version:
+            self._model = CategorizerModel.load(path) if version else None
+            self._version = version
+        return self._model
+
+    def categorize(self, labels: Sequence[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """(spendingCategory, categorySource) of each label, in order."""
+        normalized = [normalize_label(label) for label in labels]
+        results: List[Tuple[Optional[str], Optional[str]]] = [(None, None)] * len(normalized)
+
+        model = self.model() if normalized else None
+        if model is not None:
+            best, scores = model.predict(normalized)
+            confident = scores >= settings.CATEGORIZER_MIN_SCORE
+            for index in np.flatnonzero(confident):
+                results[index] = (str(model.classes[best[index]]), SOURCE_MODEL)
+
+        for index, label in enumerate(normalized):
+            if results[index][0] is None:
+                category = rule_category(label)
+                if category is not None:
+                    results[index] = (category, SOURCE_RULE)
+        return results
+
+    def train(self, labels: Sequence[str], categories: Sequence[str]) -> Optional[CategorizerModel]:
+        """
+        Fit on the user's corrections and persist; without any, the rules
+        alone apply. CPU and disk bound: run it in a thread.
+        """
+        path = settings.CATEGORIZER_MODEL_PATH
+        if not labels:
+            if os.path.exists(path):
+                os.remove(path)
+            self._model, self._version = None, None
+        else:
+            model = CategorizerModel.fit(labels, categories)
+            model.save(path)
+            self._model, self._version = model, (path, os.stat(path).st_mtime_ns)
+        self._checked = (path, time.monotonic())
+        return self._model
+
+
+categorizer = TransactionCategorizer()
+
+
+class RetrainScheduler:
+    """
+    Coalesced background retraining: one task at a time, re-run once if
+    corrections arrived while it trained. Failures are logged, never raised:
+    the corrections are already committed.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._train: Optional[Callable[[], Awaitable[object]]] = None
+
+    def request(self, train: Callable[[], Awaitable[object]]) -> None:
+        """Retrain with `train` (opens its own session) after CATEGORIZER_RETRAIN_DELAY."""
+        self._train = train
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def drain(self) -> None:
+        """Wait for the scheduled retrain, if any (shutdown, tests)."""
+        while self._task is not None and not self._task.done():
+            await self._task
+
+    async def _run(self) -> None:
+        while self._train is not None:
+            await asyncio.sleep(settings.CATEGORIZER_RETRAIN_DELAY)
+            train, self._train = self._train, None
+            try:
+                await train()
+            except Exception as e:
+                logger.error(f"[CATEGORIZER] Retraining failed: {e}")
+
+
+retrain_scheduler = RetrainScheduler()
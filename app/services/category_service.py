@@ -4,12 +4,18 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 
+from app.core.change_feed import queue_event
 from app.models.categories import Category
 from app.schemas.categories import CategoryCreate, CategoryUpdate
+from app.schemas.scene import SceneIsland
+from app.services.dependency_graph import dependency_graph
+from app.services.repository import Repository
+from app.services.scene_service import ISLAND, ITEM, LINK, item_link_ids, record_scene_changes
 
 class CategoryService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.categories_repo = Repository(db, Category)
 
     async def get_categories(self, skip: int = 0, limit: int = 100) -> List[Category]:
         # Eager load items
@@ -27,29 +33,32 @@ class CategoryService:
     async def create_category(self, category_in: CategoryCreate) -> Category:
         db_category = Category(**category_in.model_dump())
         self.db.add(db_category)
+        await self.db.flush()
+        await record_scene_changes(self.db, ISLAND, [db_category.id])
+        queue_event(self.db, "island.created", db_category.id, SceneIsland.model_validate(db_category))
         await self.db.commit()
         await self.db.refresh(db_category)
         return db_category
 
     async def update_category(self, category_id: UUID, category_in: CategoryUpdate) -> Optional[Category]:
-        # We need to fetch without eager loading if we just update simple fields, but to return consistent object we might as well load
-        db_category = await self.get_category(category_id)
-        if not db_category:
-            return None
-        
-        update_data = category_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_category, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_category)
-        return db_category
+        category = await self.categories_repo.update(category_id, category_in.model_dump(exclude_unset=True), commit=False)
+        if category:
+            await record_scene_changes(self.db, ISLAND, [category_id])
+            queue_event(self.db, "island.updated", category_id, SceneIsland.model_validate(category))
+            await self.db.commit()
+        return category
 
     async def delete_category(self, category_id: UUID) -> bool:
         # Note: Depending on cascade rules, items might be deleted or set to null
         db_category = await self.get_category(category_id)
         if not db_category:
             return False
+        item_ids = [item.id for item in db_category.items]
+        await record_scene_changes(self.db, ISLAND, [category_id])
+        await record_scene_changes(self.db, ITEM, item_ids)
+        await record_scene_changes(self.db, LINK, await item_link_ids(self.db, item_ids))
+        queue_event(self.db, "island.deleted", category_id, {"itemIds": [str(item_id) for item_id in item_ids]})
         await self.db.delete(db_category)
         await self.db.commit()
+        dependency_graph.invalidate()  # Dependencies of the category cascade in the database
         return True
@@ -0,0 +1,254 @@
+"""
+Dependency graph of the life items.
+
+Each dependency is an edge `fromItemId -> toItemId` typed by `linkType`.
+The process keeps an adjacency index (item -> outgoing / incoming edges by
+link type) so neighborhood and impact queries only touch the edges they
+traverse instead of scanning the table:
+- Warm: the whole table is loaded once (one SELECT) on the first full-graph
+  request, then patched in place by the dependency / item writes of this
+  process, and reloaded after DEPENDENCY_GRAPH_TTL seconds to pick up the
+  writes of other workers.
+- Cold: until then, traversals run as one recursive CTE from the root item.
+
+Directions: "out" follows edges from -> to, "in" follows them backwards
+(what points at the item), "both" ignores the orientation.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Literal, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, case, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.dependencies import Dependency, LinkType
+
+logger = logging.getLogger(__name__)
+
+Direction = Literal["out", "in", "both"]
+
+MAX_TRAVERSAL_DEPTH = 32  # Impact analysis bound (cycles are skipped anyway)
+
+
+@dataclass(frozen=True)
+class GraphEdge:
+    """Snapshot of a dependency row held by the index."""
+    id: UUID
+    fromCategoryId: UUID
+    fromItemId: UUID
+    toCategoryId: UUID
+    toItemId: UUID
+    description: Optional[str]
+    linkType: Optional[str]
+    linkedItemId: Optional[UUID]
+
+    @classmethod
+    def from_row(cls, dep: Dependency) -> "GraphEdge":
+        link_type = dep.linkType.value if hasattr(dep.linkType, "value") else dep.linkType
+        return cls(
+            id=dep.id,
+            fromCategoryId=dep.fromCategoryId,
+            fromItemId=dep.fromItemId,
+            toCategoryId=dep.toCategoryId,
+            toItemId=dep.toItemId,
+            description=dep.description,
+            linkType=link_type,
+            linkedItemId=dep.linkedItemId,
+        )
+
+
+@dataclass
+class Traversal:
+    """Items reached from a root (with their distance) and the edges followed."""
+    root_id: UUID
+    depths: Dict[UUID, int]
+    edges: List[GraphEdge]
+
+
+class DependencyGraph:
+    """In-memory adjacency index of the dependencies table."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = ttl_seconds
+        self.edges: Dict[UUID, GraphEdge] = {}
+        self.outgoing: Dict[UUID, Dict[Optional[str], Set[UUID]]] = defaultdict(lambda: defaultdict(set))
+        self.incoming: Dict[UUID, Dict[Optional[str], Set[UUID]]] = defaultdict(lambda: defaultdict(set))
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_warm(self) -> bool:
+        if self.loaded_at is None:
+            return False
+        ttl = settings.DEPENDENCY_GRAPH_TTL if self.ttl_seconds is None else self.ttl_seconds
+        return time.monotonic() - self.loaded_at < ttl
+
+    # === INDEX MAINTENANCE ===
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Load the whole table once (and again when the TTL expired)."""
+        if self.is_warm:
+            return
+        async with self._lock:
+            if self.is_warm:
+                return
+            result = await db.execute(select(Dependency))
+            self._reset(GraphEdge.from_row(dep) for dep in result.scalars().all())
+            logger.info(f"[GRAPH] Loaded {len(self.edges)} dependency edges")
+
+    def _reset(self, edges: Iterable[GraphEdge]) -> None:
+        self.edges.clear()
+        self.outgoing.clear()
+        self.incoming.clear()
+        for edge in edges:
+            self._index(edge)
+        self.loaded_at = time.monotonic()
+
+    def _index(self, edge: GraphEdge) -> None:
+        self.edges[edge.id] = edge
+        self.outgoing[edge.fromItemId][edge.linkType].add(edge.id)
+        self.incoming[edge.toItemId][edge.linkType].add(edge.id)
+
+    def _unindex(self, edge: GraphEdge) -> None:
+        del self.edges[edge.id]
+        self.outgoing[edge.fromItemId][edge.linkType].discard(edge.id)
+        self.incoming[edge.toItemId][edge.linkType].discard(edge.id)
+
+    def upsert(self, dep: Dependency) -> None:
+        """Apply a created / updated dependency (no-op while cold)."""
+        if self.loaded_at is None:
+            return
+        edge = GraphEdge.from_row(dep)
+        previous = self.edges.get(edge.id)
+        if previous is not None:
+            self._unindex(previous)
+        self._index(edge)
+
+    def remove(self, dependency_id: UUID) -> None:
+        edge = self.edges.get(dependency_id)
+        if edge is not None:
+            self._unindex(edge)
+
+    def remove_item(self, item_id: UUID) -> None:
+        """Drop the edges of a deleted item (ON DELETE CASCADE in the database)."""
+        for index in (self.outgoing, self.incoming):
+            for edge_ids in list(index.get(item_id, {}).values()):
+                for edge_id in list(edge_ids):
+                    self.remove(edge_id)
+        self.outgoing.pop(item_id, None)
+        self.incoming.pop(item_id, None)
+
+    def invalidate(self) -> None:
+        """Force a reload on next use (bulk deletes, e.g. a whole category)."""
+        self.loaded_at = None
+
+    # === TRAVERSALS ===
+
+    def _adjacent(self, item_id: UUID, direction: Direction, link_types: Optional[Set[str]]) -> Iterable[Tuple[GraphEdge, UUID]]:
+        """(edge, other end) pairs leaving `item_id` in `direction`."""
+        sides = []
+        if direction in ("out", "both"):
+            sides.append((self.outgoing.get(item_id, {}), "toItemId"))
+        if direction in ("in", "both"):
+            sides.append((self.incoming.get(item_id, {}), "fromItemId"))
+        for by_type, other_end in sides:
+            for link_type, edge_ids in by_type.items():
+                if link_types and link_type not in link_types:
+                    continue
+                for edge_id in edge_ids:
+                    edge = self.edges[edge_id]
+                    yield edge, getattr(edge, other_end)
+
+    def traverse(
+        self,
+        root_id: UUID,
+        depth: int = MAX_TRAVERSAL_DEPTH,
+        direction: Direction = "both",
+        link_types: Optional[Set[str]] = None,
+    ) -> Traversal:
+        """Breadth-first walk from `root_id` up to `depth` hops (each edge visited once)."""
+        depths = {root_id: 0}
+        seen_edges: Dict[UUID, GraphEdge] = {}
+        queue = deque([root_id])
+        while queue:
+            item_id = queue.popleft()
+            if depths[item_id] >= depth:
+                continue
+            for edge, neighbor in self._adjacent(item_id, direction, link_types):
+                seen_edges.setdefault(edge.id, edge)
+                if neighbor not in depths:
+                    depths[neighbor] = depths[item_id] + 1
+                    queue.append(neighbor)
+        return Traversal(root_id=root_id, depths=depths, edges=list(seen_edges.values()))
+
+
+async def traverse_cold(
+    db: AsyncSession,
+    root_id: UUID,
+    depth: int = MAX_TRAVERSAL_DEPTH,
+    direction: Direction = "both",
+    link_types: Optional[Set[str]] = None,
+) -> Traversal:
+    """
+    Same walk as DependencyGraph.traverse, computed by the database: a
+    recursive CTE collects the reachable items with their distance, then
+    one query fetches the edges leaving them.
+    """
+    dep = Dependency.__table__.c
+    from_item = dep.from_item_id
+    to_item = dep.to_item_id
+
+    reach = select(
+        literal(root_id, type_=from_item.type).label("item_id"),
+        literal(0).label("depth"),
+    ).cte("reach", recursive=True)
+
+    edge_conditions = []
+    if direction in ("out", "both"):
+        edge_conditions.append(from_item == reach.c.item_id)
+    if direction in ("in", "both"):
+        edge_conditions.append(to_item == reach.c.item_id)
+    join_condition = or_(*edge_conditions)
+    if link_types:
+        join_condition = and_(join_condition, dep.link_type.in_([LinkType(t) for t in sorted(link_types)]))
+
+    if direction == "both":
+        neighbor = case((from_item == reach.c.item_id, to_item), else_=from_item)
+    else:
+        neighbor = to_item if direction == "out" else from_item
+    step = (
+        select(neighbor.label("item_id"), (reach.c.depth + 1).label("depth"))
+        .select_from(reach.join(Dependency.__table__, join_condition))
+        .where(reach.c.depth < depth)
+    )
+    reach = reach.union(step)
+
+    rows = await db.execute(select(reach.c.item_id, reach.c.depth))
+    depths: Dict[UUID, int] = {}
+    for item_id, distance in rows.all():
+        if item_id not in depths or distance < depths[item_id]:
+            depths[item_id] = distance
+
+    frontier = [item_id for item_id, distance in depths.items() if distance < depth]
+    edges: List[GraphEdge] = []
+    if frontier:
+        conditions = []
+        if direction in ("out", "both"):
+            conditions.append(Dependency.fromItemId.in_(frontier))
+        if direction in ("in", "both"):
+            conditions.append(Dependency.toItemId.in_(frontier))
+        query = select(Dependency).where(or_(*conditions))
+        if link_types:
+            query = query.where(Dependency.linkType.in_([LinkType(t) for t in sorted(link_types)]))
+        result = await db.execute(query)
+        edges = [GraphEdge.from_row(row) for row in result.scalars().all()]
+
+    return Traversal(root_id=root_id, depths=depths, edges=edges)
+
+
+dependency_graph = DependencyGraph()
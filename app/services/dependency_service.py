@@ -1,46 +1,112 @@
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
+from app.core.change_feed import queue_event
 from app.models.dependencies import Dependency
-from app.schemas.dependencies import DependencyCreate, DependencyUpdate
+from app.models.item import LifeItem
+from app.schemas.dependencies import Dependency as DependencySchema, DependencyCreate, DependencyUpdate
+from app.services.dependency_graph import (
+    MAX_TRAVERSAL_DEPTH,
+    Direction,
+    dependency_graph,
+    traverse_cold,
+)
+from app.services.repository import Repository
+from app.services.scene_service import LINK, record_scene_changes
 
 class DependencyService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.dependencies_repo = Repository(db, Dependency)
+        self.items_repo = Repository(db, LifeItem)
+        self.graph = dependency_graph
 
     async def get_dependencies(self, skip: int = 0, limit: int = 100) -> List[Dependency]:
         result = await self.db.execute(select(Dependency).offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_dependency(self, dependency_id: UUID) -> Optional[Dependency]:
-        return await self.db.get(Dependency, dependency_id)
+        return await self.dependencies_repo.get(dependency_id)
 
     async def create_dependency(self, dependency_in: DependencyCreate) -> Dependency:
-        db_dep = Dependency(**dependency_in.model_dump())
-        self.db.add(db_dep)
+        dependency = await self.dependencies_repo.create(dependency_in.model_dump(), commit=False)
+        await record_scene_changes(self.db, LINK, [dependency.id])
+        queue_event(self.db, "link.created", dependency.id, DependencySchema.model_validate(dependency))
         await self.db.commit()
-        await self.db.refresh(db_dep)
-        return db_dep
+        self.graph.upsert(dependency)
+        return dependency
 
     async def update_dependency(self, dependency_id: UUID, dependency_in: DependencyUpdate) -> Optional[Dependency]:
-        db_dep = await self.get_dependency(dependency_id)
-        if not db_dep:
-            return None
-        
-        update_data = dependency_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_dep, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_dep)
-        return db_dep
+        dependency = await self.dependencies_repo.update(
+            dependency_id, dependency_in.model_dump(exclude_unset=True), commit=False
+        )
+        if dependency:
+            await record_scene_changes(self.db, LINK, [dependency_id])
+            queue_event(self.db, "link.updated", dependency_id, DependencySchema.model_validate(dependency))
+            await self.db.commit()
+            self.graph.upsert(dependency)
+        return dependency
 
     async def delete_dependency(self, dependency_id: UUID) -> bool:
-        db_dep = await self.get_dependency(dependency_id)
-        if not db_dep:
-            return False
-        await self.db.delete(db_dep)
-        await self.db.commit()
-        return True
+        deleted = await self.dependencies_repo.delete(dependency_id, commit=False)
+        if deleted:
+            await record_scene_changes(self.db, LINK, [dependency_id])
+            queue_event(self.db, "link.deleted", dependency_id)
+            await self.db.commit()
+        self.graph.remove(dependency_id)
+        return deleted
+
+    # === GRAPH ===
+
+    async def _nodes(self, depths: Dict[UUID, Optional[int]]) -> List[dict]:
+        items = {item.id: item for item in await self.items_repo.list_in("id", list(depths))}
+        nodes = []
+        for item_id, depth in depths.items():
+            item = items.get(item_id)
+            nodes.append({
+                "id": item_id,
+                "name": item.name if item else None,
+                "categoryId": item.categoryId if item else None,
+                "assetType": item.assetType.value if item and item.assetType else None,
+                "depth": depth,
+            })
+        return nodes
+
+    async def get_graph(self) -> dict:
+        """Every dependency edge and the items they connect (warms the index)."""
+        await self.graph.ensure_loaded(self.db)
+        edges = list(self.graph.edges.values())
+        item_ids = {item_id for edge in edges for item_id in (edge.fromItemId, edge.toItemId)}
+        return {"nodes": await self._nodes(dict.fromkeys(item_ids)), "edges": edges}
+
+    async def _traverse(self, item_id: UUID, depth: int, direction: Direction, link_types: Optional[Set[str]]) -> dict:
+        if self.graph.is_warm:
+            traversal = self.graph.traverse(item_id, depth, direction, link_types)
+        else:
+            traversal = await traverse_cold(self.db, item_id, depth, direction, link_types)
+        return {
+            "rootId": item_id,
+            "nodes": await self._nodes(traversal.depths),
+            "edges": traversal.edges,
+        }
+
+    async def get_neighborhood(
+        self,
+        item_id: UUID,
+        depth: int = 1,
+        direction: Direction = "both",
+        link_types: Optional[Set[str]] = None,
+    ) -> dict:
+        """Items within `depth` links of an item, with the edges between them."""
+        return await self._traverse(item_id, depth, direction, link_types)
+
+    async def get_impact(
+        self,
+        item_id: UUID,
+        direction: Direction = "both",
+        link_types: Optional[Set[str]] = None,
+    ) -> dict:
+        """Everything transitively linked to an item (e.g. what depends on the car)."""
+        return await self._traverse(item_id, MAX_TRAVERSAL_DEPTH, direction, link_types)
@@ -1,111 +1,406 @@
+import asyncio
+import re
 import time
+import unicodedata
 from datetime import datetime, timezone
 from calendar import monthrange
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete, func, case, distinct, or_
 from typing import List, Optional
 
-from app.models.finance import HistoryEntry, Subscription, RecurringTransaction
+import numpy as np
+
+from app.core.change_feed import queue_event
+from app.core.config import settings
+from app.models.finance import HistoryEntry, Subscription, SubscriptionPriceChange, RecurringTransaction, ItemMonthlyTotal
+from app.models.item import LifeItem
+from app.schemas.enums import HistoryCategory
 from app.schemas.finance import (
+    HistoryEntry as HistoryEntrySchema,
     HistoryEntryCreate, HistoryEntryUpdate, 
     SubscriptionCreate, SubscriptionUpdate,
     RecurringTransactionCreate, RecurringTransactionUpdate
 )
+from app.services.amortization import now_ms
+from app.services.categorizer import SOURCE_USER, categorizer, normalize_category, retrain_scheduler
+from app.services.forecast import (
+    DAY_MS, NO_END, cached_forecast, horizon, invalidate_forecast, monthly_flows, project_balances, store_forecast,
+)
+from app.services.networth_service import history_delta, month_start, record_history_deltas, signed_amount
+from app.services.repository import Repository
+
+MIGRATION_CHUNK_SIZE = 1000  # Subscriptions per INSERT when migrating to recurring
+RECENT_PRICE_CHANGES = 20
+CATEGORIZE_CHUNK_SIZE = 1000  # Stored entries per batch when (re)categorizing the history
+
+
+def normalize_subscription_name(name: Optional[str]) -> str:
+    """Duplicate-detection key of a subscription name: "Netflix  Premium!" -> "netflix premium"."""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^\w]+", " ", without_accents.casefold()).split())
 
 
 class FinanceService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.history_repo = Repository(db, HistoryEntry)
+        self.subscriptions_repo = Repository(db, Subscription)
+        self.recurring_repo = Repository(db, RecurringTransaction)
 
     # History Entries
-    async def get_history(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[HistoryEntry]:
-        query = select(HistoryEntry).offset(skip).limit(limit)
+    async def get_history(
+        self,
+        item_id: Optional[UUID] = None,
+        skip: int = 0,
+        limit: int = 100,
+        since: Optional[int] = None,
+        spending_category: Optional[str] = None,
+    ) -> List[HistoryEntry]:
+        query = select(HistoryEntry).order_by(HistoryEntry.date.desc()).offset(skip).limit(limit)
         if item_id:
             query = query.filter(HistoryEntry.itemId == item_id)
+        if spending_category:
+            query = query.filter(HistoryEntry.spendingCategory == normalize_category(spending_category))
+        if since is not None:
+            query = query.filter(HistoryEntry.date >= since)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def get_history_summary(self, item_id: Optional[UUID] = None, since: Optional[int] = None) -> dict:
+        """Aggregate history entries in SQL (counts, sums, min/max and latest entry)."""
+        filters = []
+        if item_id:
+            filters.append(HistoryEntry.itemId == item_id)
+        if since is not None:
+            filters.append(HistoryEntry.date >= since)
+
+        totals = await self.db.execute(
+            select(
+                func.count(HistoryEntry.id),
+                func.coalesce(func.sum(case((HistoryEntry.category == HistoryCategory.INCOME, func.abs(HistoryEntry.value)), else_=0)), 0),
+                func.coalesce(func.sum(case((HistoryEntry.category == HistoryCategory.EXPENSE, func.abs(HistoryEntry.value)), else_=0)), 0),
+                func.min(HistoryEntry.value),
+                func.max(HistoryEntry.value),
+                func.min(HistoryEntry.date),
+                func.max(HistoryEntry.date),
+            ).where(*filters)
+        )
+        count, income, expense, min_value, max_value, first_date, last_date = totals.one()
+
+        latest = await self.db.execute(
+            select(HistoryEntry).where(*filters).order_by(HistoryEntry.date.desc()).limit(1)
+        )
+        latest_entry = latest.scalars().first()
+
+        return {
+            "count": count,
+            "totalIncome": float(income),
+            "totalExpense": float(expense),
+            "net": float(income) - float(expense),
+            "minValue": min_value,
+            "maxValue": max_value,
+            "firstDate": first_date,
+            "lastDate": last_date,
+            "latest": {
+                "date": latest_entry.date,
+                "value": latest_entry.value,
+                "label": latest_entry.label,
+            } if latest_entry else None,
+        }
+
     async def get_history_entry(self, entry_id: UUID) -> Optional[HistoryEntry]:
-        return await self.db.get(HistoryEntry, entry_id)
+        return await self.history_repo.get(entry_id)
+
+    @staticmethod
+    def _categorize_values(rows: List[dict]) -> int:
+        """
+        Set spendingCategory / categorySource of new entries (column values),
+        classifying the ones without a category in one batch. Returns the
+        number of categories set by hand (corrections to train on).
+        """
+        pending = []
+        for values in rows:
+            if values.get("spendingCategory"):
+                values["spendingCategory"] = normalize_category(values["spendingCategory"])
+                values["categorySource"] = SOURCE_USER
+            else:
+                pending.append(values)
+        for values, (category, source) in zip(pending, categorizer.categorize([values["label"] for values in pending])):
+            values["spendingCategory"], values["categorySource"] = category, source
+        return len(rows) - len(pending)
 
     async def create_history_entry(self, entry_in: HistoryEntryCreate) -> HistoryEntry:
-        db_entry = HistoryEntry(**entry_in.model_dump())
-        self.db.add(db_entry)
+        values = entry_in.model_dump()
+        corrections = self._categorize_values([values])
+        entry = await self.history_repo.create(values, commit=False)
+        await record_history_deltas(self.db, [history_delta(entry)])
+        queue_event(self.db, "history.added", entry.id, HistoryEntrySchema.model_validate(entry))
+        await self.db.commit()
+        invalidate_forecast()
+        if corrections:
+            self._schedule_categorizer_training()
+        return entry
+
+    async def import_history_entries(self, entries_in: List[HistoryEntryCreate]) -> dict:
+        """Bulk insert (bank statement import), categorized in one batch."""
+        rows = [entry_in.model_dump() for entry_in in entries_in]
+        corrections = self._categorize_values(rows)
+        entries = [HistoryEntry(**values) for values in rows]
+        self.db.add_all(entries)
+        await self.db.flush()  # Assign ids for the change feed
+        await record_history_deltas(self.db, [history_delta(entry) for entry in entries])
+        for entry in entries:
+            queue_event(self.db, "history.added", entry.id, HistoryEntrySchema.model_validate(entry))
         await self.db.commit()
-        await self.db.refresh(db_entry)
-        return db_entry
+        invalidate_forecast()
+        if corrections:
+            self._schedule_categorizer_training()
+        return {
+            "importedCount": len(entries),
+            "categorizedCount": sum(1 for entry in entries if entry.spendingCategory is not None),
+        }
 
     async def update_history_entry(self, entry_id: UUID, entry_in: HistoryEntryUpdate) -> Optional[HistoryEntry]:
-        db_entry = await self.get_history_entry(entry_id)
-        if not db_entry:
+        previous = await self.history_repo.get(entry_id)
+        if previous is None:
             return None
-        
-        update_data = entry_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_entry, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_entry)
-        return db_entry
+        removed = history_delta(previous, -1)  # Captured before the UPDATE refreshes `previous`
+        hand_set = previous.categorySource == SOURCE_USER
+        values = entry_in.model_dump(exclude_unset=True)
+        label = values.get("label", previous.label)
+
+        if values.get("spendingCategory") is not None:
+            values["spendingCategory"] = normalize_category(values["spendingCategory"])
+            values["categorySource"] = SOURCE_USER
+        elif "spendingCategory" in values or ("label" in values and not hand_set):
+            # Correction withdrawn, or new label of a categorized entry: classify again
+            ((values["spendingCategory"], values["categorySource"]),) = categorizer.categorize([label])
+        retrain = "spendingCategory" in values or (hand_set and "label" in values)
+
+        entry = await self.history_repo.update(entry_id, values, commit=False)
+        if entry:
+            await record_history_deltas(self.db, [removed, history_delta(entry)])
+            queue_event(self.db, "history.updated", entry_id, HistoryEntrySchema.model_validate(entry))
+            await self.db.commit()
+            invalidate_forecast()
+            if retrain:
+                self._schedule_categorizer_training()
+        return entry
 
     async def delete_history_entry(self, entry_id: UUID) -> bool:
-        db_entry = await self.get_history_entry(entry_id)
-        if not db_entry:
+        result = await self.db.execute(
+            delete(HistoryEntry).where(HistoryEntry.id == entry_id).returning(
+                HistoryEntry.itemId, HistoryEntry.date, HistoryEntry.value, HistoryEntry.category,
+                HistoryEntry.categorySource,
+            )
+        )
+        removed = result.one_or_none()
+        if removed is None:
             return False
-        await self.db.delete(db_entry)
+        await record_history_deltas(self.db, [history_delta(removed, -1)])
+        queue_event(self.db, "history.deleted", entry_id)
         await self.db.commit()
+        invalidate_forecast()
+        if removed.categorySource == SOURCE_USER:
+            self._schedule_categorizer_training()
         return True
 
+    def _schedule_categorizer_training(self) -> None:
+        """Background retrain after a committed correction, on a session of its own."""
+        bind = self.db.bind
+
+        async def train():
+            async with AsyncSession(bind, expire_on_commit=False) as session:
+                await FinanceService(session).train_categorizer()
+
+        retrain_scheduler.request(train)
+
+    async def train_categorizer(self) -> dict:
+        """Retrain the spending categorizer on the most recent hand-set categories."""
+        result = await self.db.execute(
+            select(HistoryEntry.label, HistoryEntry.spendingCategory)
+            .where(HistoryEntry.categorySource == SOURCE_USER)
+            .order_by(HistoryEntry.date.desc())
+            .limit(settings.CATEGORIZER_MAX_SAMPLES)
+        )
+        samples = result.all()
+        model = await asyncio.to_thread(
+            categorizer.train, [row.label for row in samples], [row.spendingCategory for row in samples]
+        )
+        return {"samples": len(samples), "categories": model.classes.tolist() if model is not None else []}
+
+    async def categorize_history(self, recategorize: bool = False, chunk_size: int = CATEGORIZE_CHUNK_SIZE) -> dict:
+        """
+        Categorize the stored entries without a spending category (with
+        `recategorize`, every entry not categorized by hand), in batches of
+        `chunk_size`, each committed on its own.
+        """
+        if recategorize:
+            pending = or_(HistoryEntry.categorySource.is_(None), HistoryEntry.categorySource != SOURCE_USER)
+        else:
+            pending = HistoryEntry.spendingCategory.is_(None)
+        categorized = uncategorized = 0
+        last_id = None
+        while True:
+            query = select(HistoryEntry.id, HistoryEntry.label).where(pending).order_by(HistoryEntry.id).limit(chunk_size)
+            if last_id is not None:
+                query = query.where(HistoryEntry.id > last_id)
+            rows = (await self.db.execute(query)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            changes = [
+                {"id": row.id, "spendingCategory": category, "categorySource": source}
+                for row, (category, source) in zip(rows, categorizer.categorize([row.label for row in rows]))
+            ]
+            found = [change for change in changes if change["spendingCategory"] is not None]
+            writes = changes if recategorize else found  # Uncategorized entries already are NULL
+            if writes:
+                await self.db.execute(update(HistoryEntry), writes)  # Bulk UPDATE by primary key
+                await self.db.commit()
+            categorized += len(found)
+            uncategorized += len(changes) - len(found)
+        return {"categorizedCount": categorized, "uncategorizedCount": uncategorized}
+
     # Subscriptions
     async def get_subscriptions(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[Subscription]:
-        query = select(Subscription).offset(skip).limit(limit)
-        if item_id:
-            query = query.filter(Subscription.itemId == item_id)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await self.subscriptions_repo.list(skip, limit, itemId=item_id)
 
     async def get_subscription(self, subscription_id: UUID) -> Optional[Subscription]:
-        return await self.db.get(Subscription, subscription_id)
+        return await self.subscriptions_repo.get(subscription_id)
 
     async def create_subscription(self, subscription_in: SubscriptionCreate) -> Subscription:
-        db_sub = Subscription(**subscription_in.model_dump())
-        self.db.add(db_sub)
-        await self.db.commit()
-        await self.db.refresh(db_sub)
-        return db_sub
+        values = subscription_in.model_dump()
+        values["normalizedName"] = normalize_subscription_name(values["name"])
+        subscription = await self.subscriptions_repo.create(values)
+        invalidate_forecast()
+        return subscription
 
     async def update_subscription(self, subscription_id: UUID, subscription_in: SubscriptionUpdate) -> Optional[Subscription]:
-        db_sub = await self.get_subscription(subscription_id)
-        if not db_sub:
-            return None
-        
-        update_data = subscription_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_sub, key, value)
-            
+        """Update a subscription; an amount change is recorded in its price history (same transaction)."""
+        values = subscription_in.model_dump(exclude_unset=True)
+        if "name" in values:
+            values["normalizedName"] = normalize_subscription_name(values["name"])
+        previous_amount = None
+        if values.get("amount") is not None:
+            previous_amount = await self.db.scalar(
+                select(Subscription.amount).where(Subscription.id == subscription_id)
+            )
+
+        subscription = await self.subscriptions_repo.update(subscription_id, values, commit=False)
+        if subscription is not None and previous_amount is not None and previous_amount != subscription.amount:
+            self.db.add(SubscriptionPriceChange(
+                subscriptionId=subscription_id,
+                oldAmount=previous_amount,
+                newAmount=subscription.amount,
+                changedAt=int(time.time() * 1000),
+            ))
         await self.db.commit()
-        await self.db.refresh(db_sub)
-        return db_sub
+        invalidate_forecast()
+        return subscription
 
     async def delete_subscription(self, subscription_id: UUID) -> bool:
-        db_sub = await self.get_subscription(subscription_id)
-        if not db_sub:
-            return False
-        await self.db.delete(db_sub)
-        await self.db.commit()
-        return True
+        deleted = await self.subscriptions_repo.delete(subscription_id)
+        invalidate_forecast()
+        return deleted
+
+    async def get_subscription_price_history(self, subscription_id: UUID) -> List[SubscriptionPriceChange]:
+        result = await self.db.execute(
+            select(SubscriptionPriceChange)
+            .where(SubscriptionPriceChange.subscriptionId == subscription_id)
+            .order_by(SubscriptionPriceChange.changedAt.desc())
+        )
+        return result.scalars().all()
+
+    async def get_subscription_summary(self, price_changes_limit: int = RECENT_PRICE_CHANGES) -> dict:
+        """
+        Active subscriptions at a glance, in three queries: monthly / annual
+        burn per account (SQL aggregate), likely duplicates (same normalized
+        name, or same amount on several accounts) and the latest price changes.
+        """
+        active = Subscription.isActive == True
+        burn_rows = (await self.db.execute(
+            select(Subscription.itemId, func.count(Subscription.id), func.sum(func.abs(Subscription.amount)))
+            .where(active)
+            .group_by(Subscription.itemId)
+            .order_by(func.sum(func.abs(Subscription.amount)).desc())
+        )).all()
+
+        duplicate_names = (
+            select(Subscription.normalizedName)
+            .where(active, Subscription.normalizedName.isnot(None), Subscription.normalizedName != "")
+            .group_by(Subscription.normalizedName)
+            .having(func.count() > 1)
+        )
+        duplicate_amounts = (
+            select(Subscription.amount)
+            .where(active)
+            .group_by(Subscription.amount)
+            .having(func.count(distinct(Subscription.itemId)) > 1)
+        )
+        candidates = (await self.db.execute(
+            select(Subscription)
+            .where(active, or_(
+                Subscription.normalizedName.in_(duplicate_names),
+                Subscription.amount.in_(duplicate_amounts),
+            ))
+            .order_by(Subscription.normalizedName, Subscription.itemId)
+        )).scalars().all()
+
+        changes = (await self.db.execute(
+            select(SubscriptionPriceChange, Subscription.name)
+            .join(Subscription, Subscription.id == SubscriptionPriceChange.subscriptionId)
+            .order_by(SubscriptionPriceChange.changedAt.desc())
+            .limit(price_changes_limit)
+        )).all()
+
+        groups = {}
+        by_name, by_amount = {}, {}
+        for sub in candidates:
+            by_name.setdefault(sub.normalizedName, []).append(sub)
+            by_amount.setdefault(sub.amount, []).append(sub)
+        for name, subs in by_name.items():
+            if name and len(subs) > 1:
+                groups[("name", name)] = subs
+        for amount, subs in by_amount.items():
+            if len({sub.itemId for sub in subs}) > 1:
+                groups[("amount", f"{amount:g}")] = subs
+
+        accounts = [
+            {"itemId": item_id, "activeCount": count, "monthlyBurn": round(total, 2), "annualBurn": round(total * 12, 2)}
+            for item_id, count, total in burn_rows
+        ]
+        monthly_burn = sum(total for _, _, total in burn_rows)
+        return {
+            "activeCount": sum(account["activeCount"] for account in accounts),
+            "monthlyBurn": round(monthly_burn, 2),
+            "annualBurn": round(monthly_burn * 12, 2),
+            "accounts": accounts,
+            "duplicates": [
+                {"reason": reason, "key": key, "subscriptions": subs}
+                for (reason, key), subs in groups.items()
+            ],
+            "priceChanges": [
+                {
+                    "subscriptionId": change.subscriptionId,
+                    "name": name,
+                    "oldAmount": change.oldAmount,
+                    "newAmount": change.newAmount,
+                    "changedAt": change.changedAt,
+                }
+                for change, name in changes
+            ],
+        }
 
     # Recurring Transactions
     async def get_recurring_transactions(self, account_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[RecurringTransaction]:
-        query = select(RecurringTransaction).offset(skip).limit(limit)
-        if account_id:
-            query = query.filter(RecurringTransaction.targetAccountId == account_id)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await self.recurring_repo.list(skip, limit, targetAccountId=account_id)
 
     async def get_recurring_transaction(self, recurring_id: UUID) -> Optional[RecurringTransaction]:
-        return await self.db.get(RecurringTransaction, recurring_id)
+        return await self.recurring_repo.get(recurring_id)
 
     async def create_recurring_transaction(self, recurring_in: RecurringTransactionCreate) -> RecurringTransaction:
         now = int(time.time() * 1000)
@@ -117,29 +412,126 @@ class FinanceService:
         self.db.add(db_recurring)
         await self.db.commit()
         await self.db.refresh(db_recurring)
+        invalidate_forecast()
         return db_recurring
 
     async def update_recurring_transaction(self, recurring_id: UUID, recurring_in: RecurringTransactionUpdate) -> Optional[RecurringTransaction]:
-        db_recurring = await self.get_recurring_transaction(recurring_id)
-        if not db_recurring:
-            return None
-        
         update_data = recurring_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_recurring, key, value)
-        db_recurring.updatedAt = int(time.time() * 1000)
-        
-        await self.db.commit()
-        await self.db.refresh(db_recurring)
-        return db_recurring
+        update_data["updatedAt"] = int(time.time() * 1000)
+        recurring = await self.recurring_repo.update(recurring_id, update_data)
+        invalidate_forecast()
+        return recurring
 
     async def delete_recurring_transaction(self, recurring_id: UUID) -> bool:
-        db_recurring = await self.get_recurring_transaction(recurring_id)
-        if not db_recurring:
-            return False
-        await self.db.delete(db_recurring)
-        await self.db.commit()
-        return True
+        deleted = await self.recurring_repo.delete(recurring_id)
+        invalidate_forecast()
+        return deleted
+
+    async def get_forecast(self, months: int = 12, account_id: Optional[UUID] = None) -> dict:
+        """
+        Balance of each account at the end of each of the next `months` months
+        (current month included), from its current balance and its active
+        recurring transactions and subscriptions (app/services/forecast.py).
+        """
+        key = (months, account_id)
+        cached = cached_forecast(key)
+        if cached is not None:
+            return cached
+
+        now = now_ms()
+        today = now - now % DAY_MS
+        current_month = month_start(now)
+        axis = horizon(now, months)
+
+        recurring_query = select(
+            RecurringTransaction.targetAccountId, RecurringTransaction.dayOfMonth, RecurringTransaction.amount,
+            RecurringTransaction.category, RecurringTransaction.startDate, RecurringTransaction.endDate,
+            RecurringTransaction.lastProcessedDate,
+        ).where(RecurringTransaction.isActive == True)
+        subscription_query = self._unmigrated_subscriptions(
+            Subscription.itemId, Subscription.billingDay, Subscription.amount,
+        ).where(Subscription.isActive == True)
+        if account_id is not None:
+            recurring_query = recurring_query.where(RecurringTransaction.targetAccountId == account_id)
+            subscription_query = subscription_query.where(Subscription.itemId == account_id)
+        recurring = (await self.db.execute(recurring_query)).all()
+        subscriptions = (await self.db.execute(subscription_query)).all()
+
+        # One row per schedule: account, day of month, signed amount, first and last possible dates
+        schedules = [
+            (account, day, signed_amount(category, amount),
+             max(start, current_month, (last_processed or -1) + 1), end if end is not None else NO_END)
+            for account, day, amount, category, start, end, last_processed in recurring
+        ] + [
+            (account, day, -abs(amount), today, NO_END)
+            for account, day, amount in subscriptions
+        ]
+        account_ids = list(dict.fromkeys(schedule[0] for schedule in schedules))
+
+        accounts = []
+        if account_ids:
+            history_totals = (
+                select(ItemMonthlyTotal.itemId, func.sum(ItemMonthlyTotal.total).label("total"))
+                .group_by(ItemMonthlyTotal.itemId)
+                .subquery()
+            )
+            accounts = (await self.db.execute(
+                select(
+                    LifeItem.id, LifeItem.name, LifeItem.syncBalanceWithBlock,
+                    LifeItem.initialBalance, LifeItem.numericValue, history_totals.c.total,
+                )
+                .outerjoin(history_totals, history_totals.c.itemId == LifeItem.id)
+                .where(LifeItem.id.in_(account_ids))
+            )).all()
+
+        index = {row.id: position for position, row in enumerate(accounts)}
+        schedules = [schedule for schedule in schedules if schedule[0] in index]
+        current = np.array([
+            (row.initialBalance or 0.0) + (row.total or 0.0) if row.syncBalanceWithBlock else (row.numericValue or 0.0)
+            for row in accounts
+        ])
+        columns = list(zip(*schedules)) if schedules else [[]] * 5
+        flows = monthly_flows(
+            np.array([index[account] for account in columns[0]], dtype=np.int64),
+            np.array(columns[1], dtype=np.int64),
+            np.array(columns[2], dtype=np.float64),
+            np.array(columns[3], dtype=np.int64),
+            np.array(columns[4], dtype=np.int64),
+            axis,
+            len(accounts),
+        )
+        balances = project_balances(current, flows)
+
+        dates = axis.tolist()
+        account_forecasts = []
+        for row, balance, flow in zip(accounts, balances, flows):
+            lowest = int(balance.argmin())
+            account_forecasts.append({
+                "itemId": row.id,
+                "name": row.name,
+                "currentBalance": round(float(current[index[row.id]]), 2),
+                "monthlyNet": round(float(flow.mean()), 2),
+                "endBalance": round(float(balance[-1]), 2),
+                "lowestBalance": round(float(balance[lowest]), 2),
+                "lowestBalanceDate": dates[lowest],
+                "points": [
+                    {"date": date, "balance": value}
+                    for date, value in zip(dates, balance.round(2).tolist())
+                ],
+            })
+
+        forecast = {
+            "asOf": now,
+            "months": months,
+            "schedules": len(schedules),
+            "accounts": account_forecasts,
+            "total": [
+                {"date": date, "balance": value}
+                for date, value in zip(dates, balances.sum(axis=0).round(2).tolist())
+            ],
+        }
+        store_forecast(key, forecast)
+        return forecast
 
     async def process_recurring_transactions(self) -> dict:
         """Process all active recurring transactions and create missing history entries."""
@@ -147,6 +539,7 @@ class FinanceService:
         today = datetime.now(timezone.utc)
         processed_count = 0
         errors = []
+        created_entries = []
         
         # Get all active recurring transactions
         query = select(RecurringTransaction).filter(RecurringTransaction.isActive == True)
@@ -203,6 +596,7 @@ class FinanceService:
                             category=recurring.category
                         )
                         self.db.add(history_entry)
+                        created_entries.append(history_entry)
                         last_processed_timestamp = target_timestamp
                         processed_count += 1
                     elif target_date.date() == today.date():
@@ -226,57 +620,105 @@ class FinanceService:
             except Exception as e:
                 errors.append(f"Error processing recurring {recurring.id}: {str(e)}")
         
+        if created_entries:
+            categories = categorizer.categorize([entry.label for entry in created_entries])
+            for entry, (category, source) in zip(created_entries, categories):
+                entry.spendingCategory, entry.categorySource = category, source
+            await self.db.flush()  # Assign ids for the change feed
+            await record_history_deltas(self.db, [history_delta(entry) for entry in created_entries])
+            for entry in created_entries:
+                queue_event(self.db, "history.added", entry.id, HistoryEntrySchema.model_validate(entry))
         await self.db.commit()
+        invalidate_forecast()
         return {"processedCount": processed_count, "errors": errors}
 
-    async def migrate_subscriptions_to_recurring(self) -> dict:
-        """Migrate existing Subscription records to RecurringTransaction."""
-        
+    def _unmigrated_subscriptions(self, *columns):
+        """Anti-join: subscriptions (or the given columns of them) without a RecurringTransaction sourced from them."""
+        migrated = (
+            select(RecurringTransaction.id)
+            .where(
+                RecurringTransaction.sourceItemId == Subscription.id,
+                RecurringTransaction.sourceType == "subscription",
+            )
+            .exists()
+        )
+        return select(*(columns or (Subscription,))).where(~migrated)
+
+    async def iter_migrate_subscriptions_to_recurring(self, chunk_size: int = MIGRATION_CHUNK_SIZE):
+        """
+        Migrate Subscriptions to RecurringTransactions, chunk by chunk.
+
+        Each chunk is one anti-join SELECT (keyset on id) + one bulk INSERT,
+        committed on its own. Yields a progress dict after each chunk.
+        """
         now_ms = int(time.time() * 1000)
-        migrated_count = 0
-        skipped_count = 0
-        errors = []
-        
-        # Get all subscriptions
-        result = await self.db.execute(select(Subscription))
-        subscriptions = result.scalars().all()
-        
-        for sub in subscriptions:
+        total = await self.db.scalar(select(func.count()).select_from(Subscription))
+        pending = await self.db.scalar(
+            select(func.count()).select_from(self._unmigrated_subscriptions().subquery())
+        )
+        progress = {
+            "totalCount": total,
+            "pendingCount": pending,
+            "migratedCount": 0,
+            "skippedCount": total - pending,
+            "errors": [],
+            "done": False,
+        }
+
+        last_id = None
+        while True:
+            query = self._unmigrated_subscriptions().order_by(Subscription.id).limit(chunk_size)
+            if last_id is not None:
+                query = query.where(Subscription.id > last_id)
+            subscriptions = (await self.db.execute(query)).scalars().all()
+            if not subscriptions:
+                break
+            last_id = subscriptions[-1].id
+
+            rows = [
+                {
+                    "sourceType": "subscription",
+                    "sourceItemId": sub.id,
+                    "targetAccountId": sub.itemId,
+                    "amount": -abs(sub.amount),  # Negative because expense
+                    "dayOfMonth": sub.billingDay,
+                    "label": sub.name,
+                    "category": "expense",
+                    "icon": sub.icon,
+                    "color": sub.color,
+                    "isActive": sub.isActive,
+                    "startDate": now_ms,
+                    "endDate": None,
+                    "lastProcessedDate": None,
+                    "createdAt": now_ms,
+                    "updatedAt": now_ms,
+                }
+                for sub in subscriptions
+            ]
             try:
-                # Check if already migrated (by looking for matching recurring with sourceItemId)
-                existing = await self.db.execute(
-                    select(RecurringTransaction).filter(
-                        RecurringTransaction.sourceItemId == sub.id,
-                        RecurringTransaction.sourceType == "subscription"
-                    )
-                )
-                if existing.scalars().first():
-                    skipped_count += 1
-                    continue
-                
-                # Create RecurringTransaction from Subscription
-                recurring = RecurringTransaction(
-                    sourceType="subscription",
-                    sourceItemId=sub.id,
-                    targetAccountId=sub.itemId,
-                    amount=-abs(sub.amount),  # Negative because expense
-                    dayOfMonth=sub.billingDay,
-                    label=sub.name,
-                    category="expense",
-                    icon=sub.icon,
-                    color=sub.color,
-                    isActive=sub.isActive,
-                    startDate=now_ms,
-                    endDate=None,
-                    lastProcessedDate=None,
-                    createdAt=now_ms,
-                    updatedAt=now_ms
-                )
-                self.db.add(recurring)
-                migrated_count += 1
-                
+                await self.db.execute(insert(RecurringTransaction), rows)
+                await self.db.commit()
+                invalidate_forecast()
             except Exception as e:
-                errors.append(f"Error migrating subscription {sub.id}: {str(e)}")
-        
-        await self.db.commit()
-        return {"migratedCount": migrated_count, "skippedCount": skipped_count, "errors": errors}
+                await self.db.rollback()
+                progress["errors"].append(
+                    f"Error migrating subscriptions {subscriptions[0].id}..{last_id}: {str(e)}"
+                )
+                break
+
+            progress["migratedCount"] += len(rows)
+            yield dict(progress)
+
+        progress["done"] = True
+        yield progress
+
+    async def migrate_subscriptions_to_recurring(self, chunk_size: int = MIGRATION_CHUNK_SIZE) -> dict:
+        """Migrate existing Subscription records to RecurringTransaction (set-based)."""
+        progress = {}
+        async for progress in self.iter_migrate_subscriptions_to_recurring(chunk_size=chunk_size):
+            pass
+        return {
+            "migratedCount": progress["migratedCount"],
+            "skippedCount": progress["skippedCount"],
+            "errors": progress["errors"],
+        }
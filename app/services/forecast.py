@@ -0,0 +1,94 @@
+"""
+Cash-flow forecast of the accounts.
+
+Projects each account's balance month by month from its current balance and
+its schedules: the active recurring transactions, plus the active
+subscriptions not migrated to a recurring transaction yet. The projection
+is array math over a schedule x month matrix (one row per schedule, one
+column per month of the horizon): due dates, activity mask and amounts are
+computed for every cell at once, then rows are summed per account and
+cumulated over the months. Thousands of schedules over 120 months take a
+few milliseconds.
+
+Conventions (those of process_recurring_transactions): a schedule falls on
+its day of month, clipped to the month's length, at 00:00 UTC; recurring
+amounts are signed by their category, subscriptions are expenses.
+Occurrences of the current month not booked yet (after lastProcessedDate)
+are counted; subscriptions only from today.
+
+Forecasts are cached per (horizon, account) until a finance or item write
+of this process (invalidate_forecast), or at most FORECAST_TTL seconds.
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+DAY_MS = 24 * 60 * 60 * 1000
+NO_END = np.iinfo(np.int64).max
+
+_forecast_cache: Dict[Tuple, Tuple[float, dict]] = {}
+
+
+def invalidate_forecast() -> None:
+    """Drop every cached forecast (balances and schedules are shared by all of them)."""
+    _forecast_cache.clear()
+
+
+def cached_forecast(key: Tuple) -> Optional[dict]:
+    cached = _forecast_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < settings.FORECAST_TTL:
+        return cached[1]
+    return None
+
+
+def store_forecast(key: Tuple, forecast: dict) -> None:
+    _forecast_cache[key] = (time.monotonic(), forecast)
+
+
+def horizon(now: int, months: int) -> np.ndarray:
+    """First day (ms) of the `months` months starting with the month of `now`."""
+    first = np.datetime64(now, "ms").astype("datetime64[M]")
+    return np.arange(first, first + months).astype("datetime64[ms]").astype(np.int64)
+
+
+def month_lengths(months: np.ndarray) -> np.ndarray:
+    """Number of days of each month (first days, ms)."""
+    following = (months.astype("datetime64[ms]").astype("datetime64[M]") + 1).astype("datetime64[ms]").astype(np.int64)
+    return (following - months) // DAY_MS
+
+
+def monthly_flows(
+    accounts: np.ndarray,
+    days: np.ndarray,
+    amounts: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    months: np.ndarray,
+    account_count: int,
+) -> np.ndarray:
+    """
+    Net flow of each account in each month, an (account_count, months) matrix.
+
+    One entry per schedule: `accounts` (row index of its account), `days`
+    (day of month), `amounts` (signed), `lower` / `upper` (first and last
+    dates an occurrence may fall on, ms). `months` are first days (ms).
+    """
+    due = months[None, :] + (np.minimum(days[:, None], month_lengths(months)[None, :]) - 1) * DAY_MS
+    active = (due >= lower[:, None]) & (due <= upper[:, None])
+    flows = np.where(active, amounts[:, None], 0.0)
+
+    per_account = np.zeros((account_count, len(months)))
+    if len(accounts):
+        order = np.argsort(accounts, kind="stable")
+        sorted_accounts = accounts[order]
+        group_starts = np.flatnonzero(np.r_[True, sorted_accounts[1:] != sorted_accounts[:-1]])
+        per_account[sorted_accounts[group_starts]] = np.add.reduceat(flows[order], group_starts, axis=0)
+    return per_account
+
+
+def project_balances(current: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """Balance of each account at the end of each month."""
+    return current[:, None] + np.cumsum(flows, axis=1)
@@ -1,89 +1,240 @@
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, func, cast, Float
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Set
 
 from app.models.health import BodyMetric, HealthAppointment
+from app.models.item import LifeItem
 from app.schemas.health import BodyMetricCreate, BodyMetricUpdate, HealthAppointmentCreate, HealthAppointmentUpdate
+from app.services.repository import Repository
+
+DAY_MS = 86_400_000
+
+
+class DuplicateMetric(Exception):
+    """A reading already exists for this item and date (unique index)."""
+
+# Body metric columns a series can be computed for
+SERIES_METRICS = {
+    "weight": BodyMetric.weight,
+    "bodyFat": BodyMetric.bodyFat,
+    "muscleMass": BodyMetric.muscleMass,
+}
+
+
+def _rolling_averages(buckets: List[dict], window_ms: int) -> List[float]:
+    """Count-weighted average of the buckets whose date is within `window_ms` before each bucket."""
+    averages = []
+    first, total, count = 0, 0.0, 0
+    for bucket in buckets:
+        total += bucket["avg"] * bucket["count"]
+        count += bucket["count"]
+        while buckets[first]["date"] <= bucket["date"] - window_ms:
+            total -= buckets[first]["avg"] * buckets[first]["count"]
+            count -= buckets[first]["count"]
+            first += 1
+        averages.append(round(total / count, 3))
+    return averages
+
 
 class HealthService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.metrics_repo = Repository(db, BodyMetric)
+        self.appointments_repo = Repository(db, HealthAppointment)
 
     # Body Metrics
-    async def get_metrics(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[BodyMetric]:
-        query = select(BodyMetric).offset(skip).limit(limit)
+    async def unknown_items(self, item_ids: Set[UUID]) -> Set[UUID]:
+        """The ids among `item_ids` that no life item has (readings for them would break the FK)."""
+        result = await self.db.execute(select(LifeItem.id).where(LifeItem.id.in_(item_ids)))
+        return item_ids - set(result.scalars().all())
+
+    async def get_metrics(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100, since: Optional[int] = None) -> List[BodyMetric]:
+        query = select(BodyMetric).order_by(BodyMetric.date.desc()).offset(skip).limit(limit)
         if item_id:
             query = query.filter(BodyMetric.itemId == item_id)
+        if since is not None:
+            query = query.filter(BodyMetric.date >= since)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def get_metrics_summary(self, item_id: Optional[UUID] = None, since: Optional[int] = None) -> dict:
+        """Aggregate body metrics in SQL (count, weight min/max/avg and latest measurement)."""
+        filters = []
+        if item_id:
+            filters.append(BodyMetric.itemId == item_id)
+        if since is not None:
+            filters.append(BodyMetric.date >= since)
+
+        totals = await self.db.execute(
+            select(
+                func.count(BodyMetric.id),
+                func.min(BodyMetric.weight),
+                func.max(BodyMetric.weight),
+                func.avg(BodyMetric.weight),
+                func.min(BodyMetric.date),
+                func.max(BodyMetric.date),
+            ).where(*filters)
+        )
+        count, min_weight, max_weight, avg_weight, first_date, last_date = totals.one()
+
+        latest = await self.db.execute(
+            select(BodyMetric).where(*filters).order_by(BodyMetric.date.desc()).limit(1)
+        )
+        latest_metric = latest.scalars().first()
+
+        return {
+            "count": count,
+            "minWeight": min_weight,
+            "maxWeight": max_weight,
+            "avgWeight": round(float(avg_weight), 2) if avg_weight is not None else None,
+            "firstDate": first_date,
+            "lastDate": last_date,
+            "latest": {
+                "date": latest_metric.date,
+                "weight": latest_metric.weight,
+                "bodyFat": latest_metric.bodyFat,
+                "muscleMass": latest_metric.muscleMass,
+            } if latest_metric else None,
+        }
+
+    async def get_metrics_series(
+        self,
+        item_id: Optional[UUID] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        points: int = 200,
+        metric: str = "weight",
+        window_days: int = 7,
+    ) -> dict:
+        """
+        Downsampled series of one body metric: [start, end] is cut into
+        `points` equal buckets, each reduced in SQL to count / min / avg / max.
+        The buckets also carry the sums of the least-squares fit, so the
+        trend slope over the whole range comes from the same query.
+        Rolling averages (over `window_days`) are computed from the buckets.
+        """
+        column = SERIES_METRICS[metric]
+        filters = [column.is_not(None)]
+        if item_id:
+            filters.append(BodyMetric.itemId == item_id)
+
+        series = {"metric": metric, "start": start, "end": end, "bucketMs": None, "count": 0, "trendPerDay": None, "points": []}
+        if start is None or end is None:
+            bounds = await self.db.execute(select(func.min(BodyMetric.date), func.max(BodyMetric.date)).where(*filters))
+            first_date, last_date = bounds.one()
+            if first_date is None:
+                return series
+            start = first_date if start is None else start
+            end = last_date if end is None else end
+        if end < start:
+            return series
+        filters += [BodyMetric.date >= start, BodyMetric.date <= end]
+
+        bucket_ms = max(1, -(-(end - start + 1) // points))
+        measures = (
+            select(
+                ((BodyMetric.date - start) // bucket_ms).label("bucket"),
+                BodyMetric.date.label("date"),
+                column.label("value"),
+                (cast(BodyMetric.date - start, Float) / float(DAY_MS)).label("day"),
+            )
+            .where(*filters)
+            .subquery()
+        )
+        rows = await self.db.execute(
+            select(
+                func.count(measures.c.value),
+                func.min(measures.c.value),
+                func.avg(measures.c.value),
+                func.max(measures.c.value),
+                func.avg(measures.c.date),
+                func.sum(measures.c.day),
+                func.sum(measures.c.day * measures.c.day),
+                func.sum(measures.c.day * measures.c.value),
+            )
+            .group_by(measures.c.bucket)
+            .order_by(measures.c.bucket)
+        )
+
+        buckets = []
+        n = sum_x = sum_y = sum_xx = sum_xy = 0.0
+        for count, low, avg, high, avg_date, bucket_x, bucket_xx, bucket_xy in rows.all():
+            avg = float(avg)
+            buckets.append({
+                "date": int(avg_date),
+                "count": count,
+                "min": low,
+                "avg": round(avg, 3),
+                "max": high,
+            })
+            n += count
+            sum_x += float(bucket_x)
+            sum_y += avg * count
+            sum_xx += float(bucket_xx)
+            sum_xy += float(bucket_xy)
+
+        for bucket, rolling in zip(buckets, _rolling_averages(buckets, window_days * DAY_MS)):
+            bucket["rollingAvg"] = rolling
+
+        denominator = n * sum_xx - sum_x * sum_x
+        series.update(
+            start=start,
+            end=end,
+            bucketMs=bucket_ms,
+            count=int(n),
+            trendPerDay=round((n * sum_xy - sum_x * sum_y) / denominator, 5) if n >= 2 and denominator > 0 else None,
+            points=buckets,
+        )
+        return series
+
     async def get_metric(self, metric_id: UUID) -> Optional[BodyMetric]:
-        return await self.db.get(BodyMetric, metric_id)
+        return await self.metrics_repo.get(metric_id)
+
+    async def _reading_exists(self, item_id: UUID, date: int, exclude_id: Optional[UUID] = None) -> bool:
+        query = select(BodyMetric.id).where(BodyMetric.itemId == item_id, BodyMetric.date == date)
+        if exclude_id is not None:
+            query = query.where(BodyMetric.id != exclude_id)
+        return (await self.db.execute(query.limit(1))).first() is not None
 
     async def create_metric(self, metric_in: BodyMetricCreate) -> BodyMetric:
-        db_metric = BodyMetric(**metric_in.model_dump())
-        self.db.add(db_metric)
-        await self.db.commit()
-        await self.db.refresh(db_metric)
-        return db_metric
+        try:
+            return await self.metrics_repo.create(metric_in.model_dump())
+        except IntegrityError:
+            await self.db.rollback()
+            if await self._reading_exists(metric_in.itemId, metric_in.date):
+                raise DuplicateMetric(f"A reading already exists for item {metric_in.itemId} at {metric_in.date}")
+            raise
 
     async def update_metric(self, metric_id: UUID, metric_in: BodyMetricUpdate) -> Optional[BodyMetric]:
-        db_metric = await self.get_metric(metric_id)
-        if not db_metric:
-            return None
-        
-        update_data = metric_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_metric, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_metric)
-        return db_metric
+        values = metric_in.model_dump(exclude_unset=True)
+        try:
+            return await self.metrics_repo.update(metric_id, values)
+        except IntegrityError:
+            await self.db.rollback()
+            current = await self.metrics_repo.get(metric_id)
+            if current is not None:
+                item_id, date = values.get("itemId", current.itemId), values.get("date", current.date)
+                if await self._reading_exists(item_id, date, exclude_id=metric_id):
+                    raise DuplicateMetric(f"A reading already exists for item {item_id} at {date}")
+            raise
 
     async def delete_metric(self, metric_id: UUID) -> bool:
-        db_metric = await self.get_metric(metric_id)
-        if not db_metric:
-            return False
-        await self.db.delete(db_metric)
-        await self.db.commit()
-        return True
+        return await self.metrics_repo.delete(metric_id)
 
     # Health Appointments
     async def get_appointments(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[HealthAppointment]:
-        query = select(HealthAppointment).offset(skip).limit(limit)
-        if item_id:
-            query = query.filter(HealthAppointment.itemId == item_id)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await self.appointments_repo.list(skip, limit, itemId=item_id)
 
     async def get_appointment(self, appointment_id: UUID) -> Optional[HealthAppointment]:
-        return await self.db.get(HealthAppointment, appointment_id)
+        return await self.appointments_repo.get(appointment_id)
 
     async def create_appointment(self, appointment_in: HealthAppointmentCreate) -> HealthAppointment:
-        db_appointment = HealthAppointment(**appointment_in.model_dump())
-        self.db.add(db_appointment)
-        await self.db.commit()
-        await self.db.refresh(db_appointment)
-        return db_appointment
+        return await self.appointments_repo.create(appointment_in.model_dump())
 
     async def update_appointment(self, appointment_id: UUID, appointment_in: HealthAppointmentUpdate) -> Optional[HealthAppointment]:
-        db_appointment = await self.get_appointment(appointment_id)
-        if not db_appointment:
-            return None
-        
-        update_data = appointment_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_appointment, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_appointment)
-        return db_appointment
+        return await self.appointments_repo.update(appointment_id, appointment_in.model_dump(exclude_unset=True))
 
     async def delete_appointment(self, appointment_id: UUID) -> bool:
-        db_appointment = await self.get_appointment(appointment_id)
-        if not db_appointment:
-            return False
-        await self.db.delete(db_appointment)
-        await self.db.commit()
-        return True
+        return await self.appointments_repo.delete(appointment_id)
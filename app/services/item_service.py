@@ -1,65 +1,175 @@
+import asyncio
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
 from typing import List, Optional
 
+from app.core.change_feed import queue_event
 from app.models.item import LifeItem
+from app.schemas.enums import ItemType
+from app.models.alerts import Alert
 from app.models.finance import HistoryEntry, Subscription, RecurringTransaction
-from app.schemas.items import LifeItemCreate, LifeItemUpdate
+from app.schemas.items import LifeItem as LifeItemSchema, LifeItemCreate, LifeItemUpdate
+from app.services.dependency_graph import dependency_graph
+from app.services.forecast import invalidate_forecast
+from app.services.item_values import typed_value_columns
+from app.services.loaders import Loaders
+from app.services.repository import Repository
+from app.services.scene_service import ITEM, LINK, item_link_ids, record_scene_changes
+
+RECENT_HISTORY_SIZE = 10
 
 class ItemService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.items_repo = Repository(db, LifeItem)
+        self.loaders = Loaders(db)
+
+    async def get_items(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[UUID] = None,
+        item_type: Optional[ItemType] = None,
+        currency: Optional[str] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        sort: Optional[str] = None,
+        top_per_category: Optional[int] = None,
+    ) -> List[LifeItem]:
+        """
+        Page of items, by name then id unless sorted otherwise (a stable order
+        for offset paging). Value filters and sorts use the indexed
+        `numeric_value` column; `top_per_category` keeps the N highest values
+        of each category (window function), ordered by category then value.
+        """
+        filters = []
+        if category_id is not None:
+            filters.append(LifeItem.categoryId == category_id)
+        if item_type is not None:
+            filters.append(LifeItem.type == item_type)
+        if currency is not None:
+            filters.append(LifeItem.currency == currency)
+        if min_value is not None:
+            filters.append(LifeItem.numericValue >= min_value)
+        if max_value is not None:
+            filters.append(LifeItem.numericValue <= max_value)
 
-    async def get_items(self, skip: int = 0, limit: int = 100) -> List[LifeItem]:
-        result = await self.db.execute(select(LifeItem).offset(skip).limit(limit))
+        if top_per_category:
+            ranked = (
+                select(
+                    LifeItem.id,
+                    func.row_number().over(
+                        partition_by=LifeItem.categoryId,
+                        order_by=(LifeItem.numericValue.desc(), LifeItem.id),
+                    ).label("rank"),
+                )
+                .where(LifeItem.numericValue.isnot(None), *filters)
+                .subquery()
+            )
+            query = (
+                select(LifeItem)
+                .join(ranked, ranked.c.id == LifeItem.id)
+                .where(ranked.c.rank <= top_per_category)
+                .order_by(LifeItem.categoryId, ranked.c.rank)
+            )
+        else:
+            query = select(LifeItem).where(*filters)
+            if sort == "value":
+                query = query.order_by(LifeItem.numericValue.asc().nulls_last(), LifeItem.id)
+            elif sort == "-value":
+                query = query.order_by(LifeItem.numericValue.desc().nulls_last(), LifeItem.id)
+            else:
+                query = query.order_by(LifeItem.name, LifeItem.id)
+
+        result = await self.db.execute(query.offset(skip).limit(limit))
         return result.scalars().all()
 
     async def get_item(self, item_id: UUID) -> Optional[LifeItem]:
-        return await self.db.get(LifeItem, item_id)
+        return await self.items_repo.get(item_id)
+
+    async def get_items_details(self, item_ids: Optional[List[UUID]] = None, skip: int = 0, limit: int = 100) -> List[dict]:
+        """
+        Items with their alerts, subscriptions and recent history.
+        One query per table whatever the number of items (batched loaders).
+        """
+        if item_ids:
+            items = await self.loaders.by_id(LifeItem).load_many(item_ids)
+            items = [item for item in items if item is not None]
+        else:
+            items = await self.get_items(skip=skip, limit=limit)
+
+        async def details(item: LifeItem) -> dict:
+            alerts, subscriptions, history = await asyncio.gather(
+                self.loaders.by_item(Alert).load(item.id),
+                self.loaders.by_item(Subscription).load(item.id),
+                self.loaders.by_item(HistoryEntry, order_by="-date", limit=RECENT_HISTORY_SIZE).load(item.id),
+            )
+            return {
+                **{column.key: getattr(item, column.key) for column in LifeItem.__mapper__.column_attrs},
+                "alerts": alerts,
+                "subscriptions": subscriptions,
+                "recentHistory": history,
+            }
+
+        return list(await asyncio.gather(*(details(item) for item in items)))
 
     async def create_item(self, item_in: LifeItemCreate) -> LifeItem:
-        db_item = LifeItem(**item_in.model_dump())
-        self.db.add(db_item)
+        values = item_in.model_dump()
+        values.update(typed_value_columns(values["value"], values["type"], values["currency"]))
+        item = await self.items_repo.create(values, commit=False)
+        await record_scene_changes(self.db, ITEM, [item.id])
+        queue_event(self.db, "item.created", item.id, LifeItemSchema.model_validate(item))
         await self.db.commit()
-        await self.db.refresh(db_item)
-        return db_item
+        return item
+
+    async def _typed_value_update(self, item_id: UUID, values: dict) -> dict:
+        """numericValue / currency to write with an update that changes the value or the type."""
+        if "value" not in values and "type" not in values:
+            return {}
+        if "value" not in values or "type" not in values:
+            current = await self.items_repo.get(item_id)
+            if current is None:
+                return {}
+            values = {"value": current.value, "type": current.type, **values}
+        typed = typed_value_columns(values["value"], values["type"], values.get("currency"))
+        if "currency" not in values and typed["currency"] is None and ItemType(values["type"]) == ItemType.CURRENCY:
+            typed.pop("currency")  # Keep the stored code when the new value doesn't name one
+        return typed
+
+    async def _update(self, item_id: UUID, values: dict) -> Optional[LifeItem]:
+        values = {**values, **await self._typed_value_update(item_id, values)}
+        item = await self.items_repo.update(item_id, values, commit=False)
+        if item:
+            await record_scene_changes(self.db, ITEM, [item_id])
+            queue_event(self.db, "item.updated", item_id, LifeItemSchema.model_validate(item))
+            await self.db.commit()
+            invalidate_forecast()  # Balances come from the items
+        return item
 
     async def update_item(self, item_id: UUID, item_in: LifeItemUpdate) -> Optional[LifeItem]:
-        db_item = await self.get_item(item_id)
-        if not db_item:
-            return None
-        
-        update_data = item_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_item, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_item)
-        return db_item
+        return await self._update(item_id, item_in.model_dump(exclude_unset=True))
 
     async def delete_item(self, item_id: UUID) -> bool:
-        db_item = await self.get_item(item_id)
-        if not db_item:
-            return False
-        
-        # Cascade delete related records
+        # Cascade delete related records (no-ops when the item doesn't exist)
         await self.db.execute(delete(HistoryEntry).where(HistoryEntry.itemId == item_id))
         await self.db.execute(delete(Subscription).where(Subscription.itemId == item_id))
         await self.db.execute(delete(RecurringTransaction).where(RecurringTransaction.targetAccountId == item_id))
         
-        # Delete the item itself
-        await self.db.delete(db_item)
+        # Delete the item itself (its dependencies cascade in the database)
+        link_ids = await item_link_ids(self.db, [item_id])
+        deleted = await self.items_repo.delete(item_id, commit=False)
+        if deleted:
+            await record_scene_changes(self.db, ITEM, [item_id])
+            await record_scene_changes(self.db, LINK, link_ids)
+            queue_event(self.db, "item.deleted", item_id)
+            for link_id in link_ids:
+                queue_event(self.db, "link.deleted", link_id)
         await self.db.commit()
-        return True
+        dependency_graph.remove_item(item_id)
+        invalidate_forecast()
+        return deleted
 
     async def update_widget_order(self, item_id: UUID, order: List[str]) -> Optional[LifeItem]:
         """Update the widget order for an item."""
-        db_item = await self.get_item(item_id)
-        if not db_item:
-            return None
-        
-        db_item.widgetOrder = order if order else None
-        await self.db.commit()
-        await self.db.refresh(db_item)
-        return db_item
+        return await self._update(item_id, {"widgetOrder": order if order else None})
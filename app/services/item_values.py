@@ -0,0 +1,68 @@
+"""
+Typed shadow of LifeItem.value.
+
+The `value` column stays the free text shown on the block ("12 500 €",
+"45 %"). For currency and percentage items, ItemService also stores the
+parsed number in `numeric_value` (and the currency code in `currency`), so
+sums, sorts and range filters over values run in SQL on an indexed column.
+Other item types (text, date) keep `numeric_value` NULL.
+"""
+import re
+from typing import Any, Dict, Optional
+
+from app.schemas.enums import ItemType
+
+NUMERIC_TYPES = (ItemType.CURRENCY, ItemType.PERCENTAGE)
+CURRENCY_SYMBOLS = {"€": "EUR", "$": "USD", "£": "GBP", "¥": "JPY", "₣": "CHF"}
+
+_AMOUNT_CHARS = re.compile(r"[^\d,.\-]")
+_CURRENCY_CODE = re.compile(r"\b([A-Z]{3})\b")
+
+
+def parse_amount(value: Optional[str]) -> Optional[float]:
+    """
+    Amount of an item's string value ("12 500 €", "1 234,56", "-300", "1,234.56").
+    A comma is the decimal separator unless a dot follows it. None when unreadable.
+    """
+    if not value:
+        return None
+    text = _AMOUNT_CHARS.sub("", value)
+    if "," in text and "." in text:
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif text.count(",") == 1:
+        text = text.replace(",", ".")
+    else:
+        text = text.replace(",", "")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_currency(value: Optional[str]) -> Optional[str]:
+    """ISO code written in a value ("EUR", "1 200 CHF") or implied by its symbol ("€"), else None."""
+    if not value:
+        return None
+    match = _CURRENCY_CODE.search(value)
+    if match:
+        return match.group(1)
+    for symbol, code in CURRENCY_SYMBOLS.items():
+        if symbol in value:
+            return code
+    return None
+
+
+def typed_value_columns(value: Optional[str], item_type, currency: Optional[str] = None) -> Dict[str, Any]:
+    """
+    `numericValue` and `currency` matching an item's value and type.
+    An explicit `currency` wins over the one written in the value.
+    """
+    item_type = ItemType(item_type) if item_type is not None else None
+    if item_type not in NUMERIC_TYPES:
+        return {"numericValue": None, "currency": currency}
+    if item_type == ItemType.CURRENCY and currency is None:
+        currency = parse_currency(value)
+    return {"numericValue": parse_amount(value), "currency": currency}
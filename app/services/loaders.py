@@ -0,0 +1,118 @@
+"""
+Batching loaders for cross-domain reads.
+
+A DataLoader collects the keys requested within one event loop tick and
+resolves them with a single query, so fetching the alerts / history /
+subscriptions of N items costs one statement per table instead of N:
+
+    loaders = Loaders(session)
+    alerts, subscriptions = await asyncio.gather(
+        loaders.by_item(Alert).load(item_id),
+        loaders.by_item(Subscription).load(item_id),
+    )
+
+Loaders are request-scoped: one Loaders per AsyncSession (a request, an
+agent tool call). Results are cached per key for that scope only. An
+AsyncSession can't run statements concurrently, so the batches of all the
+loaders of a scope are run one at a time.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.repository import Repository
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFunction = Callable[[List[Any]], Awaitable[Dict[Any, Any]]]
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Coalesce the `load(key)` calls made in the same tick into one
+    `batch_fn(keys)` call; keys missing from its result resolve to `default()`.
+    """
+
+    def __init__(self, batch_fn: BatchFunction, default: Callable[[], V] = lambda: None, lock: Optional[asyncio.Lock] = None):
+        self.batch_fn = batch_fn
+        self.default = default
+        self._lock = lock or asyncio.Lock()
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+
+    def load(self, key: K) -> Awaitable[V]:
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: Sequence[K]) -> List[V]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        asyncio.ensure_future(self._run_batch(keys))
+
+    async def _run_batch(self, keys: List[K]) -> None:
+        try:
+            async with self._lock:
+                results = await self.batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                self._cache.pop(key).set_exception(e)
+            return
+        for key in keys:
+            self._cache[key].set_result(results[key] if key in results else self.default())
+
+
+class Loaders:
+    """Request-scoped loaders sharing one AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._lock = asyncio.Lock()
+        self._loaders: Dict[Tuple, DataLoader] = {}
+
+    def by_id(self, model) -> DataLoader:
+        """Row of `model` by primary key (None when missing)."""
+        key = ("id", model)
+        if key not in self._loaders:
+            repo = Repository(self.db, model)
+
+            async def batch(ids: List[Any]) -> Dict[Any, Any]:
+                return {row.id: row for row in await repo.list_in("id", ids)}
+
+            self._loaders[key] = DataLoader(batch, lock=self._lock)
+        return self._loaders[key]
+
+    def by_item(
+        self, model, attribute: str = "itemId", order_by: Optional[str] = None, limit: Optional[int] = None
+    ) -> DataLoader:
+        """
+        Rows of `model` attached to an item (empty list when none), ordered
+        by the `order_by` attribute ("-date" for newest first), at most
+        `limit` per item (limited in SQL).
+        """
+        key = (attribute, model, order_by, limit)
+        if key not in self._loaders:
+            repo = Repository(self.db, model)
+            order = None
+            if order_by:
+                order = getattr(model, order_by.lstrip("-"))
+                order = order.desc() if order_by.startswith("-") else order
+
+            async def batch(item_ids: List[Any]) -> Dict[Any, List[Any]]:
+                grouped: Dict[Any, List[Any]] = defaultdict(list)
+                for row in await repo.list_in(attribute, item_ids, order_by=order, per_key_limit=limit):
+                    grouped[getattr(row, attribute)].append(row)
+                return grouped
+
+            self._loaders[key] = DataLoader(batch, default=list, lock=self._lock)
+        return self._loaders[key]
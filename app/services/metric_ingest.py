@@ -0,0 +1,215 @@
+"""
+Write-behind ingest of body metric readings (smart scales, wearables).
+
+Readings posted to /api/health/body-metrics/batch are appended to an
+in-process buffer. One background task flushes it BODY_METRIC_INGEST_FLUSH_MS
+after the first reading arrives, or at once when it holds
+BODY_METRIC_INGEST_BATCH_SIZE readings: multi-row
+`INSERT ... ON CONFLICT (item_id, date) DO NOTHING` statements, committed
+in one transaction. Concurrent requests thus share one commit instead of
+paying one each.
+
+A request is acknowledged only once the flush carrying its readings has
+committed. If the database refuses a shared flush (constraint or data
+error), each request's readings are written again on their own, so only
+the offending request fails (IngestRejected); if the database can't be
+reached, every request of the flush fails (IngestUnavailable). A reading
+already stored for the same item and timestamp is skipped, so a device can
+safely re-send a batch.
+
+Backpressure: past BODY_METRIC_INGEST_MAX_PENDING buffered readings, new
+batches are refused (IngestBacklogFull, 429) instead of growing memory.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.health import BodyMetric
+from app.schemas.health import BodyMetricCreate
+
+logger = logging.getLogger(__name__)
+
+INSERT_CHUNK_SIZE = 1000  # Rows per INSERT statement (8 bind parameters each)
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines")
+
+_readings_adapter = TypeAdapter(List[BodyMetricCreate])
+
+
+class IngestBacklogFull(Exception):
+    """Too many readings waiting to be written."""
+
+
+class IngestRejected(Exception):
+    """The database refused the readings of a request (constraint or data error)."""
+
+
+class IngestUnavailable(Exception):
+    """The readings could not be written (database unreachable or failing)."""
+
+
+def _ingest_error(error: Exception) -> Exception:
+    if isinstance(error, (IntegrityError, DataError)):
+        return IngestRejected(str(error.orig))
+    return IngestUnavailable(str(error))
+
+
+def _settle(waiter: asyncio.Future, error: Optional[Exception] = None) -> None:
+    if waiter.done():
+        return
+    if error is None:
+        waiter.set_result(None)
+    else:
+        waiter.set_exception(error)
+
+
+def parse_readings(body: bytes, content_type: str = "") -> List[BodyMetricCreate]:
+    """
+    Readings of a batch request: a JSON array, or NDJSON (one reading per
+    line) for the NDJSON content types. Raises ValidationError (pydantic)
+    or ValueError on malformed input.
+    """
+    if content_type.split(";", 1)[0].strip().lower() in NDJSON_CONTENT_TYPES:
+        lines = [line for line in body.splitlines() if line.strip()]
+        return [BodyMetricCreate.model_validate_json(line) for line in lines]
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+    return _readings_adapter.validate_python(payload)
+
+
+def _row(reading: BodyMetricCreate) -> Dict[str, Any]:
+    return {"id": uuid.uuid4(), **reading.model_dump()}
+
+
+class MetricIngestQueue:
+    """In-process write-behind buffer of body metric readings."""
+
+    def __init__(
+        self,
+        sessionmaker: Optional[async_sessionmaker] = None,
+        flush_ms: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self._sessionmaker = sessionmaker
+        self.flush_ms = flush_ms
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        # Rows of each waiting request, with the future acknowledging them
+        self._batches: List[Tuple[List[Dict[str, Any]], asyncio.Future]] = []
+        self._buffered = 0
+        self._in_flight = 0
+        self._full: Optional[asyncio.Future] = None  # Wakes the flusher early
+        self._flusher: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Readings accepted but not yet committed."""
+        return self._buffered + self._in_flight
+
+    def _setting(self, value, default):
+        return default if value is None else value
+
+    async def submit(self, readings: List[BodyMetricCreate]) -> int:
+        """Buffer `readings` and wait until they are committed. Returns their count."""
+        if not readings:
+            return 0
+        max_pending = self._setting(self.max_pending, settings.BODY_METRIC_INGEST_MAX_PENDING)
+        if self.pending + len(readings) > max_pending:
+            raise IngestBacklogFull()
+
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self._batches.append(([_row(reading) for reading in readings], done))
+        self._buffered += len(readings)
+
+        if self._buffered >= self._setting(self.batch_size, settings.BODY_METRIC_INGEST_BATCH_SIZE):
+            if self._full is not None and not self._full.done():
+                self._full.set_result(None)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self._run())
+
+        await done
+        return len(readings)
+
+    async def drain(self) -> None:
+        """Flush what is buffered now (shutdown)."""
+        if self._full is not None and not self._full.done():
+            self._full.set_result(None)
+        if self._flusher is not None:
+            await self._flusher
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._batches:
+            batch_size = self._setting(self.batch_size, settings.BODY_METRIC_INGEST_BATCH_SIZE)
+            if self._buffered < batch_size:
+                self._full = loop.create_future()
+                flush_ms = self._setting(self.flush_ms, settings.BODY_METRIC_INGEST_FLUSH_MS)
+                await asyncio.wait({self._full}, timeout=flush_ms / 1000)
+                self._full = None
+
+            batches, self._batches = self._batches, []
+            self._in_flight, self._buffered = self._buffered, 0
+            try:
+                await self._flush(batches)
+            finally:
+                self._in_flight = 0
+
+    async def _flush(self, batches: List[Tuple[List[Dict[str, Any]], asyncio.Future]]) -> None:
+        """Write the batches in one transaction; when the database refuses it, write each one alone."""
+        rows = [row for batch_rows, _ in batches for row in batch_rows]
+        try:
+            await self._write(rows)
+        except Exception as e:
+            error = _ingest_error(e)
+            if len(batches) == 1 or isinstance(error, IngestUnavailable):
+                logger.error(f"[INGEST] Flush of {len(rows)} body metric readings failed: {e}")
+                for _, waiter in batches:
+                    _settle(waiter, error)
+                return
+            logger.warning(f"[INGEST] Flush of {len(rows)} body metric readings refused, writing each request alone: {e}")
+            for batch_rows, waiter in batches:
+                try:
+                    await self._write(batch_rows)
+                except Exception as e:
+                    logger.error(f"[INGEST] Flush of {len(batch_rows)} body metric readings failed: {e}")
+                    _settle(waiter, _ingest_error(e))
+                else:
+                    _settle(waiter)
+        else:
+            for _, waiter in batches:
+                _settle(waiter)
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        sessionmaker = self._sessionmaker
+        if sessionmaker is None:
+            from app.core.database import AsyncSessionLocal
+            sessionmaker = AsyncSessionLocal
+
+        async with sessionmaker() as session:
+            statement = self._insert(session)
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                await session.execute(statement.values(rows[start:start + INSERT_CHUNK_SIZE]))
+            await session.commit()
+        logger.debug(f"[INGEST] Flushed {len(rows)} body metric readings")
+
+    @staticmethod
+    def _insert(session: AsyncSession):
+        """INSERT skipping the readings already stored for the same item and timestamp."""
+        insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+        return insert(BodyMetric).on_conflict_do_nothing(index_elements=[BodyMetric.itemId, BodyMetric.date])
+
+
+metric_ingest = MetricIngestQueue()
+
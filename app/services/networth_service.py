@@ -0,0 +1,212 @@
+"""
+Net worth across every island.
+
+Each item contributes (AssetType.DEBT items counted negative):
+- accounts synced with their history block (`syncBalanceWithBlock`):
+  initialBalance + the signed sum of their history entries;
+- items with a property valuation: estimated value minus the outstanding
+  loan principal (amortization schedule);
+- any other currency item: its value (`numeric_value`, see item_values).
+
+History sums come from item_monthly_totals: one row per item and month,
+kept up to date by FinanceService in the same transaction as every history
+write (record_history_deltas). A net worth is thus three small queries
+(items, valuations, monthly totals) whatever the size of history_entries,
+and the historical series is a cumulative sum over those monthly rows.
+Items without history (parsed values, property values) are held at their
+current value over the whole series.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.finance import ItemMonthlyTotal
+from app.models.item import LifeItem
+from app.models.real_estate import PropertyValuation
+from app.schemas.enums import AssetType, HistoryCategory, ItemType
+from app.services.amortization import month_axis, now_ms, valuation_schedule
+
+BUCKETS = ("month", "year")
+DEFAULT_SERIES_MONTHS = 12
+
+# (item id, entry date, signed amount, entry count): one history entry added (+1) or removed (-1)
+HistoryDelta = Tuple[UUID, int, float, int]
+
+
+def signed_amount(category, value: float) -> float:
+    """Effect of an entry on its account: income adds, expense subtracts, transfers keep their sign."""
+    category = HistoryCategory(category)
+    if category == HistoryCategory.INCOME:
+        return abs(value)
+    if category == HistoryCategory.EXPENSE:
+        return -abs(value)
+    return value
+
+
+def history_delta(entry, sign: int = 1) -> HistoryDelta:
+    """Delta of adding (sign=1) or removing (sign=-1) a history entry."""
+    return (entry.itemId, entry.date, sign * signed_amount(entry.category, entry.value), sign)
+
+
+def month_start(ms: int) -> int:
+    """First day of the UTC month of `ms` (timestamp ms)."""
+    moment = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+    return int(datetime(moment.year, moment.month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+async def record_history_deltas(db: AsyncSession, deltas: Iterable[HistoryDelta]) -> None:
+    """
+    Apply history deltas to the running totals, in the caller's transaction:
+    one `INSERT ... ON CONFLICT (item_id, month) DO UPDATE SET total = total + ...`
+    for all of them.
+    """
+    merged: Dict[Tuple[UUID, int], List[float]] = defaultdict(lambda: [0.0, 0])
+    for item_id, date, amount, entries in deltas:
+        totals = merged[(item_id, month_start(date))]
+        totals[0] += amount
+        totals[1] += entries
+    rows = [
+        {"itemId": item_id, "month": month, "total": total, "entries": entries}
+        for (item_id, month), (total, entries) in merged.items()
+        if total or entries
+    ]
+    if not rows:
+        return
+
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = insert(ItemMonthlyTotal).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[ItemMonthlyTotal.itemId, ItemMonthlyTotal.month],
+        set_={
+            "total": ItemMonthlyTotal.total + statement.excluded.total,
+            "entries": ItemMonthlyTotal.entries + statement.excluded.entries,
+        },
+    )
+    await db.execute(statement)
+
+
+def _bucket_axis(start: int, end: int, bucket: str) -> np.ndarray:
+    """First day of each bucket (ms) from the bucket of `start` to the bucket of `end`."""
+    months = month_axis(start, end)
+    if bucket == "year":
+        years = months.astype("datetime64[ms]").astype("datetime64[Y]")
+        months = np.unique(years).astype("datetime64[ms]").astype(np.int64)
+    return months
+
+
+def _bucket_ends(starts: np.ndarray, bucket: str, end: int) -> np.ndarray:
+    """Last ms of each bucket, the last one clipped to `end`."""
+    unit = "datetime64[Y]" if bucket == "year" else "datetime64[M]"
+    following = (starts.astype("datetime64[ms]").astype(unit) + 1).astype("datetime64[ms]").astype(np.int64)
+    return np.minimum(following - 1, end)
+
+
+class NetWorthService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_net_worth(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        bucket: str = "month",
+    ) -> dict:
+        """
+        Net worth now, per item, and its series between `start` and `end`
+        (default: the last 12 months), one point per bucket ("month" or
+        "year"): the position at the end of the bucket.
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+        now = now_ms()
+        end = now if end is None else end
+        if start is None:
+            first_month = np.datetime64(end, "ms").astype("datetime64[M]") - (DEFAULT_SERIES_MONTHS - 1)
+            start = int(first_month.astype("datetime64[ms]").astype(np.int64))
+        if start > end:
+            raise ValueError("from must be before to")
+        starts = _bucket_axis(start, end, bucket)
+        ends = _bucket_ends(starts, bucket, end)
+
+        valued_items = select(PropertyValuation.itemId)
+        items = (await self.db.execute(
+            select(LifeItem).where(or_(LifeItem.type == ItemType.CURRENCY, LifeItem.id.in_(valued_items)))
+        )).scalars().all()
+        valuations = (await self.db.execute(select(PropertyValuation))).scalars().all()
+        synced_ids = [item.id for item in items if item.syncBalanceWithBlock]
+        monthly = []
+        if synced_ids:
+            monthly = (await self.db.execute(
+                select(ItemMonthlyTotal.itemId, ItemMonthlyTotal.month, ItemMonthlyTotal.total)
+                .where(ItemMonthlyTotal.itemId.in_(synced_ids))
+                .order_by(ItemMonthlyTotal.itemId, ItemMonthlyTotal.month)
+            )).all()
+
+        by_item_valuations = defaultdict(list)
+        for valuation in valuations:
+            by_item_valuations[valuation.itemId].append(valuation)
+        by_item_months = defaultdict(list)
+        for item_id, month, total in monthly:
+            by_item_months[item_id].append((month, total))
+
+        positions = np.array([now], dtype=np.int64)
+        series = np.zeros(len(ends))
+        breakdown = []
+        for item in items:
+            if item.id in by_item_valuations:
+                source = "valuation"
+                current, history = 0.0, np.zeros(len(ends))
+                for valuation in by_item_valuations[item.id]:
+                    schedule = valuation_schedule(valuation)
+                    if schedule is None:
+                        current += valuation.estimatedValue
+                        history += valuation.estimatedValue
+                    else:
+                        current += valuation.estimatedValue - float(schedule.balance_at(positions)[0])
+                        history += valuation.estimatedValue - schedule.balance_at(ends)
+            elif item.syncBalanceWithBlock:
+                source = "history"
+                rows = by_item_months[item.id]
+                months = np.array([month for month, _ in rows], dtype=np.int64)
+                balances = (item.initialBalance or 0.0) + np.concatenate(([0.0], np.cumsum([total for _, total in rows])))
+                current = float(balances[np.searchsorted(months, positions, side="right")][0])
+                history = balances[np.searchsorted(months, ends, side="right")]
+            else:
+                if item.numericValue is None:
+                    continue
+                source = "value"
+                current, history = item.numericValue, np.full(len(ends), item.numericValue)
+
+            if item.assetType == AssetType.DEBT:
+                current, history = -abs(current), -np.abs(history)
+            series += history
+            breakdown.append({
+                "itemId": item.id,
+                "name": item.name,
+                "assetType": item.assetType.value if item.assetType else None,
+                "source": source,
+                "amount": round(current, 2),
+            })
+
+        assets = sum(entry["amount"] for entry in breakdown if entry["amount"] > 0)
+        liabilities = -sum(entry["amount"] for entry in breakdown if entry["amount"] < 0)
+        breakdown.sort(key=lambda entry: abs(entry["amount"]), reverse=True)
+        return {
+            "asOf": now,
+            "netWorth": round(assets - liabilities, 2),
+            "assets": round(assets, 2),
+            "liabilities": round(liabilities, 2),
+            "items": breakdown,
+            "bucket": bucket,
+            "series": [
+                {"date": date, "netWorth": value}
+                for date, value in zip(starts.tolist(), series.round(2).tolist())
+            ],
+        }
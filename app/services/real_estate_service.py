@@ -1,7 +1,11 @@
+import time
+from collections import defaultdict
 from uuid import UUID
+from sqlalchemy import func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
 
 from app.models.real_estate import PropertyValuation, EnergyConsumption, MaintenanceTask
 from app.schemas.real_estate import (
@@ -9,124 +13,266 @@ from app.schemas.real_estate import (
     EnergyConsumptionCreate, EnergyConsumptionUpdate,
     MaintenanceTaskCreate, MaintenanceTaskUpdate
 )
+from app.services.amortization import month_axis, now_ms, schedule_rows, valuation_schedule
+from app.services.repository import Repository
+
+# Energy analytics per item: (computed at, monotonic seconds; analytics)
+_energy_analytics_cache: Dict[UUID, Tuple[float, dict]] = {}
+
+
+def invalidate_energy_analytics(item_id: Optional[UUID] = None) -> None:
+    """Drop the cached analytics of an item (all items when None)."""
+    if item_id is None:
+        _energy_analytics_cache.clear()
+    else:
+        _energy_analytics_cache.pop(item_id, None)
+
+
+def _month_key(db: AsyncSession):
+    """'YYYY-MM' (UTC) of EnergyConsumption.date, in the dialect's date functions."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(
+            func.timezone("UTC", func.to_timestamp(EnergyConsumption.date / 1000.0)),
+            literal_column("'YYYY-MM'"),
+        )
+    return func.strftime(literal_column("'%Y-%m'"), EnergyConsumption.date / 1000, literal_column("'unixepoch'"))
+
+
+def _ratio(numerator: float, denominator: Optional[float]) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def _energy_totals(rows: List[dict]) -> dict:
+    electricity_cost = sum(r["electricityCost"] for r in rows)
+    gas_cost = sum(r["gasCost"] for r in rows)
+    kwh = sum(r["electricityKwh"] for r in rows)
+    m3 = sum(r["gasM3"] for r in rows)
+    return {
+        "electricityCost": round(electricity_cost, 2),
+        "gasCost": round(gas_cost, 2),
+        "totalCost": round(electricity_cost + gas_cost, 2),
+        "electricityKwh": round(kwh, 2),
+        "gasM3": round(m3, 2),
+        "costPerKwh": _ratio(electricity_cost, kwh),
+        "costPerM3": _ratio(gas_cost, m3),
+        "records": sum(r["records"] for r in rows),
+    }
+
 
 class RealEstateService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.valuations_repo = Repository(db, PropertyValuation)
+        self.energy_repo = Repository(db, EnergyConsumption)
+        self.maintenance_repo = Repository(db, MaintenanceTask)
 
     # Property Valuation
     async def get_valuations(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[PropertyValuation]:
-        query = select(PropertyValuation).offset(skip).limit(limit)
-        if item_id:
-            query = query.filter(PropertyValuation.itemId == item_id)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await self.valuations_repo.list(skip, limit, itemId=item_id)
 
     async def get_valuation(self, valuation_id: UUID) -> Optional[PropertyValuation]:
-        return await self.db.get(PropertyValuation, valuation_id)
+        return await self.valuations_repo.get(valuation_id)
 
     async def create_valuation(self, valuation_in: PropertyValuationCreate) -> PropertyValuation:
-        db_val = PropertyValuation(**valuation_in.model_dump())
-        self.db.add(db_val)
-        await self.db.commit()
-        await self.db.refresh(db_val)
-        return db_val
+        return await self.valuations_repo.create(valuation_in.model_dump())
 
     async def update_valuation(self, valuation_id: UUID, valuation_in: PropertyValuationUpdate) -> Optional[PropertyValuation]:
-        db_val = await self.get_valuation(valuation_id)
-        if not db_val:
-            return None
-        
-        update_data = valuation_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_val, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_val)
-        return db_val
+        return await self.valuations_repo.update(valuation_id, valuation_in.model_dump(exclude_unset=True))
 
     async def delete_valuation(self, valuation_id: UUID) -> bool:
-        db_val = await self.get_valuation(valuation_id)
-        if not db_val:
-            return False
-        await self.db.delete(db_val)
-        await self.db.commit()
-        return True
+        return await self.valuations_repo.delete(valuation_id)
+
+    async def get_amortization(self, valuation_id: UUID, at: Optional[int] = None) -> Optional[dict]:
+        """Loan schedule of a valuation with the principal / equity position at `at` (now by default)."""
+        valuation = await self.valuations_repo.get(valuation_id)
+        if valuation is None:
+            return None
+        at = now_ms() if at is None else at
+        schedule = valuation_schedule(valuation)
+        remaining = float(schedule.balance_at([at])[0]) if schedule else 0.0
+        return {
+            "valuationId": valuation.id,
+            "itemId": valuation.itemId,
+            "estimatedValue": valuation.estimatedValue,
+            "loanAmount": valuation.loanAmount,
+            "monthlyPayment": round(schedule.monthly_payment, 2) if schedule else None,
+            "totalInterest": round(schedule.total_interest, 2) if schedule else None,
+            "asOf": at,
+            "remainingPrincipal": round(remaining, 2),
+            "capitalRepaid": round(schedule.principal - remaining, 2) if schedule else None,
+            "equity": round(valuation.estimatedValue - remaining, 2),
+            "schedule": schedule_rows(schedule, valuation.estimatedValue) if schedule else [],
+        }
+
+    async def get_equity(self, at: Optional[int] = None) -> dict:
+        """
+        Equity of every property at `at` (estimated value minus outstanding
+        principal), plus the combined month-by-month curve over the loans' lifetime.
+        """
+        at = now_ms() if at is None else at
+        result = await self.db.execute(select(PropertyValuation))
+        valuations = result.scalars().all()
+        schedules = [(valuation, valuation_schedule(valuation)) for valuation in valuations]
+
+        properties = []
+        for valuation, schedule in schedules:
+            outstanding = float(schedule.balance_at([at])[0]) if schedule else 0.0
+            properties.append({
+                "valuationId": valuation.id,
+                "itemId": valuation.itemId,
+                "estimatedValue": valuation.estimatedValue,
+                "outstandingPrincipal": round(outstanding, 2),
+                "equity": round(valuation.estimatedValue - outstanding, 2),
+            })
+
+        loans = [(valuation, schedule) for valuation, schedule in schedules if schedule]
+        curve = []
+        if loans:
+            axis = month_axis(
+                min(valuation.loanStartDate for valuation, _ in loans),
+                max(int(schedule.due_dates[-1]) for _, schedule in loans),
+            )
+            outstanding = sum(schedule.balance_at(axis) for _, schedule in loans)
+            total_value = sum(valuation.estimatedValue for valuation in valuations)
+            curve = [
+                {"date": date, "outstandingPrincipal": principal, "equity": round(total_value - principal, 2)}
+                for date, principal in zip(axis.tolist(), outstanding.round(2).tolist())
+            ]
+
+        return {
+            "asOf": at,
+            "totalEstimatedValue": round(sum(p["estimatedValue"] for p in properties), 2),
+            "totalOutstandingPrincipal": round(sum(p["outstandingPrincipal"] for p in properties), 2),
+            "totalEquity": round(sum(p["equity"] for p in properties), 2),
+            "properties": properties,
+            "curve": curve,
+        }
 
     # Energy Consumption
     async def get_energy_records(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[EnergyConsumption]:
-        query = select(EnergyConsumption).offset(skip).limit(limit)
-        if item_id:
-            query = query.filter(EnergyConsumption.itemId == item_id)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await self.energy_repo.list(skip, limit, itemId=item_id)
 
     async def get_energy_record(self, record_id: UUID) -> Optional[EnergyConsumption]:
-        return await self.db.get(EnergyConsumption, record_id)
+        return await self.energy_repo.get(record_id)
 
     async def create_energy_record(self, record_in: EnergyConsumptionCreate) -> EnergyConsumption:
-        db_record = EnergyConsumption(**record_in.model_dump())
-        self.db.add(db_record)
-        await self.db.commit()
-        await self.db.refresh(db_record)
-        return db_record
+        record = await self.energy_repo.create(record_in.model_dump())
+        invalidate_energy_analytics(record.itemId)
+        return record
 
     async def update_energy_record(self, record_id: UUID, record_in: EnergyConsumptionUpdate) -> Optional[EnergyConsumption]:
-        db_record = await self.get_energy_record(record_id)
-        if not db_record:
-            return None
-        
-        update_data = record_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_record, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_record)
-        return db_record
+        record = await self.energy_repo.update(record_id, record_in.model_dump(exclude_unset=True))
+        if record is not None:
+            invalidate_energy_analytics(record.itemId)
+        return record
 
     async def delete_energy_record(self, record_id: UUID) -> bool:
-        db_record = await self.get_energy_record(record_id)
-        if not db_record:
-            return False
-        await self.db.delete(db_record)
-        await self.db.commit()
-        return True
+        deleted = await self.energy_repo.delete(record_id)
+        if deleted:
+            invalidate_energy_analytics()  # The item of the deleted row isn't returned
+        return deleted
+
+    async def get_energy_analytics(self, item_id: UUID) -> dict:
+        """
+        Energy dashboard of a property: monthly totals aggregated in SQL (one
+        GROUP BY month), rolled up per year, with year-over-year deltas, cost
+        per kWh / m³ and a projected annual cost (trailing 12 months of data).
+        A year's deltas only compare the months recorded in both years, so the
+        year in progress is compared year-to-date.
+        Cached per item until one of its records is written by this process,
+        at most ENERGY_ANALYTICS_TTL seconds (writes of other workers).
+        """
+        cached = _energy_analytics_cache.get(item_id)
+        if cached is not None and time.monotonic() - cached[0] < settings.ENERGY_ANALYTICS_TTL:
+            return cached[1]
+
+        readings = (
+            select(
+                _month_key(self.db).label("month"),
+                EnergyConsumption.electricityCost.label("electricity_cost"),
+                func.coalesce(EnergyConsumption.electricityKwh, 0).label("electricity_kwh"),
+                EnergyConsumption.gasCost.label("gas_cost"),
+                func.coalesce(EnergyConsumption.gasM3, 0).label("gas_m3"),
+            )
+            .where(EnergyConsumption.itemId == item_id)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(
+                readings.c.month,
+                func.sum(readings.c.electricity_cost),
+                func.sum(readings.c.electricity_kwh),
+                func.sum(readings.c.gas_cost),
+                func.sum(readings.c.gas_m3),
+                func.count(),
+            )
+            .group_by(readings.c.month)
+            .order_by(readings.c.month)
+        )
+        monthly_rows = [
+            {
+                "month": month,
+                "electricityCost": float(electricity_cost),
+                "electricityKwh": float(kwh),
+                "gasCost": float(gas_cost),
+                "gasM3": float(m3),
+                "records": records,
+            }
+            for month, electricity_cost, kwh, gas_cost, m3, records in result.all()
+        ]
+
+        months = []
+        by_month = {}
+        for row in monthly_rows:
+            entry = {"month": row["month"], **_energy_totals([row])}
+            year, month = row["month"].split("-")
+            previous = by_month.get(f"{int(year) - 1}-{month}")
+            entry["yoyDelta"] = round(entry["totalCost"] - previous["totalCost"], 2) if previous else None
+            by_month[row["month"]] = entry
+            months.append(entry)
+
+        rows_by_year: Dict[int, List[dict]] = defaultdict(list)
+        for row in monthly_rows:
+            rows_by_year[int(row["month"][:4])].append(row)
+        years = []
+        for year in sorted(rows_by_year):
+            entry = {"year": year, "months": len(rows_by_year[year]), **_energy_totals(rows_by_year[year])}
+            compared = [
+                (by_month[row["month"]]["totalCost"], by_month[f"{year - 1}{row['month'][4:]}"]["totalCost"])
+                for row in rows_by_year[year]
+                if by_month[row["month"]]["yoyDelta"] is not None
+            ]
+            current_cost, previous_cost = sum(c for c, _ in compared), sum(p for _, p in compared)
+            entry["yoyMonths"] = len(compared)
+            entry["yoyDelta"] = round(current_cost - previous_cost, 2) if compared else None
+            entry["yoyPct"] = _ratio(entry["yoyDelta"] * 100, previous_cost) if compared else None
+            years.append(entry)
+
+        # Trailing 12 months of data, scaled to a full year when fewer months are known
+        trailing = months[-12:]
+        projected = round(sum(m["totalCost"] for m in trailing) / len(trailing) * 12, 2) if trailing else None
+
+        analytics = {
+            "itemId": item_id,
+            "months": months,
+            "years": years,
+            "projectedAnnualCost": projected,
+        }
+        _energy_analytics_cache[item_id] = (time.monotonic(), analytics)
+        return analytics
 
     # Maintenance Tasks
     async def get_maintenance_tasks(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[MaintenanceTask]:
-        query = select(MaintenanceTask).offset(skip).limit(limit)
-        if item_id:
-            query = query.filter(MaintenanceTask.itemId == item_id)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await self.maintenance_repo.list(skip, limit, itemId=item_id)
 
     async def get_maintenance_task(self, task_id: UUID) -> Optional[MaintenanceTask]:
-        return await self.db.get(MaintenanceTask, task_id)
+        return await self.maintenance_repo.get(task_id)
 
     async def create_maintenance_task(self, task_in: MaintenanceTaskCreate) -> MaintenanceTask:
-        db_task = MaintenanceTask(**task_in.model_dump())
-        self.db.add(db_task)
-        await self.db.commit()
-        await self.db.refresh(db_task)
-        return db_task
+        return await self.maintenance_repo.create(task_in.model_dump())
 
     async def update_maintenance_task(self, task_id: UUID, task_in: MaintenanceTaskUpdate) -> Optional[MaintenanceTask]:
-        db_task = await self.get_maintenance_task(task_id)
-        if not db_task:
-            return None
-        
-        update_data = task_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_task, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_task)
-        return db_task
+        return await self.maintenance_repo.update(task_id, task_in.model_dump(exclude_unset=True))
 
     async def delete_maintenance_task(self, task_id: UUID) -> bool:
-        db_task = await self.get_maintenance_task(task_id)
-        if not db_task:
-            return False
-        await self.db.delete(db_task)
-        await self.db.commit()
-        return True
+        return await self.maintenance_repo.delete(task_id)
@@ -0,0 +1,139 @@
+"""
+Generic data access shared by the services.
+
+One Repository per model covers the get / list / create / update / delete
+pattern every domain service used to re-implement:
+- Updates and deletes run as a single `UPDATE ... RETURNING` / `DELETE ...
+  RETURNING id` statement instead of get + setattr + commit + refresh.
+  A missing row is detected from the empty RETURNING result, so the callers
+  keep returning None / False (mapped to 404 by the endpoints).
+- `list_in` fetches the rows matching many keys in one statement; it backs
+  the batching loaders (app/services/loaders.py).
+"""
+from typing import Any, Generic, List, Optional, Sequence, Type, TypeVar, Union
+from uuid import UUID
+
+from sqlalchemy import any_, bindparam, delete, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import Base
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+
+class Repository(Generic[ModelType]):
+    """CRUD and batched reads for one model, keyed by its `id` column."""
+
+    def __init__(self, db: AsyncSession, model: Type[ModelType]):
+        self.db = db
+        self.model = model
+
+    # === READS ===
+
+    async def get(self, obj_id: UUID) -> Optional[ModelType]:
+        return await self.db.get(self.model, obj_id)
+
+    async def list(self, skip: int = 0, limit: int = 100, **filters: Any) -> List[ModelType]:
+        """Page of rows; `filters` are column == value conditions, None values are ignored."""
+        query = select(self.model).offset(skip).limit(limit)
+        for attribute, value in filters.items():
+            if value is not None:
+                query = query.filter(getattr(self.model, attribute) == value)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def list_in(
+        self, attribute: str, keys: Sequence[Any], order_by=None, per_key_limit: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        All rows whose `attribute` is one of `keys`, in one statement.
+        On Postgres the keys are bound as a single array (`= ANY(:keys)`),
+        so the statement text doesn't change with the number of keys.
+        `per_key_limit` keeps the first N rows of each key (in `order_by`
+        order) with a ROW_NUMBER() window, so the other rows aren't fetched.
+        """
+        if not keys:
+            return []
+        column = getattr(self.model, attribute)
+        if self.db.get_bind().dialect.name == "postgresql":
+            condition = column == any_(bindparam("keys", list(keys), type_=ARRAY(column.type)))
+        else:
+            condition = column.in_(list(keys))
+        if per_key_limit is None:
+            query = select(self.model).where(condition)
+        else:
+            ranked = (
+                select(
+                    self.model.id,
+                    func.row_number().over(
+                        partition_by=column,
+                        order_by=(order_by, self.model.id) if order_by is not None else self.model.id,
+                    ).label("rank"),
+                )
+                .where(condition)
+                .subquery()
+            )
+            query = (
+                select(self.model)
+                .join(ranked, ranked.c.id == self.model.id)
+                .where(ranked.c.rank <= per_key_limit)
+            )
+        if order_by is not None:
+            query = query.order_by(order_by)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    # === WRITES ===
+
+    async def create(self, values: dict[str, Any], commit: bool = True) -> ModelType:
+        row = self.model(**values)
+        self.db.add(row)
+        if not commit:
+            await self.db.flush()  # Assign defaults (id) within the caller's transaction
+            return row
+        await self.db.commit()
+        await self.db.refresh(row)
+        return row
+
+    async def update(
+        self,
+        obj_id: UUID,
+        values: dict[str, Any],
+        return_minimal: bool = False,
+        commit: bool = True,
+    ) -> Union[ModelType, UUID, None]:
+        """
+        Update one row and return it (or only its id with `return_minimal`).
+        Returns None when no row has this id.
+        """
+        if not values:
+            # Nothing to write: plain read keeps the "None when missing" contract
+            row = await self.db.get(self.model, obj_id)
+            if row is None or not return_minimal:
+                return row
+            return row.id
+
+        statement = update(self.model).where(self.model.id == obj_id).values(**values)
+        if return_minimal:
+            result = await self.db.execute(statement.returning(self.model.id))
+            updated = result.scalar_one_or_none()
+        else:
+            result = await self.db.execute(
+                statement.returning(self.model).execution_options(populate_existing=True)
+            )
+            updated = result.scalars().one_or_none()
+
+        if commit:
+            await self.db.commit()
+        return updated
+
+    async def delete(self, obj_id: UUID, commit: bool = True) -> bool:
+        """Delete one row. Returns False when no row has this id."""
+        result = await self.db.execute(
+            delete(self.model).where(self.model.id == obj_id).returning(self.model.id)
+        )
+        deleted = result.scalar_one_or_none() is not None
+        if commit:
+            await self.db.commit()
+        return deleted
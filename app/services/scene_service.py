@@ -0,0 +1,156 @@
+"""
+Scene of the 3D map: islands (categories), items, links (dependencies)
+and asset configs, served as one snapshot plus incremental diffs.
+
+Every write to these entities appends a row per touched entity to
+`scene_changes` in the same transaction; the row's auto-increment
+`version` is the scene version. On Postgres the writers take a
+transaction-level advisory lock before appending, so versions become
+visible in commit order and a client never skips a change by reading a
+version ahead of a still-uncommitted one.
+
+- Snapshot: pre-serialized JSON cached per version, rebuilt only after a change.
+- Diff: entities changed since a version, re-read from their tables; the
+  ones that no longer exist are reported as deleted.
+"""
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
+
+from app.models.asset_config import AssetConfig
+from app.models.categories import Category
+from app.models.dependencies import Dependency
+from app.models.item import LifeItem
+from app.models.scene import SceneChange
+from app.schemas.asset_config import FrontendAssetConfig
+from app.schemas.scene import SceneDiff, SceneSnapshot
+from app.services.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+ISLAND = "island"
+ITEM = "item"
+LINK = "link"
+ASSET = "asset"
+
+SCENE_LOCK_KEY = 0x5CE4E  # pg_advisory_xact_lock key serializing scene writers
+
+_snapshot_cache: Dict[str, object] = {"version": None, "payload": None}
+
+
+async def record_scene_changes(db: AsyncSession, entity: str, entity_ids: Iterable) -> None:
+    """Append changes to the scene log; committed with the caller's transaction."""
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(select(func.pg_advisory_xact_lock(SCENE_LOCK_KEY)))
+    now_ms = int(time.time() * 1000)
+    db.add_all([SceneChange(entity=entity, entityId=str(entity_id), createdAt=now_ms) for entity_id in entity_ids])
+
+
+async def item_link_ids(db: AsyncSession, item_ids: List[UUID]) -> List[UUID]:
+    """Dependencies deleted in cascade with these items."""
+    if not item_ids:
+        return []
+    result = await db.execute(
+        select(Dependency.id).where(or_(
+            Dependency.fromItemId.in_(item_ids),
+            Dependency.toItemId.in_(item_ids),
+            Dependency.linkedItemId.in_(item_ids),
+        ))
+    )
+    return result.scalars().all()
+
+
+def frontend_asset(config: AssetConfig) -> FrontendAssetConfig:
+    return FrontendAssetConfig(
+        glbPath=config.glb_path,
+        scale=config.scale,
+        position=(config.position_x, config.position_y, config.position_z),
+        rotation=(config.rotation_x, config.rotation_y, config.rotation_z),
+        previewScale=config.preview_scale,
+    )
+
+
+class SceneService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_version(self) -> int:
+        return await self.db.scalar(select(func.max(SceneChange.version))) or 0
+
+    async def _load_all(self) -> dict:
+        islands = await self.db.execute(select(Category).options(noload(Category.items)))
+        items = await self.db.execute(select(LifeItem))
+        links = await self.db.execute(select(Dependency))
+        assets = await self.db.execute(select(AssetConfig))
+        return {
+            "islands": islands.scalars().all(),
+            "items": items.scalars().all(),
+            "links": links.scalars().all(),
+            "assets": {config.asset_type: frontend_asset(config) for config in assets.scalars().all()},
+        }
+
+    async def get_snapshot(self) -> Tuple[int, bytes]:
+        """(version, JSON payload) of the whole scene, rebuilt only when the version moved."""
+        # Version read first: the content loaded next is at least as recent
+        version = await self.get_version()
+        if _snapshot_cache["version"] == version:
+            return version, _snapshot_cache["payload"]
+
+        snapshot = SceneSnapshot(version=version, **await self._load_all())
+        payload = snapshot.model_dump_json().encode()
+        _snapshot_cache.update(version=version, payload=payload)
+        logger.info(f"[SCENE] Snapshot v{version} built ({len(payload)} bytes)")
+        return version, payload
+
+    async def get_diff(self, since: int) -> SceneDiff:
+        """Islands, items, links and assets changed after version `since`."""
+        version = await self.get_version()
+        if since == version:
+            return SceneDiff(version=version, since=since)
+
+        oldest = await self.db.scalar(select(func.min(SceneChange.version)))
+        if since > version or (oldest is not None and since < oldest - 1):
+            # Unknown version, or its changes were pruned: resync from scratch
+            return SceneDiff(version=version, since=since, full=True, **await self._load_all())
+
+        result = await self.db.execute(
+            select(SceneChange.entity, SceneChange.entityId)
+            .where(SceneChange.version > since, SceneChange.version <= version)
+            .distinct()
+        )
+        changed: Dict[str, set] = defaultdict(set)
+        for entity, entity_id in result.all():
+            changed[entity].add(entity_id)
+
+        fields: dict = {"deleted": {}}
+        for entity, model, field in ((ISLAND, Category, "islands"), (ITEM, LifeItem, "items"), (LINK, Dependency, "links")):
+            ids = [UUID(entity_id) for entity_id in changed.get(entity, ())]
+            rows = await Repository(self.db, model).list_in("id", ids)
+            found = {row.id for row in rows}
+            fields[field] = rows
+            fields["deleted"][field] = [entity_id for entity_id in ids if entity_id not in found]
+
+        asset_types = sorted(changed.get(ASSET, ()))
+        assets = await Repository(self.db, AssetConfig).list_in("asset_type", asset_types)
+        fields["assets"] = {config.asset_type: frontend_asset(config) for config in assets}
+        fields["deleted"]["assets"] = [asset_type for asset_type in asset_types if asset_type not in fields["assets"]]
+        return SceneDiff(version=version, since=since, **fields)
+
+    async def prune_changes(self, retention_days: int) -> dict:
+        """Drop changes older than the retention, always keeping the latest (current version)."""
+        cutoff = int(time.time() * 1000) - retention_days * 24 * 3600 * 1000
+        version = await self.get_version()
+        result = await self.db.execute(
+            delete(SceneChange).where(SceneChange.createdAt < cutoff, SceneChange.version < version)
+        )
+        await self.db.commit()
+        return {"prunedCount": result.rowcount}
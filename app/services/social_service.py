@@ -1,89 +1,311 @@
+import time
+from datetime import date, datetime, timedelta, timezone
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import BigInteger, select, func, case, cast, literal, or_, tuple_
+from typing import Any, List, Optional, Tuple
 
 from app.models.social import SocialEvent, Contact
 from app.schemas.social import SocialEventCreate, SocialEventUpdate, ContactCreate, ContactUpdate
+from app.services.repository import Repository
+
+DAY_MS = 86_400_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _utc_date(timestamp_ms: int) -> date:
+    return (_EPOCH + timedelta(milliseconds=timestamp_ms)).date()
+
+
+def birthday_day(birthday: Optional[int]) -> Optional[int]:
+    """Birthday as month * 100 + day (0315 for March 15), the key of the upcoming-birthday index."""
+    if birthday is None:
+        return None
+    day = _utc_date(birthday)
+    return day.month * 100 + day.day
+
+
+def _reminder_columns(values: dict[str, Any]) -> dict[str, Any]:
+    """
+    Derived columns for the fields a create / update payload touches. On
+    update, a field missing from the payload is read from the row by the
+    UPDATE itself (`SET next_contact_due = :last + contact_frequency_days * ...`).
+    That expression is computed in BIGINT: a millisecond timestamp, or a
+    frequency of 25 days or more times DAY_MS, overflows Postgres' INTEGER.
+    """
+    derived = {}
+    if "lastContactDate" in values or "contactFrequencyDays" in values:
+        last = values.get("lastContactDate", Contact.lastContactDate)
+        frequency = values.get("contactFrequencyDays", Contact.contactFrequencyDays)
+        if last is None or frequency is None:
+            derived["nextContactDue"] = None
+        elif "lastContactDate" in values and "contactFrequencyDays" in values:
+            derived["nextContactDue"] = last + frequency * DAY_MS
+        elif "lastContactDate" in values:
+            derived["nextContactDue"] = literal(last, BigInteger) + cast(frequency, BigInteger) * DAY_MS
+        else:
+            derived["nextContactDue"] = last + literal(frequency, BigInteger) * DAY_MS
+    if "birthday" in values:
+        derived["birthdayDay"] = birthday_day(values["birthday"])
+    return derived
+
+
+def encode_event_cursor(event: SocialEvent) -> str:
+    """Keyset cursor of an event: its position in the (date desc, id desc) order."""
+    return f"{event.date}_{event.id}"
+
+
+def decode_event_cursor(cursor: str) -> Tuple[int, UUID]:
+    """Inverse of encode_event_cursor; raises ValueError on a malformed cursor."""
+    event_date, event_id = cursor.split("_", 1)
+    return int(event_date), UUID(event_id)
+
+
+def _contact_ids_as_strings(values: dict[str, Any]) -> dict[str, Any]:
+    """contact_ids is a text[] column: store the UUIDs as their string form (what the containment lookups bind)."""
+    if values.get("contactIds") is not None:
+        values["contactIds"] = [str(contact_id) for contact_id in values["contactIds"]]
+    return values
+
+
+def _next_occurrence(day_key: int, today: date) -> date:
+    """Next date (today included) of a month * 100 + day key; Feb 29 falls on Feb 28 in common years."""
+    month, day = divmod(day_key, 100)
+    for year in (today.year, today.year + 1):
+        try:
+            occurrence = date(year, month, day)
+        except ValueError:
+            occurrence = date(year, month, day - 1)
+        if occurrence >= today:
+            return occurrence
+    return occurrence
+
 
 class SocialService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.events_repo = Repository(db, SocialEvent)
+        self.contacts_repo = Repository(db, Contact)
 
     # Social Events
-    async def get_events(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[SocialEvent]:
-        query = select(SocialEvent).offset(skip).limit(limit)
+    async def get_events(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100, since: Optional[int] = None) -> List[SocialEvent]:
+        query = select(SocialEvent).order_by(SocialEvent.date.desc()).offset(skip).limit(limit)
         if item_id:
             query = query.filter(SocialEvent.itemId == item_id)
+        if since is not None:
+            query = query.filter(SocialEvent.date >= since)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def get_events_summary(self, item_id: Optional[UUID] = None, since: Optional[int] = None) -> dict:
+        """Aggregate social events in SQL (count per type, date range and latest event)."""
+        filters = []
+        if item_id:
+            filters.append(SocialEvent.itemId == item_id)
+        if since is not None:
+            filters.append(SocialEvent.date >= since)
+
+        totals = await self.db.execute(
+            select(func.count(SocialEvent.id), func.min(SocialEvent.date), func.max(SocialEvent.date)).where(*filters)
+        )
+        count, first_date, last_date = totals.one()
+
+        by_type = await self.db.execute(
+            select(SocialEvent.type, func.count(SocialEvent.id)).where(*filters).group_by(SocialEvent.type)
+        )
+
+        latest = await self.db.execute(
+            select(SocialEvent).where(*filters).order_by(SocialEvent.date.desc()).limit(1)
+        )
+        latest_event = latest.scalars().first()
+
+        return {
+            "count": count,
+            "countByType": {event_type.value: n for event_type, n in by_type.all()},
+            "firstDate": first_date,
+            "lastDate": last_date,
+            "latest": {
+                "date": latest_event.date,
+                "title": latest_event.title,
+                "type": latest_event.type.value,
+            } if latest_event else None,
+        }
+
+    def _contact_events_filter(self, contact_id: UUID):
+        """`contact_ids @> ARRAY[:contact_id]`, served by the GIN index on contact_ids."""
+        return SocialEvent.contactIds.contains([str(contact_id)])
+
+    async def get_contact_events(
+        self,
+        contact_id: UUID,
+        limit: int = 50,
+        before: Optional[Tuple[int, UUID]] = None,
+    ) -> List[SocialEvent]:
+        """
+        Events a contact took part in, newest first. Keyset pagination:
+        `before` is the (date, id) of the last event of the previous page,
+        so deep pages cost the same as the first one.
+        """
+        query = (
+            select(SocialEvent)
+            .where(self._contact_events_filter(contact_id))
+            .order_by(SocialEvent.date.desc(), SocialEvent.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            query = query.where(tuple_(SocialEvent.date, SocialEvent.id) < tuple_(*before))
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_contact_interactions(self, contact_id: UUID) -> dict:
+        """Interaction summary of a contact (event count, first / last event date) in one query."""
+        result = await self.db.execute(
+            select(func.count(SocialEvent.id), func.min(SocialEvent.date), func.max(SocialEvent.date))
+            .where(self._contact_events_filter(contact_id))
+        )
+        count, first_date, last_date = result.one()
+        return {
+            "contactId": contact_id,
+            "count": count,
+            "firstEventDate": first_date,
+            "lastEventDate": last_date,
+        }
+
     async def get_event(self, event_id: UUID) -> Optional[SocialEvent]:
-        return await self.db.get(SocialEvent, event_id)
+        return await self.events_repo.get(event_id)
 
     async def create_event(self, event_in: SocialEventCreate) -> SocialEvent:
-        db_event = SocialEvent(**event_in.model_dump())
-        self.db.add(db_event)
-        await self.db.commit()
-        await self.db.refresh(db_event)
-        return db_event
+        return await self.events_repo.create(_contact_ids_as_strings(event_in.model_dump()))
 
     async def update_event(self, event_id: UUID, event_in: SocialEventUpdate) -> Optional[SocialEvent]:
-        db_event = await self.get_event(event_id)
-        if not db_event:
-            return None
-        
-        update_data = event_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_event, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_event)
-        return db_event
+        return await self.events_repo.update(event_id, _contact_ids_as_strings(event_in.model_dump(exclude_unset=True)))
 
     async def delete_event(self, event_id: UUID) -> bool:
-        db_event = await self.get_event(event_id)
-        if not db_event:
-            return False
-        await self.db.delete(db_event)
-        await self.db.commit()
-        return True
+        return await self.events_repo.delete(event_id)
 
     # Contacts
-    async def get_contacts(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100) -> List[Contact]:
-        query = select(Contact).offset(skip).limit(limit)
+    async def get_contacts(self, item_id: Optional[UUID] = None, skip: int = 0, limit: int = 100, since: Optional[int] = None) -> List[Contact]:
+        query = select(Contact).order_by(Contact.name).offset(skip).limit(limit)
         if item_id:
             query = query.filter(Contact.itemId == item_id)
+        if since is not None:
+            query = query.filter(Contact.lastContactDate >= since)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def get_contacts_summary(self, item_id: Optional[UUID] = None, since: Optional[int] = None) -> dict:
+        """Aggregate contacts in SQL (count, last-contact range and most recently contacted)."""
+        filters = []
+        if item_id:
+            filters.append(Contact.itemId == item_id)
+        if since is not None:
+            filters.append(Contact.lastContactDate >= since)
+
+        totals = await self.db.execute(
+            select(
+                func.count(Contact.id),
+                func.count(Contact.birthday),
+                func.min(Contact.lastContactDate),
+                func.max(Contact.lastContactDate),
+            ).where(*filters)
+        )
+        count, with_birthday, oldest_contact, latest_contact = totals.one()
+
+        latest = await self.db.execute(
+            select(Contact)
+            .where(*filters, Contact.lastContactDate.is_not(None))
+            .order_by(Contact.lastContactDate.desc())
+            .limit(1)
+        )
+        latest_contact_row = latest.scalars().first()
+
+        return {
+            "count": count,
+            "withBirthday": with_birthday,
+            "oldestLastContactDate": oldest_contact,
+            "latestLastContactDate": latest_contact,
+            "latest": {
+                "name": latest_contact_row.name,
+                "lastContactDate": latest_contact_row.lastContactDate,
+            } if latest_contact_row else None,
+        }
+
+    async def get_overdue_contacts(
+        self,
+        item_id: Optional[UUID] = None,
+        now: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Contact]:
+        """Contacts whose next contact is due (most overdue first), one range scan on next_contact_due."""
+        now = int(time.time() * 1000) if now is None else now
+        query = (
+            select(Contact)
+            .where(Contact.nextContactDue <= now)
+            .order_by(Contact.nextContactDue)
+            .offset(skip)
+            .limit(limit)
+        )
+        if item_id:
+            query = query.filter(Contact.itemId == item_id)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def get_upcoming_birthdays(
+        self,
+        days: int = 30,
+        item_id: Optional[UUID] = None,
+        now: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[dict]:
+        """
+        Contacts whose birthday falls within the next `days` days (soonest
+        first). The window is a range of birthday_day keys; when it crosses
+        the new year it becomes two ranges (>= start OR <= end), both served
+        by the birthday_day index.
+        """
+        today = _utc_date(int(time.time() * 1000) if now is None else now)
+        start = today.month * 100 + today.day
+        if days >= 365:
+            window = Contact.birthdayDay.is_not(None)
+        else:
+            last_day = today + timedelta(days=max(days, 0))
+            end = last_day.month * 100 + last_day.day
+            if start <= end:
+                window = Contact.birthdayDay.between(start, end)
+            else:
+                window = or_(Contact.birthdayDay >= start, Contact.birthdayDay <= end)
+
+        query = (
+            select(Contact)
+            .where(window)
+            .order_by(case((Contact.birthdayDay >= start, 0), else_=1), Contact.birthdayDay, Contact.name)
+            .limit(limit)
+        )
+        if item_id:
+            query = query.filter(Contact.itemId == item_id)
+        result = await self.db.execute(query)
+
+        upcoming = []
+        for contact in result.scalars().all():
+            occurrence = _next_occurrence(contact.birthdayDay, today)
+            upcoming.append({
+                "contact": contact,
+                "nextBirthday": int(datetime(occurrence.year, occurrence.month, occurrence.day, tzinfo=timezone.utc).timestamp() * 1000),
+                "daysUntil": (occurrence - today).days,
+            })
+        return upcoming
+
     async def get_contact(self, contact_id: UUID) -> Optional[Contact]:
-        return await self.db.get(Contact, contact_id)
+        return await self.contacts_repo.get(contact_id)
 
     async def create_contact(self, contact_in: ContactCreate) -> Contact:
-        db_contact = Contact(**contact_in.model_dump())
-        self.db.add(db_contact)
-        await self.db.commit()
-        await self.db.refresh(db_contact)
-        return db_contact
+        values = contact_in.model_dump()
+        return await self.contacts_repo.create({**values, **_reminder_columns(values)})
 
     async def update_contact(self, contact_id: UUID, contact_in: ContactUpdate) -> Optional[Contact]:
-        db_contact = await self.get_contact(contact_id)
-        if not db_contact:
-            return None
-        
-        update_data = contact_in.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_contact, key, value)
-            
-        await self.db.commit()
-        await self.db.refresh(db_contact)
-        return db_contact
+        values = contact_in.model_dump(exclude_unset=True)
+        return await self.contacts_repo.update(contact_id, {**values, **_reminder_columns(values)})
 
     async def delete_contact(self, contact_id: UUID) -> bool:
-        db_contact = await self.get_contact(contact_id)
-        if not db_contact:
-            return False
-        await self.db.delete(db_contact)
-        await self.db.commit()
-        return True
+        return await self.contacts_repo.delete(contact_id)
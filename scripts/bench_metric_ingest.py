@@ -0,0 +1,81 @@
+"""
+Load benchmark of the batched body metric ingest.
+
+Posts synthetic readings to POST /api/health/body-metrics/batch of a running
+server (one worker: `uvicorn app.server:app --workers 1`) from concurrent
+clients and reports the acknowledged readings per second.
+
+    python scripts/bench_metric_ingest.py --item-id <health item uuid> \
+        --readings 100000 --batch 200 --concurrency 32
+
+Target: several thousand readings per second on one worker. Each run uses
+new timestamps (starting from now), so no reading is deduplicated.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+
+async def run(args) -> None:
+    start_date = int(time.time() * 1000)
+    batches = [
+        [
+            {"itemId": args.item_id, "date": start_date + i, "weight": 70 + (i % 100) / 10}
+            for i in range(offset, min(offset + args.batch, args.readings))
+        ]
+        for offset in range(0, args.readings, args.batch)
+    ]
+    queue: asyncio.Queue = asyncio.Queue()
+    for batch in batches:
+        queue.put_nowait(batch)
+
+    latencies = []
+    rejected = 0
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal rejected
+        while not queue.empty():
+            batch = queue.get_nowait()
+            if args.ndjson:
+                content = "\n".join(json.dumps(reading) for reading in batch)
+                headers = {"Content-Type": "application/x-ndjson"}
+            else:
+                content, headers = json.dumps(batch), {"Content-Type": "application/json"}
+            sent = time.perf_counter()
+            response = await client.post("/api/health/body-metrics/batch", content=content, headers=headers)
+            if response.status_code == 429:
+                rejected += 1
+                queue.put_nowait(batch)
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+                continue
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - sent)
+
+    began = time.perf_counter()
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    print(f"{args.readings} readings in {len(batches)} requests, {elapsed:.2f}s")
+    print(f"Throughput: {args.readings / elapsed:.0f} readings/s")
+    print(
+        f"Request latency p50 {latencies[len(latencies) // 2] * 1000:.0f}ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f}ms"
+    )
+    if rejected:
+        print(f"{rejected} requests refused with 429 (backlog full) and retried")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--item-id", required=True, help="Health item the readings are attached to")
+    parser.add_argument("--readings", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=200, help="Readings per request")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--ndjson", action="store_true", help="Send NDJSON instead of JSON arrays")
+    asyncio.run(run(parser.parse_args()))
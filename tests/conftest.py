@@ -0,0 +1,76 @@
+"""
+Shared pytest configuration.
+
+The settings defaults are provided by tests/__init__.py, imported by pytest
+before this file. Engines are created lazily, no database connection is opened.
+"""
+import asyncio
+from contextlib import contextmanager
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import models  # noqa: F401  Register models with Base.metadata
+from app.core.database import Base, get_db
+from app.core.query_log import query_scope
+
+# Postgres-only column types (ARRAY) can't be created on SQLite
+SQLITE_SKIPPED_TABLES = {"social_events"}
+
+
+@pytest.fixture
+def max_queries():
+    """
+    Assert the SQL statements run in a block stay under a budget:
+
+        with max_queries(2):
+            client.get("/api/categories")
+    """
+    @contextmanager
+    def check(limit: int):
+        with query_scope("test") as scope:
+            yield scope
+        assert scope.count <= limit, (
+            f"{scope.count} statements (max {limit}):\n" + "\n".join(scope.statements)
+        )
+
+    return check
+
+
+@pytest.fixture
+def sqlite_sessionmaker(tmp_path):
+    """Session factory on a throwaway SQLite database with the app tables."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    tables = [t for name, t in Base.metadata.tables.items() if name not in SQLITE_SKIPPED_TABLES]
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+
+    asyncio.run(create())
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def api_client(sqlite_sessionmaker):
+    """
+    Build an async test client for the given routers on the SQLite database:
+
+        async with api_client((categories.router, "/api/categories")) as client: ...
+    """
+    def build(*routers):
+        app = FastAPI()
+        for router, prefix in routers:
+            app.include_router(router, prefix=prefix)
+
+        async def override_get_db():
+            async with sqlite_sessionmaker() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    return build
@@ -0,0 +1,148 @@
+"""
+Tests for admission control (agent / API concurrency pools, load shedding).
+"""
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.admission import (
+    AdmissionControlMiddleware,
+    AdmissionMetrics,
+    ConcurrencyPool,
+    route_template,
+)
+
+
+def _app(agent_pool, api_pool, metrics, release):
+    app = FastAPI()
+
+    @app.post("/run")
+    async def run():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/api/items/{item_id}")
+    async def read_item(item_id: str):
+        return {"id": item_id}
+
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        pools={"agent": agent_pool, "api": api_pool},
+        metrics=metrics,
+    )
+    return app
+
+
+def test_route_template_collapses_ids():
+    assert route_template("/api/items/3f2b1c9e-8d7a-4b6c-9e5f-1a2b3c4d5e6f") == "/api/items/{id}"
+    assert route_template("/api/alerts/42/deactivate") == "/api/alerts/{id}/deactivate"
+
+
+def test_agent_burst_is_shed_without_blocking_crud():
+    metrics = AdmissionMetrics()
+    agent_pool = ConcurrencyPool("agent", max_concurrent=1, max_queue=1, queue_timeout=5)
+    api_pool = ConcurrencyPool("api", max_concurrent=4, max_queue=4, queue_timeout=1)
+
+    async def main():
+        release = asyncio.Event()
+        app = _app(agent_pool, api_pool, metrics, release)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            running = asyncio.create_task(client.post("/run"))
+            queued = asyncio.create_task(client.post("/run"))
+            await asyncio.sleep(0.05)
+
+            shed = await client.post("/run")
+            crud = await client.get("/api/items/3f2b1c9e-8d7a-4b6c-9e5f-1a2b3c4d5e6f")
+
+            release.set()
+            return shed, crud, await running, await queued
+
+    shed, crud, running, queued = asyncio.run(main())
+    assert shed.status_code == 429
+    assert shed.headers["Retry-After"] == "5"
+    assert crud.status_code == 200
+    assert running.status_code == queued.status_code == 200
+
+    run_stats = metrics.routes[("agent", "POST", "/run")]
+    assert run_stats.count == 2
+    assert run_stats.rejected == {"queue_full": 1}
+    assert ("api", "GET", "/api/items/{item_id}") in metrics.routes
+
+
+def test_unknown_paths_share_one_metrics_entry():
+    metrics = AdmissionMetrics()
+
+    async def main():
+        app = _app(ConcurrencyPool("agent", 1, 1, 1), ConcurrencyPool("api", 4, 4, 1), metrics, asyncio.Event())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            for path in ("/wp-login.php", "/.env", "/apps/demo/users/u1/sessions"):
+                assert (await client.get(path)).status_code == 404
+            assert (await client.delete("/api/items/abc")).status_code == 405
+
+    asyncio.run(main())
+    assert set(metrics.routes) == {
+        ("api", "GET", "<unmatched>"),
+        ("api", "DELETE", "/api/items/{item_id}"),
+    }
+
+
+def test_queue_timeout_returns_503():
+    pool = ConcurrencyPool("agent", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+
+    async def main():
+        release = asyncio.Event()
+        app = _app(pool, ConcurrencyPool("api", 1, 1, 1), AdmissionMetrics(), release)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            running = asyncio.create_task(client.post("/run"))
+            await asyncio.sleep(0.02)
+            timed_out = await client.post("/run")
+            release.set()
+            await running
+            return timed_out
+
+    response = asyncio.run(main())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert pool.active == 0 and pool.waiting == 0
+
+
+def test_permit_granted_as_the_waiter_gives_up_goes_back_to_the_pool():
+    pool = ConcurrencyPool("agent", max_concurrent=1, max_queue=1, queue_timeout=5)
+
+    async def main():
+        await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)  # Queued on the semaphore
+        pool.release()  # Grants the permit to the waiter...
+        waiter.cancel()  # ...which is cancelled before it resumes
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        await asyncio.wait_for(pool.acquire(), timeout=1)  # The permit is free again
+        pool.release()
+
+    asyncio.run(main())
+    assert pool.active == 0 and pool.waiting == 0
+    assert not pool._semaphore.locked()
+
+
+def test_change_feed_bypasses_the_pools():
+    metrics = AdmissionMetrics()
+    api_pool = ConcurrencyPool("api", max_concurrent=1, max_queue=0, queue_timeout=1)
+
+    async def main():
+        app = FastAPI()
+
+        @app.get("/api/events")
+        async def events():
+            return {"ok": True}
+
+        app.add_middleware(AdmissionControlMiddleware, pools={"agent": api_pool, "api": api_pool}, metrics=metrics)
+        await api_pool.acquire()  # Pool saturated
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get("/api/events")
+
+    assert asyncio.run(main()).status_code == 200
+    assert metrics.routes == {}
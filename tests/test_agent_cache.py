@@ -0,0 +1,38 @@
+"""
+Tests for the cached agent instructions and tool declarations.
+"""
+from agents.prompts import get_system_instruction, load_prompt
+from agents.tools.cached import CachedAgentTool, CachedFunctionTool, cached_tools
+from agents.tools.finance_tools import get_finance_history
+from agents.sub_agents import alerts_agent, finance_agent, health_agent, social_agent
+
+
+def test_prompts_are_read_once():
+    load_prompt.cache_clear()
+    get_system_instruction()
+    get_system_instruction()
+    info = load_prompt.cache_info()
+    assert info.misses == 1 and info.hits == 1
+
+
+def test_function_declaration_is_built_once():
+    [tool] = cached_tools([get_finance_history])
+    first = tool._get_declaration()
+    assert isinstance(tool, CachedFunctionTool)
+    assert first.name == "get_finance_history"
+    assert tool._get_declaration() is first
+
+
+def test_agent_tool_declaration_is_built_once():
+    tool = CachedAgentTool(agent=finance_agent)
+    assert tool._get_declaration() is tool._get_declaration()
+
+
+def test_sub_agents_use_cached_tools():
+    assert all(isinstance(tool, CachedFunctionTool) for tool in finance_agent.tools)
+
+
+def test_sub_agents_declare_each_tool_once():
+    for agent in (alerts_agent, finance_agent, health_agent, social_agent):
+        names = [tool.name for tool in agent.tools]
+        assert len(names) == len(set(names)), agent.name
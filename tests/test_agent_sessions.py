@@ -0,0 +1,65 @@
+"""
+Tests for bounded agent session storage (token-gated compaction + pruning).
+"""
+import asyncio
+
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions, EventCompaction
+from google.genai import types
+
+from agents.sessions import BoundedDatabaseSessionService, TokenThresholdSummarizer
+
+
+def _text_event(invocation_id, timestamp, text="bonjour"):
+    return Event(
+        invocation_id=invocation_id,
+        author="user",
+        timestamp=timestamp,
+        content=types.Content(role="user", parts=[types.Part(text=text)]),
+    )
+
+
+def _compaction_event(start, end, timestamp):
+    return Event(
+        invocation_id=f"compaction-{timestamp}",
+        author="user",
+        timestamp=timestamp,
+        actions=EventActions(compaction=EventCompaction(
+            start_timestamp=start,
+            end_timestamp=end,
+            compacted_content=types.Content(role="model", parts=[types.Part(text="résumé")]),
+        )),
+    )
+
+
+class TestTokenThresholdSummarizer:
+    def test_short_history_is_not_summarized(self):
+        summarizer = TokenThresholdSummarizer(llm=None, threshold_tokens=1000)
+        events = [_text_event("inv-1", 1.0)]
+        assert asyncio.run(summarizer.maybe_summarize_events(events=events)) is None
+
+
+class TestBoundedDatabaseSessionService:
+    def test_compaction_prunes_covered_events_and_old_summaries(self, tmp_path):
+        service = BoundedDatabaseSessionService(
+            f"sqlite+aiosqlite:///{tmp_path / 'sessions.db'}", max_summaries=1
+        )
+
+        async def main():
+            session = await service.create_session(app_name="agents", user_id="u1")
+            for ts, event in [
+                (1.0, _text_event("inv-1", 1.0)),
+                (2.0, _text_event("inv-2", 2.0)),
+                (3.0, _compaction_event(1.0, 2.0, 3.0)),
+                (4.0, _text_event("inv-3", 4.0)),
+                (5.0, _compaction_event(2.0, 4.0, 5.0)),
+            ]:
+                await service.append_event(session, event)
+            stored = await service.get_session(app_name="agents", user_id="u1", session_id=session.id)
+            return session, stored
+
+        session, stored = asyncio.run(main())
+        # inv-1 is covered by the first summary, which is superseded by the second
+        expected = ["inv-2", "inv-3", "compaction-5.0"]
+        assert [e.invocation_id for e in session.events] == expected
+        assert [e.invocation_id for e in stored.events] == expected
@@ -0,0 +1,83 @@
+"""
+Tests for the agent turn tracing plugin (spans, token usage, SQL counters).
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from agents.plugins import tracing
+from agents.plugins.tracing import JsonFileSpanExporter, TurnTracingPlugin
+
+exporter = InMemorySpanExporter()
+_provider = TracerProvider()
+_provider.add_span_processor(SimpleSpanProcessor(exporter))
+tracing.tracer = _provider.get_tracer("test")
+
+
+def _invocation(invocation_id="inv-1"):
+    return SimpleNamespace(
+        invocation_id=invocation_id,
+        agent=SimpleNamespace(name="life_agent"),
+        session=SimpleNamespace(id="session-1"),
+    )
+
+
+def _run_turn(plugin, tool_result, sql_statements=0):
+    inv = _invocation()
+    callback_ctx = SimpleNamespace(invocation_id=inv.invocation_id, agent_name="life_agent")
+    tool_ctx = SimpleNamespace(invocation_id=inv.invocation_id, function_call_id="call-1", agent_name="life_agent")
+    tool = SimpleNamespace(name="get_finance_history")
+    usage = SimpleNamespace(prompt_token_count=1200, candidates_token_count=80, cached_content_token_count=0)
+
+    async def main():
+        await plugin.before_run_callback(invocation_context=inv)
+        await plugin.before_model_callback(callback_context=callback_ctx, llm_request=SimpleNamespace(model="gemini"))
+        await plugin.after_model_callback(
+            callback_context=callback_ctx, llm_response=SimpleNamespace(partial=False, usage_metadata=usage)
+        )
+        await plugin.before_tool_callback(tool=tool, tool_args={}, tool_context=tool_ctx)
+        for _ in range(sql_statements):
+            tracing._trace_statement(None, "SELECT 1", {}, False, 0.002)
+        await plugin.after_tool_callback(tool=tool, tool_args={}, tool_context=tool_ctx, result=tool_result)
+        await plugin.after_run_callback(invocation_context=inv)
+
+    asyncio.run(main())
+
+
+class TestTurnTracingPlugin:
+    def test_spans_carry_tokens_rows_and_sql(self):
+        exporter.clear()
+        _run_turn(TurnTracingPlugin(), {"status": "success", "count": 3, "history": [{}, {}, {}]}, sql_statements=2)
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert set(spans) == {"agent.turn", "model.call", "tool.call", "db.statement"}
+
+        turn, model, tool = spans["agent.turn"], spans["model.call"], spans["tool.call"]
+        assert model.attributes["gen_ai.usage.input_tokens"] == 1200
+        assert tool.attributes["tool.rows"] == 3
+        assert tool.attributes["tool.sql_count"] == 2
+        assert tool.attributes["tool.payload_bytes"] > 0
+        assert turn.attributes["turn.sql_count"] == 2
+        assert tool.parent.span_id == turn.context.span_id
+
+    def test_sql_outside_tools_is_ignored(self):
+        exporter.clear()
+        tracing._trace_statement(None, "SELECT 1", {}, False, 0.002)
+        assert exporter.get_finished_spans() == ()
+
+
+class TestJsonFileSpanExporter:
+    def test_writes_one_json_line_per_span(self, tmp_path):
+        exporter.clear()
+        _run_turn(TurnTracingPlugin(), {"status": "success"})
+
+        path = tmp_path / "traces.jsonl"
+        JsonFileSpanExporter(str(path)).export(exporter.get_finished_spans())
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert {line["name"] for line in lines} == {"agent.turn", "model.call", "tool.call"}
+        assert all(line["duration_ms"] >= 0 for line in lines)
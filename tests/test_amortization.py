@@ -0,0 +1,76 @@
+"""
+Tests for the loan amortization engine and the equity endpoints.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.api.endpoints import real_estate
+from app.services.amortization import compute_schedule
+
+
+def _ms(year, month, day=1):
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class TestSchedule:
+    def test_annuity_schedule(self):
+        schedule = compute_schedule(200_000.0, 3.6, 240, _ms(2024, 1, 1))
+
+        assert round(schedule.monthly_payment, 2) == 1170.22
+        assert np.allclose(schedule.payments, schedule.monthly_payment)
+        assert np.isclose(schedule.principal_paid.sum(), 200_000)
+        assert schedule.balance[-1] == 0 and np.all(np.diff(schedule.balance) < 0)
+        assert round(schedule.interest[0], 2) == 600.0  # 200 000 x 0.3 %
+
+    def test_zero_rate_and_memoization(self):
+        schedule = compute_schedule(12_000.0, 0.0, 12, _ms(2024, 1, 1))
+
+        assert schedule.monthly_payment == 1000 and schedule.total_interest == 0
+        assert compute_schedule(12_000.0, 0.0, 12, _ms(2024, 1, 1)) is schedule
+
+    def test_due_dates_and_balance_at(self):
+        schedule = compute_schedule(3_000.0, 0.0, 3, _ms(2024, 1, 31))
+        due = [datetime.fromtimestamp(d / 1000, timezone.utc).date().isoformat() for d in schedule.due_dates]
+
+        assert due == ["2024-02-29", "2024-03-31", "2024-04-30"]
+        assert schedule.balance_at([_ms(2024, 1, 31), _ms(2024, 2, 29), _ms(2030, 1, 1)]).tolist() == [3000, 2000, 0]
+
+
+class TestAmortizationEndpoints:
+    def test_amortization_and_equity(self, api_client):
+        item_id = str(uuid.uuid4())
+        with_loan = {
+            "itemId": item_id, "estimatedValue": 300_000, "purchasePrice": 250_000, "purchaseDate": _ms(2024, 1, 1),
+            "loanAmount": 12_000, "loanInterestRate": 0, "loanStartDate": _ms(2024, 1, 1), "loanDurationMonths": 12,
+        }
+        without_loan = {"itemId": item_id, "estimatedValue": 100_000, "purchasePrice": 80_000, "purchaseDate": _ms(2010, 1, 1)}
+
+        async def run():
+            async with api_client((real_estate.router, "/api/real-estate")) as client:
+                valuation = (await client.post("/api/real-estate/valuations", json=with_loan)).json()
+                paid_off = (await client.post("/api/real-estate/valuations", json=without_loan)).json()
+                amortization = await client.get(
+                    f"/api/real-estate/valuations/{valuation['id']}/amortization", params={"at": _ms(2024, 7, 1)},
+                )
+                no_loan = await client.get(f"/api/real-estate/valuations/{paid_off['id']}/amortization")
+                missing = await client.get(f"/api/real-estate/valuations/{uuid.uuid4()}/amortization")
+                equity = await client.get("/api/real-estate/valuations/equity", params={"at": _ms(2024, 7, 1)})
+                return amortization.json(), no_loan.json(), missing, equity.json()
+
+        amortization, no_loan, missing, equity = asyncio.run(run())
+
+        assert len(amortization["schedule"]) == 12
+        assert amortization["remainingPrincipal"] == 6000 and amortization["capitalRepaid"] == 6000
+        assert amortization["equity"] == 294_000
+        assert amortization["schedule"][0]["equity"] == 289_000
+
+        assert no_loan["schedule"] == [] and no_loan["equity"] == 100_000
+        assert missing.status_code == 404
+
+        assert equity["totalEquity"] == 394_000 and equity["totalOutstandingPrincipal"] == 6000
+        assert len(equity["curve"]) == 13  # Jan 2024 .. Jan 2025
+        assert equity["curve"][0]["outstandingPrincipal"] == 12_000
+        assert equity["curve"][-1]["equity"] == 400_000
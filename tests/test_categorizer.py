@@ -0,0 +1,188 @@
+"""
+Tests for the spending categorizer of history entries.
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.api.endpoints import finance, items
+from app.core.config import settings
+from app.services.categorizer import (
+    CategorizerModel, TransactionCategorizer, categorizer, normalize_label, retrain_scheduler, rule_category,
+)
+
+
+@pytest.fixture(autouse=True)
+def model_path(tmp_path, monkeypatch):
+    path = tmp_path / "categorizer.npz"
+    monkeypatch.setattr(settings, "CATEGORIZER_MODEL_PATH", str(path))
+    monkeypatch.setattr(settings, "CATEGORIZER_RETRAIN_DELAY", 0)
+    monkeypatch.setattr(settings, "CATEGORIZER_RELOAD_INTERVAL", 0)
+    return path
+
+
+def test_normalize_and_rules():
+    assert normalize_label("CB CARREFOUR 12/03 Évry") == "cb carrefour evry"
+    assert rule_category("cb carrefour evry") == "groceries"
+    assert rule_category("uber eats paris") == "restaurants"
+    assert rule_category("uber trip") == "transport"
+    assert rule_category("prlv totalenergies") == "utilities"
+    assert rule_category("taxidermie") is None  # Whole words only ("taxi")
+    assert rule_category("prlv sepa orange sa") == rule_category("prlv eau de paris") == "utilities"
+    assert rule_category("cb geant casino") == "groceries"
+    assert rule_category("cb total access lyon") == "transport"
+    assert rule_category("vir sepa m dupont") == "transfer"
+
+
+@pytest.mark.parametrize("label", [
+    "cb bar le duc",  # Town, not a bar
+    "cb resto du coeur don",
+    "cb eau de toilette sephora",
+    "cb total fitness",
+    "cb station f paris",
+    "cb orange bleue",  # Gym chain
+    "cb casino barriere",
+    "cb canal saint martin",
+    "cb free now",
+    "prlv vir club",
+])
+def test_common_words_are_not_rules(label):
+    assert rule_category(normalize_label(label)) is None
+
+
+def test_model_learns_unknown_merchants():
+    model = CategorizerModel.fit(
+        ["PRLV ZOOPLUS 0412", "ANIMALIS PARIS", "CB PIZZERIA NAPOLI", "CB LA TAVERNA"],
+        ["pets", "pets", "restaurants", "restaurants"],
+    )
+    best, scores = model.predict([normalize_label("CB ZOOPLUS 1205"), normalize_label("PIZZERIA DA LUIGI"), ""])
+    assert [model.classes[index] for index in best[:2]] == ["pets", "restaurants"]
+    assert scores[0] > settings.CATEGORIZER_MIN_SCORE and scores[2] == 0
+
+
+def test_categorize_precedence_and_reload(model_path):
+    categorizer.train(["CARREFOUR CITY RESTAURATION"], ["restaurants"])
+    assert categorizer.categorize(["CARREFOUR CITY RESTAURATION", "LIDL", "XYZ 123"]) == [
+        ("restaurants", "model"),  # The user's correction wins over the rule
+        ("groceries", "rule"),
+        (None, None),
+    ]
+    # Another worker loads the persisted model
+    assert TransactionCategorizer().categorize(["CARREFOUR CITY RESTAURATION"]) == [("restaurants", "model")]
+
+    categorizer.train([], [])
+    assert not model_path.exists()
+    assert categorizer.categorize(["CARREFOUR CITY RESTAURATION"]) == [("groceries", "rule")]
+
+
+def test_model_file_is_checked_at_most_every_reload_interval(monkeypatch):
+    monkeypatch.setattr(settings, "CATEGORIZER_RELOAD_INTERVAL", 60)
+    worker = TransactionCategorizer()
+    assert worker.categorize(["CARREFOUR CITY RESTAURATION"]) == [("groceries", "rule")]
+
+    categorizer.train(["CARREFOUR CITY RESTAURATION"], ["restaurants"])  # Another worker retrains
+    stats = []
+    stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda path, *args, **kwargs: stats.append(path) or stat(path, *args, **kwargs))
+    for _ in range(3):
+        assert worker.categorize(["CARREFOUR CITY RESTAURATION"]) == [("groceries", "rule")]
+    assert stats == []
+
+    monkeypatch.setattr(settings, "CATEGORIZER_RELOAD_INTERVAL", 0)
+    assert worker.categorize(["CARREFOUR CITY RESTAURATION"]) == [("restaurants", "model")]
+
+
+def test_batch_of_thousands():
+    labels = [f"CB MERCHANT{i % 300} {i}" for i in range(3000)]
+    categorizer.train(labels, [f"category{i % 12}" for i in range(3000)])
+    began = time.perf_counter()
+    results = categorizer.categorize(labels)
+    assert time.perf_counter() - began < 1
+    assert len(results) == 3000
+
+
+def test_corrections_import_and_backfill(api_client, model_path):
+    def entry(item_id, label, **fields):
+        return {"itemId": item_id, "date": 1700000000000, "value": -20, "label": label, "category": "expense", **fields}
+
+    async def run():
+        async with api_client((items.router, "/api/items"), (finance.router, "/api/finance")) as client:
+            account = (await client.post("/api/items", json={
+                "name": "Compte courant", "value": "0", "type": "currency", "status": "ok",
+            })).json()
+            first = (await client.post("/api/finance/history", json=entry(account["id"], "PRLV ZOOPLUS 0412"))).json()
+            second = (await client.post("/api/finance/history", json=entry(account["id"], "ZOOPLUS FR 0512"))).json()
+            groceries = (await client.post("/api/finance/history", json=entry(account["id"], "CB LIDL 12/03"))).json()
+
+            corrected = (await client.put(f"/api/finance/history/{first['id']}", json={"spendingCategory": " Pets "})).json()
+            await retrain_scheduler.drain()
+            model_trained = model_path.exists()
+
+            imported = (await client.post("/api/finance/history/import", json=[
+                entry(account["id"], "CB ZOOPLUS 0612"),
+                entry(account["id"], "SNCF INTERNET"),
+                entry(account["id"], "XYZ 123"),
+                entry(account["id"], "VETO DU PARC", spendingCategory="pets"),
+            ])).json()
+            await retrain_scheduler.drain()
+            backfill = (await client.post("/api/finance/history/categorize")).json()
+            pets = (await client.get("/api/finance/history", params={"spending_category": "pets"})).json()
+            refreshed_second = (await client.get(f"/api/finance/history/{second['id']}")).json()
+
+            await client.put(f"/api/finance/history/{first['id']}", json={"label": "PRLV ZOOPLUS"})
+            label_change = (await client.get(f"/api/finance/history/{first['id']}")).json()
+            renamed = (await client.put(f"/api/finance/history/{groceries['id']}", json={"label": "SNCF 0413"})).json()
+            return first, second, groceries, corrected, model_trained, imported, backfill, pets, refreshed_second, label_change, renamed
+
+    (first, second, groceries, corrected, model_trained, imported, backfill,
+     pets, refreshed_second, label_change, renamed) = asyncio.run(run())
+
+    assert (first["spendingCategory"], first["categorySource"]) == (None, None)
+    assert (second["spendingCategory"], second["categorySource"]) == (None, None)
+    assert (groceries["spendingCategory"], groceries["categorySource"]) == ("groceries", "rule")
+    assert (corrected["spendingCategory"], corrected["categorySource"]) == ("pets", "user")
+    assert model_trained
+
+    assert imported == {"importedCount": 4, "categorizedCount": 3}
+    # "ZOOPLUS FR" was stored before the correction; "XYZ 123" stays uncategorized
+    assert backfill == {"categorizedCount": 1, "uncategorizedCount": 1}
+    assert (refreshed_second["spendingCategory"], refreshed_second["categorySource"]) == ("pets", "model")
+    assert sorted(entry["label"] for entry in pets) == ["CB ZOOPLUS 0612", "PRLV ZOOPLUS 0412", "VETO DU PARC", "ZOOPLUS FR 0512"]
+
+    # A hand-set category survives a label change; a derived one follows the label
+    assert (label_change["spendingCategory"], label_change["categorySource"]) == ("pets", "user")
+    assert (renamed["spendingCategory"], renamed["categorySource"]) == ("transport", "rule")
+
+
+def test_corrections_retrain_once_in_the_background(api_client, monkeypatch):
+    calls = []
+
+    def failing_train(labels, categories):
+        calls.append(list(categories))
+        raise OSError("Read-only file system")
+
+    monkeypatch.setattr(categorizer, "train", failing_train)
+    monkeypatch.setattr(settings, "CATEGORIZER_RETRAIN_DELAY", 0.5)
+
+    async def run():
+        async with api_client((items.router, "/api/items"), (finance.router, "/api/finance")) as client:
+            account = (await client.post("/api/items", json={
+                "name": "Compte courant", "value": "0", "type": "currency", "status": "ok",
+            })).json()
+            responses = [
+                await client.post("/api/finance/history", json={
+                    "itemId": account["id"], "date": 1700000000000 + i, "value": -20, "label": f"CB BOUTIQUE {i}",
+                    "category": "expense", "spendingCategory": "shopping",
+                })
+                for i in range(3)
+            ]
+            trained_inline = list(calls)
+            await retrain_scheduler.drain()
+            return [response.status_code for response in responses], trained_inline
+
+    statuses, trained_inline = asyncio.run(run())
+    assert statuses == [201, 201, 201]  # The failed retrain never reaches the client
+    assert trained_inline == []
+    assert calls == [["shopping"] * 3]  # One retrain for the burst of corrections
@@ -0,0 +1,141 @@
+"""
+Tests for the change feed (publish on commit, bounded buffers, SSE stream).
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.api.endpoints import events, items
+from app.core.change_feed import OVERFLOW_EVENT, ChangeFeed, change_feed, queue_event
+from app.models import LifeItem
+
+
+@pytest.fixture
+def subscriber():
+    subscriber = change_feed.subscribe()
+    yield subscriber
+    subscriber.close()
+
+
+def _drain(subscriber):
+    drained = []
+    while not subscriber.queue.empty():
+        drained.append(subscriber.queue.get_nowait())
+    return drained
+
+
+class TestPublishOnCommit:
+    def test_events_wait_for_commit_and_drop_on_rollback(self, sqlite_sessionmaker, subscriber):
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                queue_event(session, "item.updated", "a")
+                before_commit = subscriber.queue.qsize()
+                await session.commit()
+                after_commit = [e.type for e in _drain(subscriber)]
+
+                session.add(LifeItem(name="x", value="0", type="text"))
+                await session.flush()
+                queue_event(session, "item.created", "b")
+                await session.rollback()
+                await session.commit()
+                return before_commit, after_commit, _drain(subscriber)
+
+        before_commit, after_commit, after_rollback = asyncio.run(run())
+        assert before_commit == 0
+        assert after_commit == ["item.updated"]
+        assert after_rollback == []
+
+    def test_agent_and_api_writes_are_published(self, api_client, subscriber):
+        async def run():
+            async with api_client((items.router, "/api/items")) as client:
+                created = (await client.post(
+                    "/api/items", json={"name": "Vélo", "value": "300", "type": "currency", "status": "ok"},
+                )).json()
+                await client.delete(f"/api/items/{created['id']}")
+                return created
+
+        created = asyncio.run(run())
+        published = _drain(subscriber)
+        assert [(e.type, e.entityId) for e in published] == [
+            ("item.created", created["id"]),
+            ("item.deleted", created["id"]),
+        ]
+        assert published[0].data["name"] == "Vélo"
+
+
+class TestBackpressure:
+    def test_overflow_replaces_backlog(self):
+        async def run():
+            feed = ChangeFeed()
+            subscriber = feed.subscribe(buffer_size=3)
+            for i in range(5):
+                feed.publish("history.added", i)
+            return subscriber, _drain(subscriber)
+
+        subscriber, received = asyncio.run(run())
+        assert [(e.type, e.entityId) for e in received] == [(OVERFLOW_EVENT, None), ("history.added", "4")]
+        assert received[0].data == {"dropped": 4}
+        assert subscriber.dropped == 4
+
+    def test_type_filters(self):
+        async def run():
+            feed = ChangeFeed()
+            by_prefix = feed.subscribe(types=["item"])
+            exact = feed.subscribe(types=["history.added"])
+            for event_type in ("item.created", "history.added", "history.deleted", "island.updated"):
+                feed.publish(event_type)
+            return [e.type for e in _drain(by_prefix)], [e.type for e in _drain(exact)]
+
+        assert asyncio.run(run()) == (["item.created"], ["history.added"])
+
+
+class TestStream:
+    def test_sse_stream(self, monkeypatch):
+        monkeypatch.setattr(events.settings, "CHANGE_FEED_HEARTBEAT", 0.01)
+
+        class Request:
+            async def is_disconnected(self):
+                return False
+
+        async def run():
+            response = await events.stream_events(Request(), types=["island"])
+            body = response.body_iterator
+            chunks = [await body.__anext__()]
+            change_feed.publish("item.updated", "ignored")
+            change_feed.publish("island.created", "abc", {"name": "Garage"})
+            chunks.append(await body.__anext__())
+            subscribers = len(change_feed.subscribers)
+            await body.aclose()
+            return response, chunks, subscribers
+
+        response, chunks, subscribers = asyncio.run(run())
+        assert response.media_type == "text/event-stream"
+        assert chunks[0].startswith("retry:")
+        lines = chunks[1].strip().split("\n")
+        assert lines[1] == "event: island.created"
+        payload = json.loads(lines[2][len("data: "):])
+        assert (payload["type"], payload["entityId"], payload["data"]) == ("island.created", "abc", {"name": "Garage"})
+        assert subscribers == 1
+        assert change_feed.subscribers == set()
+
+    def test_subscriber_released_when_client_leaves_before_the_stream(self):
+        class Request:
+            async def is_disconnected(self):
+                return True
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("Connection reset by peer")
+
+        async def run():
+            response = await events.stream_events(Request(), types=None)
+            subscribed = len(change_feed.subscribers)
+            with pytest.raises(Exception):
+                await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+            return subscribed
+
+        assert asyncio.run(run()) == 1
+        assert change_feed.subscribers == set()
@@ -0,0 +1,85 @@
+"""
+Tests for the events-of-a-contact queries (array containment + keyset pagination).
+
+social_events uses a Postgres ARRAY column, absent from the SQLite test
+database: the statements are checked as compiled for Postgres.
+"""
+import asyncio
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.social import SocialEvent
+from app.schemas.social import SocialEventCreate
+from app.services.social_service import SocialService, decode_event_cursor, encode_event_cursor
+
+
+class _Result:
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+    def one(self):
+        return 0, None, None
+
+
+class _RecordingSession:
+    """Captures the statements the service would run."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result()
+
+
+def _sql(statement) -> str:
+    return " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+
+
+class TestContactEvents:
+    def test_contact_events_use_containment_and_keyset(self):
+        session = _RecordingSession()
+        contact_id, last_id = uuid.uuid4(), uuid.uuid4()
+
+        async def run():
+            service = SocialService(session)
+            await service.get_contact_events(contact_id, limit=10, before=(1_700_000_000_000, last_id))
+            await service.get_contact_interactions(contact_id)
+
+        asyncio.run(run())
+        page, summary = (_sql(statement) for statement in session.statements)
+
+        assert "social_events.contact_ids @> %(contact_ids_1)s" in page
+        assert "(social_events.date, social_events.id) < (%(param_1)s, %(param_2)s::UUID)" in page
+        assert "ORDER BY social_events.date DESC, social_events.id DESC" in page
+        assert "count(social_events.id)" in summary and "social_events.contact_ids @>" in summary
+
+    def test_cursor_round_trip(self):
+        event = SocialEvent(id=uuid.uuid4(), date=1_700_000_000_000)
+
+        assert decode_event_cursor(encode_event_cursor(event)) == (event.date, event.id)
+
+    def test_contact_ids_stored_as_strings(self):
+        contact_id = uuid.uuid4()
+        created = {}
+
+        class Repo:
+            async def create(self, values):
+                created.update(values)
+
+        service = SocialService(_RecordingSession())
+        service.events_repo = Repo()
+        asyncio.run(service.create_event(SocialEventCreate(
+            itemId=uuid.uuid4(), title="Dîner", date=0, type="dinner", contactIds=[contact_id],
+        )))
+
+        assert created["contactIds"] == [str(contact_id)]
+
+    def test_gin_index_declared(self):
+        index = next(i for i in SocialEvent.__table__.indexes if i.name == "ix_social_events_contact_ids")
+
+        assert index.dialect_options["postgresql"]["using"] == "gin"
@@ -0,0 +1,117 @@
+"""
+Tests for the contact reminder columns and queries (overdue contacts, upcoming birthdays).
+"""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.api.endpoints import social
+from app.models.social import Contact
+from app.schemas.social import ContactCreate, ContactUpdate
+from app.services.social_service import DAY_MS, SocialService, _reminder_columns
+
+ITEM_ID = uuid.uuid4()
+
+
+def _ms(year, month, day):
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class TestContactReminders:
+    def test_next_contact_due_maintained_on_write(self, sqlite_sessionmaker):
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                service = SocialService(session)
+                contact = await service.create_contact(ContactCreate(
+                    itemId=ITEM_ID, name="Paul", lastContactDate=_ms(2026, 1, 1), contactFrequencyDays=10,
+                ))
+                created = contact.nextContactDue
+                # Only the frequency changes: the UPDATE reads the stored last contact date
+                updated = (await service.update_contact(contact.id, ContactUpdate(contactFrequencyDays=30))).nextContactDue
+                cleared = (await service.update_contact(contact.id, ContactUpdate(lastContactDate=None))).nextContactDue
+                return created, updated, cleared
+
+        created, updated, cleared = asyncio.run(run())
+
+        assert created == _ms(2026, 1, 1) + 10 * DAY_MS
+        assert updated == _ms(2026, 1, 1) + 30 * DAY_MS
+        assert cleared is None
+
+    def test_next_contact_due_from_new_last_contact(self, sqlite_sessionmaker):
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                service = SocialService(session)
+                contact = await service.create_contact(ContactCreate(itemId=ITEM_ID, name="Paul", contactFrequencyDays=90))
+                return (await service.update_contact(contact.id, ContactUpdate(lastContactDate=_ms(2026, 1, 1)))).nextContactDue
+
+        assert asyncio.run(run()) == _ms(2026, 1, 1) + 90 * DAY_MS
+
+    def test_next_contact_due_is_computed_in_bigint_on_postgres(self):
+        for values in ({"lastContactDate": _ms(2026, 1, 1)}, {"contactFrequencyDays": 90}):
+            statement = update(Contact).values(**values, **_reminder_columns(values))
+            sql = str(statement.compile(dialect=asyncpg.dialect()))
+            next_due = sql.split("next_contact_due=", 1)[1]
+
+            # An INTEGER operand would make Postgres compute the sum in int4 and overflow
+            assert "INTEGER" not in next_due, sql
+
+    def test_overdue_contacts(self, sqlite_sessionmaker, max_queries):
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                service = SocialService(session)
+                for name, last, frequency in (
+                    ("Late", _ms(2026, 1, 1), 30),
+                    ("Very late", _ms(2025, 6, 1), 30),
+                    ("On time", _ms(2026, 3, 1), 30),
+                    ("No frequency", _ms(2025, 1, 1), None),
+                ):
+                    await service.create_contact(ContactCreate(
+                        itemId=ITEM_ID, name=name, lastContactDate=last, contactFrequencyDays=frequency,
+                    ))
+                with max_queries(1):
+                    return await service.get_overdue_contacts(now=_ms(2026, 3, 10))
+
+        overdue = asyncio.run(run())
+
+        assert [c.name for c in overdue] == ["Very late", "Late"]
+
+    def test_upcoming_birthdays_wrap_around_new_year(self, sqlite_sessionmaker, max_queries):
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                service = SocialService(session)
+                for name, birthday in (
+                    ("January", _ms(1985, 1, 5)),
+                    ("Christmas", _ms(1990, 12, 25)),
+                    ("March", _ms(2000, 3, 1)),
+                    ("Early December", _ms(1970, 12, 1)),
+                    ("Today", _ms(1962, 12, 20)),
+                ):
+                    await service.create_contact(ContactCreate(itemId=ITEM_ID, name=name, birthday=birthday))
+                with max_queries(1):
+                    return await service.get_upcoming_birthdays(days=30, now=_ms(2026, 12, 20) + 3600_000)
+
+        upcoming = asyncio.run(run())
+
+        assert [(b["contact"].name, b["daysUntil"]) for b in upcoming] == [
+            ("Today", 0), ("Christmas", 5), ("January", 16),
+        ]
+        assert upcoming[2]["nextBirthday"] == _ms(2027, 1, 5)
+
+    def test_reminder_routes_not_shadowed_by_contact_id(self, api_client):
+        async def run():
+            async with api_client((social.router, "/api/social")) as client:
+                await client.post("/api/social/contacts", json={
+                    "itemId": str(ITEM_ID), "name": "Paul", "lastContactDate": 0, "contactFrequencyDays": 7,
+                })
+                overdue = await client.get("/api/social/contacts/overdue")
+                birthdays = await client.get("/api/social/contacts/birthdays/upcoming", params={"days": 7})
+                return overdue, birthdays
+
+        overdue, birthdays = asyncio.run(run())
+
+        assert overdue.status_code == 200
+        assert [(c["name"], c["nextContactDue"]) for c in overdue.json()] == [("Paul", 7 * DAY_MS)]
+        assert birthdays.status_code == 200 and birthdays.json() == []
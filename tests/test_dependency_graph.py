@@ -0,0 +1,134 @@
+"""
+Tests for the dependency graph index, the recursive CTE traversal and the graph endpoints.
+"""
+import asyncio
+
+import pytest
+
+from app.api.endpoints import dependencies
+from app.models import Category, Dependency, LifeItem
+from app.schemas.dependencies import DependencyCreate
+from app.services.dependency_graph import DependencyGraph, dependency_graph, traverse_cold
+from app.services.dependency_service import DependencyService
+
+
+@pytest.fixture(autouse=True)
+def cold_graph():
+    dependency_graph.invalidate()
+    yield
+    dependency_graph.invalidate()
+
+
+def _seed(sessionmaker):
+    """car <- insurance <- bank, car <- maintenance, bank -> car (cycle), isolated item."""
+    async def seed():
+        async with sessionmaker() as session:
+            category = Category(name="Vie", color="#000")
+            session.add(category)
+            await session.flush()
+            ids = {}
+            for name in ("car", "insurance", "bank", "maintenance", "isolated"):
+                item = LifeItem(name=name, value="0", type="text", categoryId=category.id)
+                session.add(item)
+                await session.flush()
+                ids[name] = item.id
+            for source, target, link_type in (
+                ("insurance", "car", "insurance"),
+                ("bank", "insurance", "payment"),
+                ("maintenance", "car", "maintenance"),
+                ("bank", "car", "ownership"),
+            ):
+                session.add(Dependency(
+                    fromCategoryId=category.id, fromItemId=ids[source],
+                    toCategoryId=category.id, toItemId=ids[target], linkType=link_type,
+                ))
+            await session.commit()
+            return category.id, ids
+
+    return asyncio.run(seed())
+
+
+def _traverse_both(sessionmaker, root, **kwargs):
+    async def run():
+        async with sessionmaker() as session:
+            cold = await traverse_cold(session, root, **kwargs)
+            graph = DependencyGraph(ttl_seconds=60)
+            await graph.ensure_loaded(session)
+            return cold, graph.traverse(root, **kwargs)
+
+    return asyncio.run(run())
+
+
+class TestTraversal:
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        {"depth": 1},
+        {"direction": "in"},
+        {"direction": "out"},
+        {"direction": "in", "depth": 1},
+        {"link_types": {"insurance", "payment"}},
+    ])
+    def test_cold_and_warm_agree(self, sqlite_sessionmaker, kwargs):
+        _, ids = _seed(sqlite_sessionmaker)
+        cold, warm = _traverse_both(sqlite_sessionmaker, ids["car"], **kwargs)
+        assert cold.depths == warm.depths
+        assert {e.id for e in cold.edges} == {e.id for e in warm.edges}
+
+    def test_what_depends_on_the_car(self, sqlite_sessionmaker):
+        _, ids = _seed(sqlite_sessionmaker)
+        cold, _ = _traverse_both(sqlite_sessionmaker, ids["car"], direction="in")
+        names = {name: cold.depths.get(item_id) for name, item_id in ids.items()}
+        assert names == {"car": 0, "insurance": 1, "bank": 1, "maintenance": 1, "isolated": None}
+
+        cold, _ = _traverse_both(sqlite_sessionmaker, ids["car"], direction="out")
+        assert cold.depths == {ids["car"]: 0}
+
+    def test_index_follows_writes(self, sqlite_sessionmaker):
+        category_id, ids = _seed(sqlite_sessionmaker)
+
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                service = DependencyService(session)
+                await service.get_graph()  # Warm the shared index
+                created = await service.create_dependency(DependencyCreate(
+                    fromCategoryId=category_id, fromItemId=ids["isolated"],
+                    toCategoryId=category_id, toItemId=ids["maintenance"], linkType="other",
+                ))
+                linked = (await service.get_impact(ids["car"], direction="in"))["nodes"]
+                await service.delete_dependency(created.id)
+                unlinked = (await service.get_impact(ids["car"], direction="in"))["nodes"]
+                return linked, unlinked
+
+        linked, unlinked = asyncio.run(run())
+        assert dependency_graph.is_warm
+        assert {node["name"] for node in linked} == {"car", "insurance", "bank", "maintenance", "isolated"}
+        assert "isolated" not in {node["name"] for node in unlinked}
+
+
+class TestGraphEndpoints:
+    def test_graph_and_neighborhood(self, sqlite_sessionmaker, api_client):
+        _, ids = _seed(sqlite_sessionmaker)
+
+        async def calls():
+            async with api_client((dependencies.router, "/api/dependencies")) as client:
+                neighborhood = await client.get(
+                    f"/api/dependencies/graph/items/{ids['bank']}/neighborhood",
+                    params={"depth": 1, "direction": "out"},
+                )
+                graph = await client.get("/api/dependencies/graph")
+                impact = await client.get(
+                    f"/api/dependencies/graph/items/{ids['maintenance']}/impact",
+                    params={"link_types": ["maintenance"]},
+                )
+                invalid = await client.get(
+                    f"/api/dependencies/graph/items/{ids['bank']}/neighborhood", params={"direction": "up"},
+                )
+                return neighborhood, graph, impact, invalid
+
+        neighborhood, graph, impact, invalid = asyncio.run(calls())
+        assert neighborhood.status_code == 200
+        assert {n["name"]: n["depth"] for n in neighborhood.json()["nodes"]} == {"bank": 0, "insurance": 1, "car": 1}
+        assert len(graph.json()["edges"]) == 4
+        assert len(graph.json()["nodes"]) == 4
+        assert {n["name"] for n in impact.json()["nodes"]} == {"maintenance", "car"}
+        assert invalid.status_code == 422
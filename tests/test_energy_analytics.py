@@ -0,0 +1,69 @@
+"""
+Tests for the energy consumption analytics of a property.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api.endpoints import real_estate
+from app.services import real_estate_service
+
+ITEM_ID = uuid.uuid4()
+
+
+@pytest.fixture(autouse=True)
+def empty_analytics_cache():
+    real_estate_service.invalidate_energy_analytics()
+
+
+def _ms(year, month, day=15):
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _record(date, electricity_cost, kwh, gas_cost, m3):
+    return {
+        "itemId": str(ITEM_ID), "date": date,
+        "electricityCost": electricity_cost, "electricityKwh": kwh, "gasCost": gas_cost, "gasM3": m3,
+    }
+
+
+class TestEnergyAnalytics:
+    def test_monthly_yearly_and_projection(self, api_client, max_queries):
+        records = [
+            _record(_ms(2025, 1, 5), 40, 200, 60, 50),
+            _record(_ms(2025, 1, 20), 10, 50, 0, 0),
+            _record(_ms(2025, 2), 40, 200, 50, 40),
+            _record(_ms(2026, 1), 60, 200, 70, 50),
+        ]
+
+        async def run():
+            async with api_client((real_estate.router, "/api/real-estate")) as client:
+                for record in records:
+                    await client.post("/api/real-estate/energy-consumption", json=record)
+                with max_queries(1):
+                    first = (await client.get("/api/real-estate/energy-consumption/analytics", params={"item_id": str(ITEM_ID)})).json()
+                with max_queries(0):
+                    cached = (await client.get("/api/real-estate/energy-consumption/analytics", params={"item_id": str(ITEM_ID)})).json()
+                await client.post("/api/real-estate/energy-consumption", json=_record(_ms(2026, 2), 50, 100, 0, 0))
+                refreshed = (await client.get("/api/real-estate/energy-consumption/analytics", params={"item_id": str(ITEM_ID)})).json()
+                return first, cached, refreshed
+
+        first, cached, refreshed = asyncio.run(run())
+
+        january = first["months"][0]
+        assert [m["month"] for m in first["months"]] == ["2025-01", "2025-02", "2026-01"]
+        assert (january["totalCost"], january["electricityKwh"], january["records"]) == (110, 250, 2)
+        assert january["costPerKwh"] == 0.2 and january["yoyDelta"] is None
+        assert first["months"][2]["yoyDelta"] == 20 and first["months"][2]["costPerKwh"] == 0.3
+
+        y2025, y2026 = first["years"]
+        assert (y2025["year"], y2025["months"], y2025["totalCost"]) == (2025, 2, 200)
+        assert y2025["yoyDelta"] is None and y2025["yoyMonths"] == 0
+        # 2026 only has January so far: compared with January 2025, not the whole year
+        assert (y2026["yoyMonths"], y2026["yoyDelta"], y2026["yoyPct"]) == (1, 20, round(20 / 110 * 100, 4))
+        assert first["projectedAnnualCost"] == round((110 + 90 + 130) / 3 * 12, 2)
+
+        assert cached == first
+        assert refreshed["months"][-1]["month"] == "2026-02"
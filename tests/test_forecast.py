@@ -0,0 +1,113 @@
+"""
+Tests for the recurring cash-flow forecast.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.api.endpoints import finance, items
+from app.services import finance_service
+from app.services.forecast import horizon, invalidate_forecast, monthly_flows
+
+NOW = int(datetime(2026, 1, 15, 12, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+@pytest.fixture(autouse=True)
+def frozen_forecast(monkeypatch):
+    invalidate_forecast()
+    monkeypatch.setattr(finance_service, "now_ms", lambda: NOW)
+
+
+def _ms(year, month, day=1):
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class TestMonthlyFlows:
+    def test_day_clipping_bounds_and_accounts(self):
+        months = horizon(NOW, 3)  # Jan, Feb, Mar 2026
+        flows = monthly_flows(
+            accounts=np.array([1, 0, 1]),
+            days=np.array([31, 10, 5]),
+            amounts=np.array([-100.0, 50.0, 10.0]),
+            lower=np.array([_ms(2026, 1), _ms(2026, 2, 11), _ms(2026, 1)]),
+            upper=np.array([_ms(2026, 2, 28), _ms(2026, 12), _ms(2026, 1, 31)]),
+            months=months,
+            account_count=3,
+        )
+        assert flows.tolist() == [
+            [0, 0, 50],  # Feb 10 is before the lower bound
+            [-90, -100, 0],  # Day 31 falls on Feb 28, the last day of the upper bound
+            [0, 0, 0],  # No schedule
+        ]
+
+    def test_thousands_of_schedules_over_ten_years(self):
+        count = 5000
+        rng = np.random.default_rng(0)
+        months = horizon(NOW, 120)
+        began = time.perf_counter()
+        flows = monthly_flows(
+            accounts=rng.integers(0, 50, count),
+            days=rng.integers(1, 32, count),
+            amounts=rng.normal(0, 100, count),
+            lower=np.full(count, NOW),
+            upper=np.full(count, np.iinfo(np.int64).max),
+            months=months,
+            account_count=50,
+        )
+        assert flows.shape == (50, 120)
+        assert time.perf_counter() - began < 1
+
+
+class TestForecast:
+    def test_projection_cache_and_invalidation(self, api_client, max_queries):
+        async def run():
+            async with api_client((items.router, "/api/items"), (finance.router, "/api/finance")) as client:
+                account = (await client.post("/api/items", json={
+                    "name": "Compte courant", "value": "0", "type": "currency", "status": "ok",
+                    "syncBalanceWithBlock": True, "initialBalance": 1000.0,
+                })).json()
+                await client.post("/api/finance/history", json={
+                    "itemId": account["id"], "date": _ms(2026, 1, 5), "value": 500, "label": "Prime", "category": "income",
+                })
+                await client.post("/api/finance/recurring", json={
+                    "sourceType": "salary", "targetAccountId": account["id"], "amount": 2000, "dayOfMonth": 1,
+                    "label": "Salaire", "category": "income", "startDate": _ms(2026, 2),
+                })
+                await client.post("/api/finance/recurring", json={
+                    "sourceType": "rent", "targetAccountId": account["id"], "amount": -800, "dayOfMonth": 31,
+                    "label": "Loyer", "category": "expense", "startDate": _ms(2025, 1), "endDate": _ms(2026, 6, 30),
+                })
+                await client.post("/api/finance/subscriptions", json={
+                    "itemId": account["id"], "name": "Musique", "amount": 15, "billingDay": 10,
+                })
+
+                with max_queries(3):
+                    first = (await client.get("/api/finance/forecast", params={"months": 12})).json()
+                with max_queries(0):
+                    cached = (await client.get("/api/finance/forecast", params={"months": 12})).json()
+                await client.post("/api/finance/subscriptions", json={
+                    "itemId": account["id"], "name": "Vidéo", "amount": 10, "billingDay": 20,
+                })
+                refreshed = (await client.get("/api/finance/forecast", params={"months": 12})).json()
+                too_far = await client.get("/api/finance/forecast", params={"months": 121})
+                return first, cached, refreshed, too_far.status_code
+
+        first, cached, refreshed, too_far_status = asyncio.run(run())
+
+        assert first["schedules"] == 3 and cached == first
+        (account,) = first["accounts"]
+        balances = [point["balance"] for point in account["points"]]
+        # Jan: rent only (subscription already billed on the 10th); Feb-Jun: +2000 -800 -15; Jul-Dec: no rent
+        assert account["currentBalance"] == 1500
+        assert balances[0] == 700
+        assert balances[5] == 700 + 5 * 1185
+        assert balances[11] == 700 + 5 * 1185 + 6 * 1985 == account["endBalance"]
+        assert (account["lowestBalance"], account["lowestBalanceDate"]) == (700, _ms(2026, 1))
+        assert [point["balance"] for point in first["total"]] == balances
+
+        assert refreshed["schedules"] == 4
+        assert refreshed["accounts"][0]["points"][0]["balance"] == 690
+        assert too_far_status == 422
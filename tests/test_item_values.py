@@ -0,0 +1,84 @@
+"""
+Tests for the typed numeric shadow of item values and the value filters of /api/items.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.endpoints import categories, items
+from app.services.item_service import ItemService
+from app.services.item_values import parse_amount, parse_currency, typed_value_columns
+
+ROUTERS = ((categories.router, "/api/categories"), (items.router, "/api/items"))
+
+
+def _item(category_id, name, value, item_type="currency"):
+    return {"name": name, "value": value, "type": item_type, "status": "ok", "categoryId": category_id}
+
+
+class TestParsing:
+    def test_amounts(self):
+        assert parse_amount("12 500 €") == 12500
+        assert parse_amount("1 234,56") == 1234.56
+        assert parse_amount("1,234.56") == 1234.56
+        assert parse_amount("1.234,56 €") == 1234.56
+        assert parse_amount("-300") == -300
+        assert parse_amount("n/a") is None and parse_amount(None) is None
+
+    def test_currencies(self):
+        assert parse_currency("1 200 €") == "EUR"
+        assert parse_currency("1 200 CHF") == "CHF"
+        assert parse_currency("$40") == "USD"
+        assert parse_currency("1200") is None
+
+    def test_only_numeric_types(self):
+        assert typed_value_columns("45 %", "percentage") == {"numericValue": 45, "currency": None}
+        assert typed_value_columns("2025", "date") == {"numericValue": None, "currency": None}
+        assert typed_value_columns("10 €", "currency", "USD") == {"numericValue": 10, "currency": "USD"}
+
+
+class TestItemValues:
+    def test_sync_filters_and_top_per_category(self, api_client):
+        async def run():
+            async with api_client(*ROUTERS) as client:
+                bank = (await client.post("/api/categories", json={"name": "Banque", "color": "#0f0"})).json()
+                home = (await client.post("/api/categories", json={"name": "Maison", "color": "#f00"})).json()
+                checking = (await client.post("/api/items", json=_item(bank["id"], "Compte", "1 500 €"))).json()
+                await client.post("/api/items", json=_item(bank["id"], "Livret", "12 000 €"))
+                await client.post("/api/items", json=_item(bank["id"], "PEA", "8 000 €"))
+                await client.post("/api/items", json=_item(home["id"], "Maison", "250 000 €"))
+                await client.post("/api/items", json=_item(home["id"], "Note", "500", "text"))
+
+                updated = (await client.put(f"/api/items/{checking['id']}", json={"value": "2 000,50"})).json()
+                retyped = (await client.put(f"/api/items/{checking['id']}", json={"type": "text"})).json()
+                await client.put(f"/api/items/{checking['id']}", json={"type": "currency"})
+
+                ranged = (await client.get("/api/items", params={"min_value": 2000, "max_value": 20000, "sort": "-value"})).json()
+                top = (await client.get("/api/items", params={"top_per_category": 2})).json()
+                return home, checking, updated, retyped, ranged, top
+
+        home, checking, updated, retyped, ranged, top = asyncio.run(run())
+
+        assert (checking["numericValue"], checking["currency"]) == (1500, "EUR")
+        assert (updated["numericValue"], updated["currency"]) == (2000.5, "EUR")  # Stored code kept
+        assert retyped["numericValue"] is None
+        assert [item["name"] for item in ranged] == ["Livret", "PEA", "Compte"]
+        by_category = [(item["categoryId"] == home["id"], item["name"]) for item in top]
+        assert sorted(by_category) == [(False, "Livret"), (False, "PEA"), (True, "Maison")]
+
+    def test_top_per_category_is_one_windowed_query(self):
+        class RecordingSession:
+            def __init__(self):
+                self.statements = []
+
+            async def execute(self, statement):
+                self.statements.append(statement)
+                raise RuntimeError("recorded")
+
+        session = RecordingSession()
+        with pytest.raises(RuntimeError):
+            asyncio.run(ItemService(session).get_items(min_value=10, top_per_category=3))
+        sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+        assert "row_number() OVER (PARTITION BY life_items.category_id ORDER BY life_items.numeric_value DESC" in sql
+        assert "life_items.numeric_value >= " in sql
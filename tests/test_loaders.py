@@ -0,0 +1,124 @@
+"""
+Tests for the batching loaders and the items details endpoint.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from agents.tools import item_tools
+from app.api.endpoints import items
+from app.models import Alert, HistoryEntry, LifeItem, Subscription
+from app.services.item_service import RECENT_HISTORY_SIZE
+from app.services.loaders import DataLoader, Loaders
+
+
+def _seed(sessionmaker, count=5):
+    async def seed():
+        async with sessionmaker() as session:
+            ids = []
+            for i in range(count):
+                item = LifeItem(name=f"Compte {i}", value="100", type="currency")
+                session.add(item)
+                await session.flush()
+                ids.append(item.id)
+                session.add(Alert(itemId=item.id, name="Échéance", severity="warning", createdAt=0))
+                session.add(Subscription(itemId=item.id, name="Netflix", amount=13.49, billingDay=5))
+                for day in range(RECENT_HISTORY_SIZE + 2):
+                    session.add(HistoryEntry(itemId=item.id, date=day, value=-10.0, label="Achat", category="expense"))
+            await session.commit()
+            return ids
+
+    return asyncio.run(seed())
+
+
+class TestDataLoader:
+    def test_loads_in_same_tick_are_coalesced(self):
+        calls = []
+
+        async def batch(keys):
+            calls.append(list(keys))
+            return {key: key * 10 for key in keys if key != 3}
+
+        async def run():
+            loader = DataLoader(batch)
+            results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+            cached = await loader.load(2)
+            return results, cached
+
+        results, cached = asyncio.run(run())
+        assert results == [10, 20, 10, None]
+        assert cached == 20
+        assert calls == [[1, 2, 3]]
+
+    def test_batch_error_is_raised_on_every_load(self):
+        async def batch(keys):
+            raise RuntimeError("boom")
+
+        async def run():
+            loader = DataLoader(batch)
+            return await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+
+    def test_one_query_per_table(self, sqlite_sessionmaker, max_queries):
+        item_ids = _seed(sqlite_sessionmaker)
+
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                loaders = Loaders(session)
+                return await asyncio.gather(*(
+                    asyncio.gather(loaders.by_item(Alert).load(item_id), loaders.by_item(Subscription).load(item_id))
+                    for item_id in item_ids
+                ))
+
+        with max_queries(2):
+            results = asyncio.run(run())
+        assert [len(alerts) for alerts, _ in results] == [1] * len(item_ids)
+        assert all(subs[0].itemId == item_id for (_, subs), item_id in zip(results, item_ids))
+
+
+class TestItemsDetailsEndpoint:
+    def test_details_batched(self, sqlite_sessionmaker, api_client, max_queries):
+        item_ids = _seed(sqlite_sessionmaker)
+
+        async def call(params):
+            async with api_client((items.router, "/api/items")) as client:
+                return await client.get("/api/items/details", params=params)
+
+        with max_queries(4) as scope:  # items + alerts + subscriptions + history
+            response = asyncio.run(call({}))
+        assert any("row_number" in statement.lower() for statement in scope.statements)  # History limited in SQL
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body) == len(item_ids)
+        first = body[0]
+        assert len(first["alerts"]) == 1 and len(first["subscriptions"]) == 1
+        assert len(first["recentHistory"]) == RECENT_HISTORY_SIZE
+        assert first["recentHistory"][0]["date"] == RECENT_HISTORY_SIZE + 1
+
+        response = asyncio.run(call({"ids": [str(item_ids[1])]}))
+        assert [item["id"] for item in response.json()] == [str(item_ids[1])]
+
+
+def test_overview_tool_pages_and_projects(sqlite_sessionmaker, monkeypatch, max_queries):
+    item_ids = _seed(sqlite_sessionmaker)
+
+    @asynccontextmanager
+    async def session():
+        async with sqlite_sessionmaker() as db:
+            yield db
+
+    monkeypatch.setattr(item_tools, "get_async_session", session)
+    with max_queries(4) as scope:
+        first = asyncio.run(item_tools.get_items_overview(fields=["name", "recent_history"], limit=2))
+    rest = asyncio.run(item_tools.get_items_overview(limit=10, cursor=first["next_cursor"]))
+    by_ids = asyncio.run(item_tools.get_items_overview(item_ids=[str(item_id) for item_id in item_ids], limit=3))
+
+    assert first["count"] == 2 and first["next_cursor"] == 2
+    assert set(first["items"][0]) == {"id", "name", "recent_history"}
+    assert len(first["items"][0]["recent_history"]) == RECENT_HISTORY_SIZE
+    assert rest["count"] == 3 and "next_cursor" not in rest
+    # Offset paging needs a stable order: each item exactly once, by name
+    assert [item["name"] for item in first["items"] + rest["items"]] == [f"Compte {i}" for i in range(5)]
+    assert "ORDER BY life_items.name, life_items.id" in scope.statements[0]
+    assert [item["id"] for item in by_ids["items"]] == [str(item_id) for item_id in item_ids[:3]]
+    assert by_ids["next_cursor"] == 3
@@ -0,0 +1,176 @@
+"""
+Tests for the write-behind body metric ingest.
+"""
+import asyncio
+import json
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api.endpoints import health
+from app.models.health import BodyMetric
+from app.models.item import LifeItem
+from app.schemas.health import BodyMetricCreate
+from app.services.metric_ingest import IngestBacklogFull, IngestRejected, IngestUnavailable, MetricIngestQueue
+
+ITEM_ID = uuid.uuid4()
+
+
+def _readings(dates):
+    return [BodyMetricCreate(itemId=ITEM_ID, date=date, weight=70.0 + date) for date in dates]
+
+
+async def _stored(sessionmaker):
+    async with sessionmaker() as session:
+        result = await session.execute(select(BodyMetric.date, BodyMetric.weight).order_by(BodyMetric.date))
+        return result.all()
+
+
+class TestMetricIngest:
+    def test_concurrent_batches_share_one_flush_and_dedupe(self, sqlite_sessionmaker):
+        queue = MetricIngestQueue(sqlite_sessionmaker, flush_ms=20)
+        flushes = []
+        write = queue._write
+
+        async def counting_write(rows):
+            flushes.append(len(rows))
+            await write(rows)
+
+        queue._write = counting_write
+
+        async def run():
+            acks = await asyncio.gather(
+                queue.submit(_readings([1, 2, 3])),
+                queue.submit(_readings([3, 4])),  # 3 is sent twice
+            )
+            resent = await queue.submit(_readings([4, 5]))
+            return acks, resent, await _stored(sqlite_sessionmaker)
+
+        acks, resent, stored = asyncio.run(run())
+
+        assert acks == [3, 2] and resent == 2
+        assert flushes == [5, 2]
+        assert [date for date, _ in stored] == [1, 2, 3, 4, 5]
+        assert queue.pending == 0
+
+    def test_full_batch_flushes_without_waiting(self, sqlite_sessionmaker):
+        queue = MetricIngestQueue(sqlite_sessionmaker, flush_ms=60_000, batch_size=3)
+
+        async def run():
+            await asyncio.wait_for(queue.submit(_readings([1, 2, 3])), timeout=5)
+            return await _stored(sqlite_sessionmaker)
+
+        assert len(asyncio.run(run())) == 3
+
+    def test_refused_reading_fails_only_its_request(self, sqlite_sessionmaker):
+        queue = MetricIngestQueue(sqlite_sessionmaker, flush_ms=20)
+        # date is NOT NULL: the shared flush is refused, then each request is written alone
+        refused = BodyMetricCreate.model_construct(itemId=ITEM_ID, date=None, weight=70.0)
+
+        async def run():
+            acks = await asyncio.gather(
+                queue.submit(_readings([1, 2])),
+                queue.submit([refused]),
+                queue.submit(_readings([3])),
+                return_exceptions=True,
+            )
+            return acks, await _stored(sqlite_sessionmaker)
+
+        acks, stored = asyncio.run(run())
+
+        assert acks[0] == 2 and acks[2] == 1
+        assert isinstance(acks[1], IngestRejected)
+        assert [date for date, _ in stored] == [1, 2, 3]
+
+    def test_backlog_full_and_flush_errors(self, sqlite_sessionmaker):
+        queue = MetricIngestQueue(sqlite_sessionmaker, flush_ms=10, max_pending=2)
+
+        async def failing_write(rows):
+            raise RuntimeError("database down")
+
+        async def run():
+            with pytest.raises(IngestBacklogFull):
+                await queue.submit(_readings([1, 2, 3]))
+            queue._write = failing_write
+            with pytest.raises(IngestUnavailable):
+                await queue.submit(_readings([1]))
+            return queue.pending
+
+        assert asyncio.run(run()) == 0
+
+    def test_batch_endpoint_json_and_ndjson(self, api_client, sqlite_sessionmaker, monkeypatch):
+        monkeypatch.setattr(health, "metric_ingest", MetricIngestQueue(sqlite_sessionmaker, flush_ms=1))
+        readings = [{"itemId": str(ITEM_ID), "date": date, "weight": 80.5} for date in (10, 20)]
+
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                session.add(LifeItem(id=ITEM_ID, name="Balance", value="0", type="text"))
+                await session.commit()
+            async with api_client((health.router, "/api/health")) as client:
+                as_json = await client.post("/api/health/body-metrics/batch", json=readings)
+                as_ndjson = await client.post(
+                    "/api/health/body-metrics/batch",
+                    content="\n".join(json.dumps({**r, "date": r["date"] + 1}) for r in readings) + "\n",
+                    headers={"Content-Type": "application/x-ndjson"},
+                )
+                invalid = await client.post("/api/health/body-metrics/batch", json=[{"itemId": str(ITEM_ID)}])
+                malformed = await client.post(
+                    "/api/health/body-metrics/batch", content="[{", headers={"Content-Type": "application/json"},
+                )
+                async with sqlite_sessionmaker() as session:
+                    count = await session.scalar(select(func.count(BodyMetric.id)))
+                return as_json, as_ndjson, invalid, malformed, count
+
+        as_json, as_ndjson, invalid, malformed, count = asyncio.run(run())
+
+        assert as_json.json() == {"received": 2} and as_ndjson.json() == {"received": 2}
+        assert invalid.status_code == 422 and malformed.status_code == 400
+        assert count == 4
+
+    def test_batch_endpoint_errors(self, api_client, sqlite_sessionmaker, monkeypatch):
+        queue = MetricIngestQueue(sqlite_sessionmaker, flush_ms=1)
+        monkeypatch.setattr(health, "metric_ingest", queue)
+        unknown_item = uuid.uuid4()
+
+        async def failing_write(rows):
+            raise ConnectionRefusedError("database down")
+
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                session.add(LifeItem(id=ITEM_ID, name="Balance", value="0", type="text"))
+                await session.commit()
+            async with api_client((health.router, "/api/health")) as client:
+                unknown = await client.post("/api/health/body-metrics/batch", json=[
+                    {"itemId": str(ITEM_ID), "date": 1, "weight": 80.0},
+                    {"itemId": str(unknown_item), "date": 1, "weight": 80.0},
+                ])
+                queue._write = failing_write
+                down = await client.post("/api/health/body-metrics/batch", json=[
+                    {"itemId": str(ITEM_ID), "date": 2, "weight": 80.0},
+                ])
+                return unknown, down, await _stored(sqlite_sessionmaker)
+
+        unknown, down, stored = asyncio.run(run())
+
+        assert unknown.status_code == 422 and str(unknown_item) in unknown.json()["detail"]
+        assert down.status_code == 503
+        assert stored == []  # The request with an unknown item was refused as a whole
+
+
+def test_single_reading_duplicates_are_conflicts(api_client):
+    reading = {"itemId": str(ITEM_ID), "date": 100, "weight": 80.0}
+
+    async def run():
+        async with api_client((health.router, "/api/health")) as client:
+            created = await client.post("/api/health/body-metrics", json=reading)
+            duplicate = await client.post("/api/health/body-metrics", json={**reading, "weight": 81.0})
+            other = (await client.post("/api/health/body-metrics", json={**reading, "date": 200})).json()
+            moved = await client.put(f"/api/health/body-metrics/{other['id']}", json={"date": 100})
+            kept = await client.put(f"/api/health/body-metrics/{other['id']}", json={"weight": 79.0})
+            return created, duplicate, moved, kept
+
+    created, duplicate, moved, kept = asyncio.run(run())
+    assert created.status_code == 201
+    assert duplicate.status_code == moved.status_code == 409
+    assert kept.status_code == 200 and kept.json()["date"] == 200
@@ -0,0 +1,69 @@
+"""
+Tests for the Prometheus-style metrics registry and /metrics sources.
+"""
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import metrics
+from app.core.metrics import Histogram, MetricsMiddleware, register_engine, render_metrics, track_job
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo", ("route",), buckets=(0.1, 1.0))
+    histogram.observe("/a", value=0.05)
+    histogram.observe("/a", value=0.5)
+    histogram.observe("/a", value=5.0)
+
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def read_item(item_id: str):
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/api/items/abc")
+            await client.get("/api/items/def")
+            await client.get("/nope/123")
+
+    asyncio.run(main())
+    series = metrics.http_request_duration.series
+    assert series[("GET", "/api/items/{item_id}", "200")][1] == 2
+    assert series[("GET", "<unmatched>", "404")][1] == 1
+
+
+def test_engine_statements_and_pool_are_exported(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}")
+    register_engine("test", engine)
+
+    async def main():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    asyncio.run(main())
+    assert metrics.db_statement_duration.series[("test", "SELECT")][1] >= 1
+    assert 'db_pool_size{engine="test"}' in render_metrics()
+
+
+def test_track_job_counts_results():
+    with track_job("recurring_sync") as job:
+        job["result"] = {"processedCount": 3, "errors": ["boom"]}
+
+    assert metrics.job_result_count.values[("recurring_sync", "processedCount")] >= 3
+    assert metrics.job_result_count.values[("recurring_sync", "errors")] >= 1
+    assert metrics.job_duration.series[("recurring_sync", "success")][1] >= 1
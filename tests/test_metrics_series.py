@@ -0,0 +1,64 @@
+"""
+Tests for the downsampled body metrics series.
+"""
+import asyncio
+import uuid
+
+from app.api.endpoints import health
+from app.models.health import BodyMetric
+from app.services.health_service import DAY_MS, HealthService
+
+ITEM_ID = uuid.uuid4()
+
+
+def _seed(sessionmaker, days: int):
+    """One measurement a day, weight going down 0.1 kg/day from 90 kg."""
+    async def run():
+        async with sessionmaker() as session:
+            session.add_all(
+                BodyMetric(itemId=ITEM_ID, date=day * DAY_MS, weight=90 - 0.1 * day)
+                for day in range(days)
+            )
+            await session.commit()
+
+    asyncio.run(run())
+
+
+class TestMetricsSeries:
+    def test_series_is_downsampled_with_trend(self, sqlite_sessionmaker, max_queries):
+        _seed(sqlite_sessionmaker, 365)
+
+        async def run():
+            async with sqlite_sessionmaker() as session:
+                with max_queries(2):
+                    return await HealthService(session).get_metrics_series(item_id=ITEM_ID, points=20)
+
+        series = asyncio.run(run())
+
+        assert series["count"] == 365
+        assert len(series["points"]) <= 20
+        assert sum(p["count"] for p in series["points"]) == 365
+        assert abs(series["trendPerDay"] + 0.1) < 1e-6
+        first = series["points"][0]
+        assert first["max"] == 90 and first["min"] < first["avg"] < first["max"]
+        # Bucket wider than the rolling window: rolling average is the bucket average
+        assert first["rollingAvg"] == first["avg"]
+
+    def test_series_endpoint_range(self, api_client, sqlite_sessionmaker):
+        _seed(sqlite_sessionmaker, 30)
+
+        async def run():
+            async with api_client((health.router, "/api/health")) as client:
+                ranged = await client.get("/api/health/body-metrics/series", params={
+                    "item_id": str(ITEM_ID), "from": 10 * DAY_MS, "to": 19 * DAY_MS, "points": 100, "window_days": 3,
+                })
+                empty = await client.get("/api/health/body-metrics/series", params={"item_id": str(uuid.uuid4())})
+                return ranged, empty
+
+        ranged, empty = asyncio.run(run())
+
+        points = ranged.json()["points"]
+        assert ranged.status_code == 200
+        assert [p["date"] for p in points] == [day * DAY_MS for day in range(10, 20)]
+        assert points[5]["rollingAvg"] == round((points[3]["avg"] + points[4]["avg"] + points[5]["avg"]) / 3, 3)
+        assert empty.json()["points"] == [] and empty.json()["trendPerDay"] is None
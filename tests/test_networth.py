@@ -0,0 +1,105 @@
+"""
+Tests for the net worth engine and its per-item monthly running totals.
+"""
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.api.endpoints import finance, items, networth, real_estate
+from app.models.finance import ItemMonthlyTotal
+from app.services.networth_service import month_start
+
+
+def _ms(year, month, day=15):
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _item(name, value="0", **fields):
+    return {"name": name, "value": value, "type": "currency", "status": "ok", **fields}
+
+
+def _entry(item_id, date, value, category):
+    return {"itemId": item_id, "date": date, "value": value, "label": "op", "category": category}
+
+
+class TestNetWorth:
+    def test_balances_equity_debts_and_series(self, api_client, sqlite_sessionmaker, max_queries):
+        routers = (
+            (items.router, "/api/items"),
+            (finance.router, "/api/finance"),
+            (real_estate.router, "/api/real-estate"),
+            (networth.router, "/api/networth"),
+        )
+
+        async def run():
+            async with api_client(*routers) as client:
+                account = (await client.post("/api/items", json=_item(
+                    "Compte courant", syncBalanceWithBlock=True, initialBalance=1000.0, assetType="current_account",
+                ))).json()
+                await client.post("/api/items", json=_item("Livret A", "5 000 €", assetType="savings"))
+                await client.post("/api/items", json=_item("Prêt auto", "3000", assetType="debt"))
+                house = (await client.post("/api/items", json=_item("Maison", assetType="house"))).json()
+                await client.post("/api/real-estate/valuations", json={
+                    "itemId": house["id"], "estimatedValue": 200000, "purchasePrice": 180000,
+                    "purchaseDate": _ms(2020, 1), "loanAmount": 60000, "loanInterestRate": 0,
+                    "loanStartDate": _ms(2020, 1), "loanDurationMonths": 60,
+                })
+
+                await client.post("/api/finance/history", json=_entry(account["id"], _ms(2025, 1), 2000, "income"))
+                await client.post("/api/finance/history", json=_entry(account["id"], _ms(2025, 1, 20), 500, "expense"))
+                rent = (await client.post("/api/finance/history", json=_entry(account["id"], _ms(2025, 2), 700, "expense"))).json()
+                await client.put(f"/api/finance/history/{rent['id']}", json={"value": 800})
+                typo = (await client.post("/api/finance/history", json=_entry(account["id"], _ms(2025, 3), 999, "expense"))).json()
+                await client.delete(f"/api/finance/history/{typo['id']}")
+
+                with max_queries(3):
+                    response = await client.get("/api/networth", params={"from": _ms(2024, 12), "to": _ms(2025, 3, 1)})
+                yearly = await client.get("/api/networth", params={"from": _ms(2024, 12), "to": _ms(2025, 3, 1), "bucket": "year"})
+                invalid = await client.get("/api/networth", params={"from": _ms(2025, 3), "to": _ms(2025, 1)})
+                return response.json(), yearly.json(), invalid.status_code
+
+        net_worth, yearly, invalid_status = asyncio.run(run())
+
+        amounts = {entry["name"]: (entry["source"], entry["amount"]) for entry in net_worth["items"]}
+        assert amounts["Compte courant"] == ("history", 1000 + 2000 - 500 - 800)
+        assert amounts["Livret A"] == ("value", 5000)
+        assert amounts["Prêt auto"] == ("value", -3000)
+        assert amounts["Maison"][0] == "valuation"
+        assert amounts["Maison"][1] == 200000  # 5-year loan started in 2020: repaid
+        assert net_worth["liabilities"] == 3000
+        assert net_worth["netWorth"] == 1700 + 5000 - 3000 + 200000
+
+        def due(k):
+            year, month = divmod(2020 * 12 + k, 12)
+            return _ms(year, month + 1)
+
+        def equity(at):
+            return 200000 - 1000 * (60 - sum(1 for k in range(1, 61) if due(k) <= at))
+
+        def end_of(year, month):
+            return month_start(_ms(year, month)) - 1
+
+        series = [(point["date"], point["netWorth"]) for point in net_worth["series"]]
+        assert [date for date, _ in series] == [month_start(_ms(y, m)) for y, m in ((2024, 12), (2025, 1), (2025, 2), (2025, 3))]
+        assert series[0][1] == 1000 + 5000 - 3000 + equity(end_of(2025, 1))
+        assert series[1][1] == 2500 + 5000 - 3000 + equity(end_of(2025, 2))
+        assert series[2][1] == 1700 + 5000 - 3000 + equity(end_of(2025, 3))
+        assert series[3][1] == 1700 + 5000 - 3000 + equity(_ms(2025, 3, 1))
+
+        assert [point["date"] for point in yearly["series"]] == [month_start(_ms(2024, 1)), month_start(_ms(2025, 1))]
+        assert invalid_status == 400
+
+        async def totals():
+            async with sqlite_sessionmaker() as session:
+                rows = await session.execute(
+                    select(ItemMonthlyTotal.month, ItemMonthlyTotal.total, ItemMonthlyTotal.entries)
+                    .order_by(ItemMonthlyTotal.month)
+                )
+                return rows.all()
+
+        assert [tuple(row) for row in asyncio.run(totals())] == [
+            (month_start(_ms(2025, 1)), 1500, 2),
+            (month_start(_ms(2025, 2)), -800, 1),
+            (month_start(_ms(2025, 3)), 0, 0),
+        ]
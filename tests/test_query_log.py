@@ -0,0 +1,96 @@
+"""
+Tests for the query log (statement counts, N+1 detection, slow queries).
+"""
+import asyncio
+import logging
+
+from sqlalchemy import create_engine, text
+
+from app.api.endpoints import categories
+from app.core.config import settings
+from app.core.query_log import _explain, query_scope
+from app.models import Category, LifeItem
+
+
+def _seed_categories(sessionmaker, count=3):
+    async def seed():
+        async with sessionmaker() as session:
+            for i in range(count):
+                category = Category(name=f"Island {i}", color="#fff")
+                session.add(category)
+                await session.flush()
+                session.add(LifeItem(name=f"Item {i}", value="100", type="currency", categoryId=category.id))
+            await session.commit()
+
+    asyncio.run(seed())
+
+
+def _select_one_each(sessionmaker, times):
+    async def run():
+        async with sessionmaker() as session:
+            for i in range(times):
+                await session.execute(text("SELECT :i"), {"i": i})
+
+    asyncio.run(run())
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one(sqlite_sessionmaker, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.query_log"):
+        with query_scope("loop") as scope:
+            _select_one_each(sqlite_sessionmaker, settings.N_PLUS_ONE_THRESHOLD)
+
+    assert scope.count == settings.N_PLUS_ONE_THRESHOLD
+    assert scope.repeated(settings.N_PLUS_ONE_THRESHOLD) == [("SELECT ?", settings.N_PLUS_ONE_THRESHOLD)]
+    assert "[N+1] loop" in caplog.text
+
+
+def test_nested_scopes_count_in_parent(sqlite_sessionmaker):
+    with query_scope("request") as request:
+        with query_scope("tool") as tool:
+            _select_one_each(sqlite_sessionmaker, 2)
+        _select_one_each(sqlite_sessionmaker, 1)
+
+    assert tool.count == 2
+    assert request.count == 3
+
+
+def test_slow_queries_are_logged_with_plan(sqlite_sessionmaker, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", True)
+    with caplog.at_level(logging.WARNING, logger="app.core.query_log"):
+        with query_scope("slow") as scope:
+            _select_one_each(sqlite_sessionmaker, 1)
+
+    assert len(scope.slow) == 1
+    assert "[SLOW QUERY]" in caplog.text
+    assert "EXPLAIN failed" not in caplog.text
+
+
+def test_failed_explain_leaves_the_transaction_usable(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'explain.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE readings (value INTEGER)")
+    with engine.connect() as conn:
+        conn.exec_driver_sql("INSERT INTO readings VALUES (1)")
+        assert _explain(conn, "SELECT * FROM no_such_table", ()).startswith("(EXPLAIN failed")
+        assert "OpenRead" in _explain(conn, "SELECT * FROM readings", ())
+        conn.exec_driver_sql("INSERT INTO readings VALUES (2)")
+        conn.commit()
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM readings").scalar_one() == 2
+    engine.dispose()
+
+
+def test_categories_endpoint_query_budget(sqlite_sessionmaker, api_client, max_queries):
+    _seed_categories(sqlite_sessionmaker, count=5)
+
+    async def fetch():
+        async with api_client((categories.router, "/api/categories")) as client:
+            return await client.get("/api/categories")
+
+    # One SELECT for the categories + one selectin load for all their items
+    with max_queries(2):
+        response = asyncio.run(fetch())
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
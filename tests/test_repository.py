@@ -0,0 +1,102 @@
+"""
+Tests for the single-statement repository writes (UPDATE/DELETE ... RETURNING).
+"""
+import asyncio
+from uuid import uuid4
+
+from app.api.endpoints import categories, items
+from app.models import Alert, Category, LifeItem
+from app.services.repository import Repository
+
+
+def _run(sessionmaker, work):
+    async def main():
+        async with sessionmaker() as session:
+            return await work(session)
+
+    return asyncio.run(main())
+
+
+def _create_item(sessionmaker, **fields):
+    async def create(session):
+        item = LifeItem(name="Livret A", value="1000", type="currency", **fields)
+        session.add(item)
+        await session.commit()
+        return item.id
+
+    return _run(sessionmaker, create)
+
+
+class TestRepository:
+    def test_update_is_one_statement(self, sqlite_sessionmaker, max_queries):
+        item_id = _create_item(sqlite_sessionmaker)
+
+        with max_queries(1):
+            updated = _run(sqlite_sessionmaker, lambda s: Repository(s, LifeItem).update(item_id, {"value": "2500"}))
+
+        assert updated.id == item_id
+        assert updated.value == "2500"
+        assert updated.name == "Livret A"
+
+    def test_update_missing_row_returns_none(self, sqlite_sessionmaker):
+        result = _run(sqlite_sessionmaker, lambda s: Repository(s, LifeItem).update(uuid4(), {"value": "1"}))
+        assert result is None
+
+    def test_update_return_minimal_returns_id(self, sqlite_sessionmaker):
+        item_id = _create_item(sqlite_sessionmaker)
+        result = _run(
+            sqlite_sessionmaker,
+            lambda s: Repository(s, LifeItem).update(item_id, {"value": "3"}, return_minimal=True),
+        )
+        assert result == item_id
+
+    def test_empty_update_reads_row(self, sqlite_sessionmaker):
+        item_id = _create_item(sqlite_sessionmaker)
+        assert _run(sqlite_sessionmaker, lambda s: Repository(s, LifeItem).update(item_id, {})).id == item_id
+        assert _run(sqlite_sessionmaker, lambda s: Repository(s, LifeItem).update(uuid4(), {})) is None
+
+    def test_delete_reports_missing_rows(self, sqlite_sessionmaker, max_queries):
+        item_id = _create_item(sqlite_sessionmaker)
+
+        with max_queries(1):
+            assert _run(sqlite_sessionmaker, lambda s: Repository(s, LifeItem).delete(item_id)) is True
+        assert _run(sqlite_sessionmaker, lambda s: Repository(s, Alert).delete(uuid4())) is False
+
+
+class TestEndpoints:
+    def test_update_and_delete_item_endpoints(self, sqlite_sessionmaker, api_client):
+        item_id = _create_item(sqlite_sessionmaker)
+
+        async def calls():
+            async with api_client((items.router, "/api/items")) as client:
+                updated = await client.put(f"/api/items/{item_id}", json={"value": "42"})
+                missing = await client.put(f"/api/items/{uuid4()}", json={"value": "42"})
+                deleted = await client.delete(f"/api/items/{item_id}")
+                deleted_again = await client.delete(f"/api/items/{item_id}")
+                return updated, missing, deleted, deleted_again
+
+        updated, missing, deleted, deleted_again = asyncio.run(calls())
+        assert updated.status_code == 200 and updated.json()["value"] == "42"
+        assert missing.status_code == 404
+        assert deleted.status_code == 204
+        assert deleted_again.status_code == 404
+
+    def test_category_update_returns_items(self, sqlite_sessionmaker, api_client):
+        async def seed(session):
+            category = Category(name="Finance", color="#0f0")
+            session.add(category)
+            await session.flush()
+            session.add(LifeItem(name="Compte", value="10", type="currency", categoryId=category.id))
+            await session.commit()
+            return category.id
+
+        category_id = _run(sqlite_sessionmaker, seed)
+
+        async def call():
+            async with api_client((categories.router, "/api/categories")) as client:
+                return await client.put(f"/api/categories/{category_id}", json={"color": "#00f"})
+
+        response = asyncio.run(call())
+        assert response.status_code == 200
+        assert response.json()["color"] == "#00f"
+        assert [item["name"] for item in response.json()["items"]] == ["Compte"]
@@ -0,0 +1,95 @@
+"""
+Tests for the versioned 3D scene snapshot and its diffs.
+"""
+import asyncio
+
+import pytest
+
+from app.api.endpoints import categories, dependencies, items, scene
+from app.services import scene_service
+
+ROUTERS = (
+    (scene.router, "/api/scene"),
+    (categories.router, "/api/categories"),
+    (items.router, "/api/items"),
+    (dependencies.router, "/api/dependencies"),
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_snapshot_cache():
+    scene_service._snapshot_cache.update(version=None, payload=None)
+
+
+def _item(category_id, name):
+    return {"name": name, "value": "0", "type": "text", "status": "ok", "categoryId": category_id}
+
+
+class TestScene:
+    def test_snapshot_and_diffs(self, api_client):
+        async def run():
+            async with api_client(*ROUTERS) as client:
+                island = (await client.post("/api/categories", json={"name": "Garage", "color": "#f00"})).json()
+                car = (await client.post("/api/items", json=_item(island["id"], "Voiture"))).json()
+                insurance = (await client.post("/api/items", json=_item(island["id"], "Assurance"))).json()
+                link = (await client.post("/api/dependencies", json={
+                    "fromCategoryId": island["id"], "fromItemId": insurance["id"],
+                    "toCategoryId": island["id"], "toItemId": car["id"], "linkType": "insurance",
+                })).json()
+
+                first = await client.get("/api/scene")
+                not_modified = await client.get("/api/scene", headers={"If-None-Match": first.headers["ETag"]})
+                version = first.json()["version"]
+
+                await client.put(f"/api/items/{car['id']}", json={"value": "12000"})
+                await client.delete(f"/api/dependencies/{link['id']}")
+                diff = (await client.get("/api/scene/diff", params={"since": version})).json()
+                unchanged = (await client.get("/api/scene/diff", params={"since": diff["version"]})).json()
+                ahead = (await client.get("/api/scene/diff", params={"since": diff["version"] + 10})).json()
+                second = await client.get("/api/scene")
+                return first, not_modified, diff, unchanged, ahead, second, car, link
+
+        first, not_modified, diff, unchanged, ahead, second, car, link = asyncio.run(run())
+
+        snapshot = first.json()
+        assert first.status_code == 200
+        assert snapshot["version"] == 4
+        assert [i["name"] for i in snapshot["islands"]] == ["Garage"]
+        assert {i["name"] for i in snapshot["items"]} == {"Voiture", "Assurance"}
+        assert len(snapshot["links"]) == 1
+        assert not_modified.status_code == 304
+
+        assert diff["version"] == 6 and not diff["full"]
+        assert [(i["id"], i["value"]) for i in diff["items"]] == [(car["id"], "12000")]
+        assert diff["islands"] == [] and diff["links"] == []
+        assert diff["deleted"]["links"] == [link["id"]]
+
+        assert unchanged["items"] == [] and unchanged["deleted"]["links"] == []
+        assert ahead["full"] and len(ahead["items"]) == 2
+
+        assert second.json()["version"] == 6
+        assert second.headers["ETag"] == '"6"'
+
+    def test_category_delete_reports_its_items(self, api_client):
+        async def run():
+            async with api_client(*ROUTERS) as client:
+                island = (await client.post("/api/categories", json={"name": "Santé", "color": "#0f0"})).json()
+                item = (await client.post("/api/items", json=_item(island["id"], "Sport"))).json()
+                version = (await client.get("/api/scene")).json()["version"]
+                await client.delete(f"/api/categories/{island['id']}")
+                return island, item, (await client.get("/api/scene/diff", params={"since": version})).json()
+
+        island, item, diff = asyncio.run(run())
+        assert diff["deleted"]["islands"] == [island["id"]]
+        # Category.items has no delete cascade: the ORM detaches the items (categoryId NULL) before the delete
+        assert {i["id"]: i["categoryId"] for i in diff["items"]} == {item["id"]: None}
+        assert diff["deleted"]["items"] == []
+
+    def test_snapshot_is_cached_per_version(self, sqlite_sessionmaker, max_queries):
+        async def snapshot():
+            async with sqlite_sessionmaker() as session:
+                return await scene_service.SceneService(session).get_snapshot()
+
+        version, payload = asyncio.run(snapshot())
+        with max_queries(1):  # Version check only
+            assert asyncio.run(snapshot()) == (version, payload)
@@ -0,0 +1,32 @@
+"""
+Tests for the shared statement timing listeners.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.statement_timing import START_KEY, observe_statements
+
+timed = []
+
+
+def _record(conn, statement, parameters, executemany, seconds):
+    timed.append((statement, seconds))
+
+
+def test_failed_statement_leaves_no_start_behind():
+    observe_statements(_record)
+    observe_statements(_record)  # Registered once
+    engine = create_engine("sqlite://")
+    timed.clear()
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+        starts = conn.info[START_KEY]
+
+    assert starts == []
+    assert [statement for statement, _ in timed] == ["SELECT 1"]
+    assert 0 <= timed[0][1] < 1
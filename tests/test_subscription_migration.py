@@ -0,0 +1,78 @@
+"""
+Tests for the set-based Subscription -> RecurringTransaction migration.
+"""
+import asyncio
+import json
+import time
+
+from sqlalchemy import func, select
+
+from app.api.endpoints import finance
+from app.models import LifeItem, RecurringTransaction, Subscription
+from app.services.finance_service import FinanceService
+
+
+def _seed(sessionmaker, subscriptions=5, already_migrated=1):
+    async def seed():
+        async with sessionmaker() as session:
+            account = LifeItem(name="Compte courant", value="1000", type="currency")
+            session.add(account)
+            await session.flush()
+            subs = [
+                Subscription(itemId=account.id, name=f"Sub {i}", amount=9.99, billingDay=5)
+                for i in range(subscriptions)
+            ]
+            session.add_all(subs)
+            await session.flush()
+            now_ms = int(time.time() * 1000)
+            for sub in subs[:already_migrated]:
+                session.add(RecurringTransaction(
+                    sourceType="subscription", sourceItemId=sub.id, targetAccountId=account.id,
+                    amount=-9.99, dayOfMonth=5, label=sub.name, category="expense",
+                    startDate=now_ms, createdAt=now_ms, updatedAt=now_ms,
+                ))
+            await session.commit()
+
+    asyncio.run(seed())
+
+
+def _recurring_count(sessionmaker):
+    async def count():
+        async with sessionmaker() as session:
+            return await session.scalar(select(func.count()).select_from(RecurringTransaction))
+
+    return asyncio.run(count())
+
+
+def test_migration_is_set_based(sqlite_sessionmaker, max_queries):
+    _seed(sqlite_sessionmaker, subscriptions=5, already_migrated=1)
+
+    async def migrate():
+        async with sqlite_sessionmaker() as session:
+            return await FinanceService(session).migrate_subscriptions_to_recurring(chunk_size=2)
+
+    # 2 counts + per chunk (2 chunks + final empty one): 1 anti-join SELECT + 1 INSERT
+    with max_queries(2 + 3 + 2 * 2 + 2):
+        result = asyncio.run(migrate())
+
+    assert result == {"migratedCount": 4, "skippedCount": 1, "errors": []}
+    assert _recurring_count(sqlite_sessionmaker) == 5
+
+    # Re-running migrates nothing
+    assert asyncio.run(migrate())["migratedCount"] == 0
+    assert _recurring_count(sqlite_sessionmaker) == 5
+
+
+def test_migrate_endpoint_streams_progress(sqlite_sessionmaker, api_client):
+    _seed(sqlite_sessionmaker, subscriptions=3, already_migrated=0)
+
+    async def call():
+        async with api_client((finance.router, "/api/finance")) as client:
+            return await client.post("/api/finance/recurring/migrate", params={"stream": True, "chunk_size": 2})
+
+    response = asyncio.run(call())
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["migratedCount"] for line in lines] == [2, 3, 3]
+    assert lines[-1]["done"] is True
+    assert lines[-1]["totalCount"] == 3
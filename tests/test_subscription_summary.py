@@ -0,0 +1,81 @@
+"""
+Tests for the subscription summary: burn per account, duplicates and price history.
+"""
+import asyncio
+
+from app.api.endpoints import finance, items
+from app.services.finance_service import normalize_subscription_name
+
+
+def _account(name):
+    return {"name": name, "value": "0", "type": "currency", "status": "ok"}
+
+
+def _subscription(item_id, name, amount, **fields):
+    return {"itemId": item_id, "name": name, "amount": amount, "billingDay": 5, **fields}
+
+
+def test_normalized_name():
+    assert normalize_subscription_name("  Netflix   Premium! ") == "netflix premium"
+    assert normalize_subscription_name("Canal+ Séries") == "canal series"
+    assert normalize_subscription_name(None) == ""
+
+
+def test_summary(api_client, max_queries):
+    async def run():
+        async with api_client((items.router, "/api/items"), (finance.router, "/api/finance")) as client:
+            checking = (await client.post("/api/items", json=_account("Compte courant"))).json()
+            joint = (await client.post("/api/items", json=_account("Compte joint"))).json()
+            netflix = (await client.post("/api/finance/subscriptions", json=_subscription(checking["id"], "Netflix", 13.49))).json()
+            await client.post("/api/finance/subscriptions", json=_subscription(joint["id"], "NETFLIX ", 13.49))
+            await client.post("/api/finance/subscriptions", json=_subscription(checking["id"], "Spotify", 10.99))
+            await client.post("/api/finance/subscriptions", json=_subscription(joint["id"], "Salle de sport", 30))
+            await client.post("/api/finance/subscriptions", json=_subscription(joint["id"], "Presse", 10.99, isActive=False))
+
+            await client.put(f"/api/finance/subscriptions/{netflix['id']}", json={"amount": 15.99})
+            await client.put(f"/api/finance/subscriptions/{netflix['id']}", json={"name": "Netflix Premium"})
+            await client.put(f"/api/finance/subscriptions/{netflix['id']}", json={"amount": 15.99})  # Unchanged
+
+            with max_queries(3):
+                summary = (await client.get("/api/finance/subscriptions/summary")).json()
+            history = (await client.get(f"/api/finance/subscriptions/{netflix['id']}/price-history")).json()
+            return checking, joint, summary, history
+
+    checking, joint, summary, history = asyncio.run(run())
+
+    assert summary["activeCount"] == 4
+    assert summary["monthlyBurn"] == round(15.99 + 13.49 + 10.99 + 30, 2)
+    assert summary["annualBurn"] == round(summary["monthlyBurn"] * 12, 2)
+    assert [(a["itemId"], a["activeCount"], a["monthlyBurn"]) for a in summary["accounts"]] == [
+        (joint["id"], 2, 43.49),
+        (checking["id"], 2, 26.98),
+    ]
+
+    # Renamed to "Netflix Premium": no longer a name duplicate; the inactive "Presse" is ignored
+    assert summary["duplicates"] == []
+
+    assert [(c["name"], c["oldAmount"], c["newAmount"]) for c in summary["priceChanges"]] == [
+        ("Netflix Premium", 13.49, 15.99),
+    ]
+    assert [(c["oldAmount"], c["newAmount"]) for c in history] == [(13.49, 15.99)]
+
+
+def test_duplicates(api_client):
+    async def run():
+        async with api_client((items.router, "/api/items"), (finance.router, "/api/finance")) as client:
+            checking = (await client.post("/api/items", json=_account("Compte courant"))).json()
+            joint = (await client.post("/api/items", json=_account("Compte joint"))).json()
+            await client.post("/api/finance/subscriptions", json=_subscription(checking["id"], "Disney+", 8.99))
+            await client.post("/api/finance/subscriptions", json=_subscription(checking["id"], "disney", 9.99))
+            await client.post("/api/finance/subscriptions", json=_subscription(checking["id"], "Cloud", 2.99))
+            await client.post("/api/finance/subscriptions", json=_subscription(joint["id"], "Stockage", 2.99))
+            return (await client.get("/api/finance/subscriptions/summary")).json()
+
+    summary = asyncio.run(run())
+
+    groups = {(group["reason"], group["key"]): sorted(sub["name"] for sub in group["subscriptions"])
+              for group in summary["duplicates"]}
+    assert groups == {
+        ("name", "disney"): ["Disney+", "disney"],
+        ("amount", "2.99"): ["Cloud", "Stockage"],
+    }
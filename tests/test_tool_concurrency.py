@@ -0,0 +1,71 @@
+"""
+Tests for the per-turn tool concurrency plugin.
+"""
+import asyncio
+from types import SimpleNamespace
+
+from agents.plugins.concurrency import ToolConcurrencyPlugin, merged_duration
+
+
+def _tool(name: str):
+    return SimpleNamespace(name=name)
+
+
+def _ctx(call_id: str, invocation_id: str = "inv-1"):
+    return SimpleNamespace(invocation_id=invocation_id, function_call_id=call_id)
+
+
+async def _run(plugin, name, call_id, active, peak, delay=0.01):
+    tool, ctx = _tool(name), _ctx(call_id)
+    await plugin.before_tool_callback(tool=tool, tool_args={}, tool_context=ctx)
+    active[name] = active.get(name, 0) + 1
+    peak["all"] = max(peak.get("all", 0), sum(active.values()))
+    peak[name] = max(peak.get(name, 0), active[name])
+    await asyncio.sleep(delay)
+    active[name] -= 1
+    await plugin.after_tool_callback(tool=tool, tool_args={}, tool_context=ctx, result={})
+
+
+class TestMergedDuration:
+    def test_overlapping_spans_are_merged(self):
+        assert merged_duration([(0.0, 2.0), (1.0, 3.0), (5.0, 6.0)]) == 4.0
+
+    def test_empty(self):
+        assert merged_duration([]) == 0.0
+
+
+class TestToolConcurrencyPlugin:
+    def test_reads_are_capped_per_turn(self):
+        plugin = ToolConcurrencyPlugin(read_only_tools={"get_alerts"}, max_parallel=2)
+        active, peak = {}, {}
+
+        async def main():
+            await asyncio.gather(*[_run(plugin, "get_alerts", f"c{i}", active, peak) for i in range(6)])
+
+        asyncio.run(main())
+        assert peak["all"] == 2
+
+    def test_writes_are_serialized(self):
+        plugin = ToolConcurrencyPlugin(read_only_tools=set(), max_parallel=4)
+        active, peak = {}, {}
+
+        async def main():
+            await asyncio.gather(*[_run(plugin, "create_alert", f"c{i}", active, peak) for i in range(3)])
+
+        asyncio.run(main())
+        assert peak["create_alert"] == 1
+
+    def test_release_is_idempotent(self):
+        plugin = ToolConcurrencyPlugin(read_only_tools={"get_alerts"}, max_parallel=1)
+
+        async def main():
+            tool, ctx = _tool("get_alerts"), _ctx("c1")
+            await plugin.before_tool_callback(tool=tool, tool_args={}, tool_context=ctx)
+            await plugin.on_tool_error_callback(tool=tool, tool_args={}, tool_context=ctx, error=ValueError())
+            await plugin.after_tool_callback(tool=tool, tool_args={}, tool_context=ctx, result={})
+            # The single slot is free again
+            await asyncio.wait_for(
+                plugin.before_tool_callback(tool=tool, tool_args={}, tool_context=_ctx("c2")), timeout=1
+            )
+
+        asyncio.run(main())
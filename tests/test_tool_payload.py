@@ -0,0 +1,51 @@
+"""
+Tests for the agent tool payload helpers (projection + token budget).
+"""
+from agents.tools.payload import project, budgeted_response, estimate_tokens
+
+
+def _rows(n: int) -> list[dict]:
+    return [
+        {"id": str(i), "date": 1700000000000 + i, "value": -12.5, "label": f"Courses {i}", "category": "expense"}
+        for i in range(n)
+    ]
+
+
+class TestProjection:
+    def test_no_fields_returns_rows_unchanged(self):
+        rows = _rows(2)
+        assert project(rows, None) == rows
+
+    def test_keeps_requested_fields_and_id(self):
+        projected = project(_rows(1), ["value"])
+        assert projected == [{"id": "0", "value": -12.5}]
+
+    def test_unknown_fields_are_ignored(self):
+        projected = project(_rows(1), ["nope"])
+        assert projected == [{"id": "0"}]
+
+
+class TestBudgetedResponse:
+    def test_small_payload_is_not_truncated(self):
+        response = budgeted_response("history", _rows(3))
+        assert response["count"] == 3
+        assert "next_cursor" not in response
+
+    def test_truncates_with_continuation_cursor(self):
+        rows = _rows(50)
+        budget = estimate_tokens(rows[0]) * 10
+        response = budgeted_response("history", rows, offset=20, budget_tokens=budget)
+
+        assert response["truncated"] is True
+        assert response["count"] == len(response["history"])
+        assert 0 < response["count"] < 50
+        assert response["next_cursor"] == 20 + response["count"]
+
+    def test_always_returns_at_least_one_row(self):
+        response = budgeted_response("history", _rows(5), budget_tokens=1)
+        assert response["count"] == 1
+
+    def test_sql_page_cut_exposes_cursor(self):
+        response = budgeted_response("history", _rows(3), offset=0, has_more=True)
+        assert response["truncated"] is False
+        assert response["next_cursor"] == 3